@@ -0,0 +1,65 @@
+"""Accuracy and speed of the American engines against a fine Leisen-Reimer lattice.
+
+    python benchmarks/bench_american.py --size 2000 --steps 50 101 201 501 --reference-steps 2001
+
+Every engine prices the same random contracts, half of them with a dividend
+yield so that calls exercise early too. Errors are absolute, in price units on
+spots between 50 and 150: the RMS, the maximum, and the maximum relative to
+prices above 0.5.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from common import make_inputs
+from optrush import american
+
+
+def timed(function, repeat):
+    """Result of ``function()`` and its best wall time over ``repeat`` runs."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=2000)
+    parser.add_argument('--steps', type=int, nargs='+', default=[50, 101, 201, 501])
+    parser.add_argument('--reference-steps', type=int, default=2001)
+    parser.add_argument('--chunk', type=int, default=1024)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    spot, strike, t, r, sigma, is_call = make_inputs(args.size, 'bs')
+    q = np.where(np.arange(args.size) % 2 == 0, np.random.default_rng(1).uniform(0, 0.06, args.size), 0.0)
+    inputs = dict(s=spot, k=strike, t=t, r=r, sigma=sigma, is_call=is_call, q=q)
+
+    reference_lattice = american.Lattice(args.reference_steps, 'lr', args.chunk)
+    reference, elapsed = timed(lambda: reference_lattice.price(**inputs), 1)
+    print(f'reference: lr with {reference_lattice.steps} steps, {elapsed:.1f} s\n')
+    engines = [('baw', lambda: american.baw_price(**inputs))]
+    for method in american.METHODS:
+        for steps in args.steps:
+            lattice = american.Lattice(steps, method, args.chunk)
+            engines.append((f'{method} {lattice.steps}', lambda lattice=lattice: lattice.price(**inputs)))
+
+    quoted = reference > 0.5
+    print(f'{"engine":<12}{"us/option":>11}{"rms":>11}{"max":>11}{"max rel":>11}')
+    for name, engine in engines:
+        prices, elapsed = timed(engine, args.repeat)
+        error = np.abs(prices - reference)
+        relative = error[quoted] / reference[quoted]
+        print(f'{name:<12}{elapsed / args.size * 1e6:>11.2f}{np.sqrt(np.mean(error ** 2)):>11.2e}'
+              f'{error.max():>11.2e}{relative.max():>11.2e}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""Throughput of the Rust batch kernels as the thread count grows.
+
+Run after ``make develop``:
+
+    python benchmarks/bench_parallel.py --size 2000000 --threads 1 2 4 8 16
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from common import make_inputs
+from optrush import optrush
+
+
+KERNELS = {
+    'bs': ('bs_call_price_batch', 'bs_greeks_batch'),
+    'bk': ('bk_call_price_batch', 'bk_greeks_batch'),
+    'bach': ('bach_call_price_batch', 'bach_greeks_batch'),
+}
+
+
+def best_of(repeat, func, *args, **kwargs):
+    """Best wall-clock time over ``repeat`` runs, in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8, os.cpu_count()])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f'{"model":<6}{"kernel":<22}{"threads":>8}{"Mopt/s":>10}{"speedup":>9}')
+    for model, (price_kernel, greeks_kernel) in KERNELS.items():
+        spot, strike, t, r, sigma, is_call = make_inputs(args.size, model)
+        prices = np.empty(args.size)
+        greeks = np.empty((args.size, 6))
+        for name, run in [
+            (price_kernel, lambda n: getattr(optrush, price_kernel)(spot, strike, t, r, sigma, prices, n)),
+            (greeks_kernel, lambda n: getattr(optrush, greeks_kernel)(spot, strike, t, r, sigma, is_call, greeks, n)),
+        ]:
+            baseline = None
+            for threads in sorted(set(args.threads)):
+                elapsed = best_of(args.repeat, run, threads)
+                baseline = baseline or elapsed
+                print(f'{model:<6}{name:<22}{threads:>8}{args.size / elapsed / 1e6:>10.1f}{baseline / elapsed:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
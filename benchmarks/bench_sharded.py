@@ -0,0 +1,45 @@
+"""Throughput of the shared-memory process pool as the worker count grows.
+
+    python benchmarks/bench_sharded.py --size 200000 --workers 1 2 4 8 --backends python numpy
+
+The rust backends are skipped when the extension is not built.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from common import make_inputs
+from optrush import sharded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=200_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8, os.cpu_count()])
+    parser.add_argument('--backends', nargs='+', choices=sharded.BACKENDS, default=list(sharded.BACKENDS))
+    parser.add_argument('--model', choices=['bs', 'bk', 'bach'], default='bs')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    inputs = make_inputs(args.size, args.model)
+    backends = [b for b in args.backends if sharded.optrush is not None or not b.startswith('rust')]
+    print(f'{"backend":<12}{"workers":>8}{"Mopt/s":>10}{"speedup":>9}')
+    for backend in backends:
+        baseline = None
+        for workers in sorted(set(args.workers)):
+            with sharded.ShardedPricer(args.size, workers) as pricer:
+                pricer.greeks(args.model, *inputs, backend=backend)    # warm the workers up
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    pricer.greeks(args.model, *inputs, backend=backend)
+                    timings.append(time.perf_counter() - start)
+            elapsed = min(timings)
+            baseline = baseline or elapsed
+            print(f'{backend:<12}{workers:>8}{args.size / elapsed / 1e6:>10.2f}{baseline / elapsed:>9.2f}')
+
+
+if __name__ == '__main__':
+    main()
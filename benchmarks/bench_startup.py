@@ -0,0 +1,79 @@
+"""Cold-start cost of importing optrush: wall time and peak RSS in fresh interpreters.
+
+    python benchmarks/bench_startup.py --repeat 10 --output benchmarks/startup.json
+
+Every case runs in a new ``python`` process; the time covers only the
+statement being measured, and the RSS is the process peak afterwards. The
+``python`` case is the bare interpreter baseline, and deltas are reported
+against it. ``--no-scipy`` runs everything with ``OPTRUSH_SCIPY=0``.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+CASES = {
+    'python': 'pass',
+    'numpy': 'import numpy',
+    'optrush.models': 'import optrush.models',
+    'optrush.backend': 'from optrush import backend; backend.bs_call_price(100.0, 100.0, 1.0, 0.0, 0.2)',
+    'optrush.vectorized': 'import optrush.vectorized',
+    'optrush.vectorized+call': 'import numpy, optrush.vectorized as v; v.bs_call_price(100.0, numpy.ones(2), 1.0, 0.0, 0.2)',
+    'optrush.optrush': 'import optrush.optrush',
+}
+
+CHILD = '''
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}}))
+'''
+
+
+def run_case(statement, env):
+    """Seconds and peak RSS in bytes of one fresh interpreter running ``statement``, or None if it fails."""
+    child = subprocess.run([sys.executable, '-c', CHILD.format(root=ROOT, statement=statement)],
+                           capture_output=True, text=True, env=env)
+    return json.loads(child.stdout) if child.returncode == 0 else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-scipy', action='store_true')
+    parser.add_argument('--output', help='write the results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ, OPTRUSH_SCIPY='0') if args.no_scipy else dict(os.environ)
+    cases = ['python'] + [case for case in args.cases if case != 'python']
+    results = []
+    print(f'{"case":<26}{"ms":>9}{"+ms":>9}{"RSS MB":>9}{"+MB":>8}')
+    for case in cases:
+        runs = [run_case(CASES[case], env) for _ in range(args.repeat)]
+        if None in runs:
+            print(f'{case:<26}{"skipped":>9}')
+            continue
+        seconds = statistics.median(run['seconds'] for run in runs)
+        peak_rss = statistics.median(run['peak_rss'] for run in runs)
+        base = results[0] if results else {'seconds': seconds, 'peak_rss': peak_rss}
+        results.append({'case': case, 'seconds': seconds, 'peak_rss': peak_rss,
+                         'extra_seconds': seconds - base['seconds'], 'extra_rss': peak_rss - base['peak_rss']})
+        print(f'{case:<26}{seconds * 1e3:>9.1f}{(seconds - base["seconds"]) * 1e3:>9.1f}'
+              f'{peak_rss / 2 ** 20:>9.1f}{(peak_rss - base["peak_rss"]) / 2 ** 20:>8.1f}')
+    if args.output:
+        meta = {'python': platform.python_version(), 'platform': platform.platform(), 'no_scipy': args.no_scipy,
+                'repeat': args.repeat}
+        with open(args.output, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Throughput and memory of every backend for pricing, greeks, implied vol and the normal CDF.
+
+Run after ``make develop``:
+
+    python benchmarks/bench_suite.py --output benchmarks/results.json
+    python benchmarks/compare.py benchmarks/baseline.json benchmarks/results.json
+
+Backends are ``python`` (a loop over ``optrush.models``), ``numpy``
+(``optrush.vectorized``), ``rust`` (a loop over the scalar extension functions)
+and ``rust-batch`` (the ``*_batch`` kernels writing into preallocated arrays).
+The Rust backends are skipped when the extension is not built. Peak memory is
+what ``tracemalloc`` sees during one call: Python objects and NumPy buffers,
+not allocations made inside the extension.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from common import make_inputs
+from optrush import models, vectorized
+try:
+    from optrush import optrush
+except ImportError:
+    optrush = None
+
+
+SIZES = [1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+OPERATIONS = ['price', 'greeks', 'iv', 'norm_cdf']
+BACKENDS = ['python', 'numpy', 'rust', 'rust-batch']
+
+
+def make_case(operation, backend, model, inputs, threads):
+    """A zero-argument callable that runs ``operation`` on every contract in ``inputs``."""
+    spot, strike, t, r, sigma, is_call = inputs
+    n = len(spot)
+    if operation == 'norm_cdf':
+        x = (sigma - sigma.mean()) / sigma.std() if n > 1 else sigma
+        out = np.empty(n)
+        return {
+            'python': lambda: [models.norm_cdf(v) for v in x.tolist()],
+            'numpy': lambda: vectorized.norm_cdf(x),
+            'rust': lambda: [optrush.norm_cdf(v) for v in x.tolist()],
+            'rust-batch': lambda: optrush.norm_cdf_batch(x, out, threads),
+        }[backend]
+    rows = list(zip(spot.tolist(), strike.tolist(), t.tolist(), r.tolist(), sigma.tolist(), is_call.tolist()))
+    if operation == 'price':
+        out = np.empty(n)
+        return {
+            'python': lambda: [getattr(models, f'{model}_call_price')(*row[:5]) for row in rows],
+            'numpy': lambda: getattr(vectorized, f'{model}_call_price')(spot, strike, t, r, sigma),
+            'rust': lambda: [getattr(optrush, f'{model}_call_price')(*row[:5]) for row in rows],
+            'rust-batch': lambda: getattr(optrush, f'{model}_call_price_batch')(spot, strike, t, r, sigma, out, threads),
+        }[backend]
+    if operation == 'greeks':
+        out = np.empty((n, 6))
+        return {
+            'python': lambda: [getattr(models, f'{model}_greeks')(*row) for row in rows],
+            'numpy': lambda: getattr(vectorized, f'{model}_greeks')(spot, strike, t, r, sigma, is_call=is_call),
+            'rust': lambda: [getattr(optrush, f'{model}_greeks')(*row) for row in rows],
+            'rust-batch': lambda: getattr(optrush, f'{model}_greeks_batch')(spot, strike, t, r, sigma, is_call, out, threads),
+        }[backend]
+    prices = getattr(vectorized, f'{model}_call_price')(spot, strike, t, r, sigma)
+    quotes = [row[:4] + (price,) for row, price in zip(rows, prices.tolist())]
+    out, iterations = np.empty(n), np.empty(n, dtype=np.int64)
+    return {
+        'python': lambda: [getattr(models, f'{model}_call_iv')(*quote) for quote in quotes],
+        'numpy': lambda: getattr(vectorized, f'{model}_call_iv')(spot, strike, t, r, prices),
+        'rust': lambda: [getattr(optrush, f'{model}_call_iv')(*quote) for quote in quotes],
+        'rust-batch': lambda: getattr(optrush, f'{model}_call_iv_batch')(spot, strike, t, r, prices, out, iterations, threads=threads),
+    }[backend]
+
+
+def measure(func, repeat):
+    """Best seconds per call over ``repeat`` timing runs, each at least 0.2 s long, and the peak traced bytes of one call."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    seconds = min(timer.repeat(repeat, number)) / number
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def metadata():
+    """Machine and version details stored next to the results so runs can be compared fairly."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'rust_extension': optrush is not None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=OPERATIONS)
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=BACKENDS)
+    parser.add_argument('--model', choices=['bs', 'bk', 'bach'], default='bs')
+    parser.add_argument('--max-loop-size', type=int, default=100_000,
+                        help='largest batch run through the per-option python and rust loops')
+    parser.add_argument('--threads', type=int, default=1, help='thread count passed to the rust-batch kernels')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write the results as JSON to this path')
+    args = parser.parse_args(argv)
+
+    backends = [b for b in args.backends if optrush is not None or not b.startswith('rust')]
+    results = []
+    print(f'{"operation":<10}{"backend":<12}{"size":>10}{"calls/s":>14}{"ns/option":>12}{"peak KiB":>11}')
+    for size in args.sizes:
+        inputs = make_inputs(size, args.model)
+        for operation in args.operations:
+            for backend in backends:
+                if backend in ('python', 'rust') and size > args.max_loop_size:
+                    continue
+                seconds, peak = measure(make_case(operation, backend, args.model, inputs, args.threads), args.repeat)
+                results.append({
+                    'operation': operation, 'model': args.model, 'backend': backend, 'size': size,
+                    'threads': args.threads if backend == 'rust-batch' else 1,
+                    'seconds': seconds, 'calls_per_sec': 1 / seconds, 'options_per_sec': size / seconds,
+                    'ns_per_option': seconds / size * 1e9, 'peak_bytes': peak,
+                })
+                print(f'{operation:<10}{backend:<12}{size:>10}{1 / seconds:>14.1f}{seconds / size * 1e9:>12.1f}{peak / 1024:>11.1f}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'meta': metadata(), 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Time full vol-surface rebuilds: quotes inverted by ``vectorized.bk_iv`` and every smile fitted in one batch.
+
+    python benchmarks/bench_surface.py --underlyings 200 --expiries 12 --strikes 15 --threads 1 4
+
+Each underlying has ``--expiries`` smiles drawn from SABR with beta 0.5, plus
+``--noise`` relative noise on the vols. A snapshot prices the out-of-the-money
+options, inverts them back to vols and fits SVI and SABR to every smile. The
+next snapshot moves the forwards by a small random step and refits, cold and
+warm-started from the previous fit. Times include the inversion.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from optrush import calibration, vectorized
+
+
+def make_surface(underlyings, expiries, strikes, noise, seed=0):
+    """Forwards, strikes, expiries and Black vols of ``underlyings * expiries`` smiles, one per row."""
+    rng = np.random.default_rng(seed)
+    n = underlyings * expiries
+    forward = np.repeat(rng.uniform(50, 150, underlyings), expiries)
+    t = np.tile(np.geomspace(1 / 52, 2, expiries), underlyings)
+    moneyness = np.linspace(-2, 2, strikes) * 0.25 * np.sqrt(t)[:, None]
+    strike = forward[:, None] * np.exp(moneyness)
+    alpha, rho, nu = rng.uniform(0.15, 0.4, n) * np.sqrt(forward), rng.uniform(-0.7, 0.2, n), rng.uniform(0.3, 1.2, n)
+    vol = calibration.sabr_vol(forward[:, None], strike, t[:, None], alpha[:, None], 0.5, rho[:, None], nu[:, None])
+    return forward, strike, t, vol * (1 + noise * rng.standard_normal(vol.shape))
+
+
+def otm_prices(forward, strike, t, r, vol):
+    """Black prices of the out-of-the-money option at every strike."""
+    f, t = forward[:, None], t[:, None]
+    return np.where(strike >= f, vectorized.bk_call_price(f, strike, t, r, vol), vectorized.bk_put_price(f, strike, t, r, vol))
+
+
+def rebuild(forward, strike, t, r, prices, is_call, model, threads, initial=None):
+    """Vols from quotes, then one batch fit of every smile."""
+    vol = vectorized.bk_iv(forward[:, None], strike, t[:, None], r, prices, is_call=is_call).sigma
+    if model == 'svi':
+        return calibration.fit_svi(forward, strike, t, vol, initial=initial, threads=threads)
+    return calibration.fit_sabr(forward, strike, t, vol, beta=0.5, initial=initial, threads=threads)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--underlyings', type=int, default=200)
+    parser.add_argument('--expiries', type=int, default=12)
+    parser.add_argument('--strikes', type=int, default=15)
+    parser.add_argument('--noise', type=float, default=1e-3)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1])
+    args = parser.parse_args(argv)
+
+    forward, strike, t, vol = make_surface(args.underlyings, args.expiries, args.strikes, args.noise)
+    r = 0.02
+    is_call = strike >= forward[:, None]
+    prices = otm_prices(forward, strike, t, r, vol)
+    shift = np.exp(0.002 * np.random.default_rng(1).standard_normal(len(forward)))
+    moved = otm_prices(forward * shift, strike, t, r, vol)
+
+    print(f'{len(forward)} smiles of {args.strikes} strikes\n')
+    print(f'{"model":<7}{"threads":>8}{"cold s":>9}{"warm s":>9}{"cold it":>9}{"warm it":>9}{"converged":>11}{"rmse":>11}')
+    for model in ('svi', 'sabr'):
+        for threads in args.threads:
+            start = time.perf_counter()
+            fit = rebuild(forward, strike, t, r, prices, is_call, model, threads)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            warm_fit = rebuild(forward * shift, strike, t, r, moved, is_call, model, threads, initial=fit)
+            warm = time.perf_counter() - start
+            print(f'{model:<7}{threads:>8}{cold:>9.3f}{warm:>9.3f}{np.mean(fit.iterations):>9.1f}'
+                  f'{np.mean(warm_fit.iterations):>9.1f}{np.mean(warm_fit.converged):>11.1%}{np.median(warm_fit.rmse):>11.2e}')
+
+
+if __name__ == '__main__':
+    main()
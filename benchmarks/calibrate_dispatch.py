@@ -0,0 +1,96 @@
+"""Measure the crossover sizes of the optrush.backend routes and write them as dispatch thresholds.
+
+    python benchmarks/calibrate_dispatch.py --output dispatch.json
+    OPTRUSH_DISPATCH=dispatch.json python my_job.py    # or backend.configure('dispatch.json')
+
+``array`` is the smallest size at which one array call beats looping over the
+scalar path, and ``parallel`` is the smallest size at which the parallel route
+beats the single-threaded array route by ``--margin``. The latter is null,
+which disables the parallel route, when it never wins up to ``--max-size``.
+Each crossover is the median over the operations in ``--operations``.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from common import make_inputs
+from optrush import backend
+
+
+def seconds_per_call(func, repeat):
+    """Best time of one call over ``repeat`` autoranged timings."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def timed(operation, model, size, repeat, **config):
+    """Seconds per call of ``operation`` on ``size`` contracts with the thresholds in ``config``."""
+    spot, strike, t, r, sigma, is_call = make_inputs(size, model)
+    backend.configure(**config)
+    if operation == 'greeks':
+        function = getattr(backend, f'{model}_greeks')
+        return seconds_per_call(lambda: function(spot, strike, t, r, sigma, is_call=is_call), repeat)
+    if operation == 'iv':
+        function = getattr(backend, f'{model}_call_iv')
+        prices = getattr(backend, f'{model}_call_price')(spot, strike, t, r, sigma)
+        return seconds_per_call(lambda: function(spot, strike, t, r, prices), repeat)
+    function = getattr(backend, f'{model}_call_{operation}')
+    return seconds_per_call(lambda: function(spot, strike, t, r, sigma), repeat)
+
+
+def crossover(sizes, slow, fast, margin=0.0):
+    """First size from which ``fast`` stays quicker than ``slow`` by ``margin``, or None."""
+    wins = [fast(size) * (1 + margin) < slow(size) for size in sizes]
+    for i, size in enumerate(sizes):
+        if all(wins[i:]):
+            return size
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--operations', nargs='+', choices=['price', 'greeks', 'iv'], default=['price', 'greeks', 'iv'])
+    parser.add_argument('--model', choices=['bs', 'bk', 'bach'], default='bs')
+    parser.add_argument('--threads', type=int, default=os.cpu_count())
+    parser.add_argument('--max-size', type=int, default=1 << 22)
+    parser.add_argument('--margin', type=float, default=0.1, help='required speedup of the parallel route')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='write the thresholds as JSON to this path')
+    args = parser.parse_args(argv)
+
+    small = [1, 2, 4, 8, 16, 32, 64, 128]
+    large = [1 << n for n in range(14, args.max_size.bit_length())]
+    arrays, parallels = [], []
+    for operation in args.operations:
+        array = crossover(
+            small,
+            lambda n: timed(operation, args.model, n, args.repeat, array=n + 1, parallel=None),
+            lambda n: timed(operation, args.model, n, args.repeat, array=0, parallel=None))
+        parallel = crossover(
+            large,
+            lambda n: timed(operation, args.model, n, args.repeat, array=0, parallel=None),
+            lambda n: timed(operation, args.model, n, args.repeat, array=0, parallel=0, threads=args.threads),
+            args.margin)
+        arrays.append(small[-1] if array is None else array)
+        parallels.append(parallel)
+        print(f'{operation:<8} array from {arrays[-1]:>6}   parallel from {parallel or "never":>8}')
+    found = [p for p in parallels if p is not None]
+    thresholds = {'array': int(statistics.median(arrays)),
+                  'parallel': int(statistics.median(found)) if len(found) * 2 > len(parallels) else None,
+                  'threads': args.threads}
+    print(json.dumps(thresholds))
+    if args.output:
+        meta = {'backend': backend.name(), 'model': args.model, 'operations': args.operations,
+                'python': platform.python_version(), 'platform': platform.platform(), 'cpu_count': os.cpu_count()}
+        with open(args.output, 'w') as f:
+            json.dump({'meta': meta, 'thresholds': thresholds}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
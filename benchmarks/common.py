@@ -0,0 +1,14 @@
+"""Inputs shared by the benchmark scripts."""
+import numpy as np
+
+
+def make_inputs(n, model, seed=0):
+    """Random but reproducible contracts around the money."""
+    rng = np.random.default_rng(seed)
+    spot = rng.uniform(50, 150, n)
+    strike = spot * rng.uniform(0.7, 1.3, n)
+    t = rng.uniform(0.02, 3.0, n)
+    r = rng.uniform(0.0, 0.08, n)
+    sigma = rng.uniform(0.05, 0.8, n) * (spot if model == 'bach' else 1.0)
+    is_call = rng.random(n) < 0.5
+    return spot, strike, t, r, sigma, is_call
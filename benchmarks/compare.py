@@ -0,0 +1,54 @@
+"""Compare two bench_suite.py result files and fail when a case got slower.
+
+    python benchmarks/compare.py baseline.json results.json --threshold 0.10
+
+Cases are matched on operation, model, backend, size and threads. The exit
+status is 1 when any matched case's ns per option grew by more than
+``--threshold`` (a fraction), so the script can gate CI. Sizes below
+``--min-size`` are reported but never fail the run, since their timings are
+dominated by call overhead and noise.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    """Results of one run keyed by the fields that identify a benchmark case."""
+    with open(path) as f:
+        run = json.load(f)
+    return run['meta'], {(r['operation'], r['model'], r['backend'], r['size'], r['threads']): r for r in run['results']}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.10)
+    parser.add_argument('--min-size', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    baseline_meta, baseline = load(args.baseline)
+    current_meta, current = load(args.current)
+    for field in ['machine', 'cpu_count', 'python', 'numpy']:
+        if baseline_meta.get(field) != current_meta.get(field):
+            print(f'warning: {field} differs ({baseline_meta.get(field)} vs {current_meta.get(field)})')
+
+    regressions = 0
+    print(f'{"operation":<10}{"backend":<12}{"size":>10}{"base ns":>11}{"ns":>11}{"change":>9}')
+    for key in sorted(baseline.keys() & current.keys(), key=lambda k: (k[0], k[2], k[3], k[4])):
+        operation, _, backend, size, _ = key
+        before, after = baseline[key]['ns_per_option'], current[key]['ns_per_option']
+        change = after / before - 1
+        failed = change > args.threshold and size >= args.min_size
+        regressions += failed
+        print(f'{operation:<10}{backend:<12}{size:>10}{before:>11.1f}{after:>11.1f}{change:>+9.1%}{"  REGRESSION" if failed else ""}')
+    unmatched = len(baseline.keys() ^ current.keys())
+    if unmatched:
+        print(f'{unmatched} cases present in only one run were skipped')
+    print(f'{regressions} regressions above {args.threshold:.0%}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,313 @@
+"""One entry point per pricing function, routed on input type and size to the fastest implementation.
+
+    from optrush import backend
+    backend.bs_call_price(100, 105, 0.5, 0.02, 0.2)                 # scalar path
+    backend.bs_greeks(spot, strikes, 0.5, 0.02, vols, is_call=flags)  # array path
+
+Every function takes the arguments of its ``optrush.models`` counterpart,
+scalars or arrays, and is dispatched as follows:
+
+    scalar      all arguments are Python or NumPy scalars: the extension's scalar
+                function when it is built, else ``optrush.models``
+    loop        arrays smaller than ``thresholds['array']``: the scalar path per element
+    array       the extension's ``*_batch`` kernel when there is one, including the
+                ``*_iv_batch`` solvers, else ``optrush.vectorized``
+    parallel    at least ``thresholds['parallel']`` elements: the batch kernel on
+                ``thresholds['threads']`` threads, or ``optrush.vectorized`` on chunks run
+                by a thread pool
+
+Results have one type whatever the route: floats, ``models.Greeks`` or
+``models.FullGreeks`` for scalars, and arrays or ``vectorized`` record arrays
+of the broadcast shape otherwise. The implied-volatility functions take
+``sigma``, ``tol`` and ``max_iterations`` by keyword on every route. ``tol``
+left as None uses each solver's default on every route: in the Rust solvers it
+bounds the price error, and in the Python ones the relative step in sigma.
+
+Names are resolved on first access, so importing this module loads neither
+implementation. ``OPTRUSH_BACKEND`` set to ``python`` or ``rust`` forces the
+scalar and batch implementation; ``rust`` raises ``ImportError`` when the
+extension is missing. ``configure`` sets the thresholds, or loads the JSON
+written by ``benchmarks/calibrate_dispatch.py``. The file named by
+``OPTRUSH_DISPATCH`` is loaded at import. Calls are counted and timed by
+``optrush.instrument`` while it is enabled.
+"""
+import functools
+import importlib
+import inspect
+import json
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from . import instrument
+
+
+MODELS = ('bs', 'bk', 'bach')
+FUNCTIONS = frozenset(
+    ['norm_cdf', 'norm_pdf', 'bs_d1', 'bs_d2', 'bk_d1', 'bk_d2', 'bach_d']
+    + [f'{model}_{side}_{name}' for model in MODELS for side in ('call', 'put')
+       for name in ('price', 'delta', 'theta', 'rho')]
+    + [f'{model}_{name}' for model in MODELS for name in ('gamma', 'vega', 'greeks', 'full_greeks')])
+IV_FUNCTIONS = frozenset(f'{model}_{side}_iv' for model in MODELS for side in ('call', 'put'))
+ROUTES = ('scalar', 'loop', 'array', 'parallel')
+
+thresholds = {'array': 16, 'parallel': 1 << 20, 'threads': os.cpu_count() or 1}
+
+
+def configure(path=None, **values):
+    """Update ``thresholds`` from the JSON file ``path`` and then from keywords; None disables a threshold."""
+    updates = {}
+    if path is not None:
+        with open(path) as f:
+            updates.update(json.load(f)['thresholds'])
+    updates.update(values)
+    unknown = set(updates) - set(thresholds)
+    if unknown:
+        raise KeyError(f'unknown thresholds {sorted(unknown)}, expected {sorted(thresholds)}')
+    thresholds.update(updates)
+    return dict(thresholds)
+
+
+@functools.lru_cache(maxsize=None)
+def implementation():
+    """The module providing the scalar functions: the extension if it imports, else ``optrush.models``."""
+    choice = os.environ.get('OPTRUSH_BACKEND', 'auto')
+    if choice not in ('auto', 'python', 'rust'):
+        raise ValueError(f"OPTRUSH_BACKEND must be 'auto', 'python' or 'rust', not {choice!r}")
+    if choice != 'python':
+        try:
+            module = importlib.import_module('.optrush', __package__)
+            module.instrumentation(instrument.enabled)
+            return module
+        except ImportError:
+            if choice == 'rust':
+                raise
+    return importlib.import_module('.models', __package__)
+
+
+def name():
+    """``'rust'`` or ``'python'``, whichever ``implementation`` picked."""
+    return 'python' if implementation().__name__.endswith('models') else 'rust'
+
+
+def _module(name):
+    return importlib.import_module(f'.{name}', __package__)
+
+
+_SCALARS = (int, float, bool, np.generic)
+_IV_OPTIONS = {'sigma', 'tol', 'max_iterations'}
+
+
+def route(*args, **kwargs):
+    """The route a call with these arguments takes, one of ``ROUTES``."""
+    values = args + tuple(kwargs.get(key) for key in ('is_call', 'sigma') if key in kwargs)
+    if all(value is None or isinstance(value, _SCALARS) for value in values):
+        return 'scalar'
+    size = np.broadcast(*(np.asarray(value) for value in values if value is not None)).size
+    if thresholds['parallel'] is not None and size >= thresholds['parallel']:
+        return 'parallel'
+    if thresholds['array'] is not None and size < thresholds['array']:
+        return 'loop'
+    return 'array'
+
+
+def _scalar(name):
+    """The scalar implementation of ``name`` with the ``optrush.models`` signature and return type."""
+    module = implementation()
+    function = getattr(module, name)
+    if module.__name__.endswith('models'):
+        if name in IV_FUNCTIONS:
+            def solve(s, k, t, r, market_price, sigma=None, tol=None, max_iterations=100):
+                return function(s, k, t, r, market_price, sigma, 1e-10 if tol is None else tol, max_iterations)
+            return solve
+        return function
+    models = _module('models')
+    if name in IV_FUNCTIONS:
+        def solve(s, k, t, r, market_price, sigma=None, tol=None, max_iterations=100):
+            return models.IVResult(*function(s, k, t, r, market_price, sigma, 1e-8 if tol is None else tol,
+                                             max_iterations))
+        return solve
+    if name.endswith('greeks'):
+        bundle = models.FullGreeks if name.endswith('full_greeks') else models.Greeks
+        return lambda *args, **kwargs: bundle(*function(*args, **kwargs))
+    return function
+
+
+def _inputs(args, kwargs):
+    """Positional arguments and array-valued ``is_call``/``sigma`` broadcast and flattened, with their shape."""
+    keys = [key for key in ('is_call', 'sigma') if kwargs.get(key) is not None]
+    arrays = np.broadcast_arrays(*map(np.asarray, args + tuple(kwargs[key] for key in keys)))
+    flat = [np.ravel(a) for a in arrays]
+    return flat[:len(args)], dict(zip(keys, flat[len(args):])), arrays[0].shape
+
+
+def _greeks_dtype(name):
+    vectorized = _module('vectorized')
+    return vectorized.FULL_GREEKS_DTYPE if name.endswith('full_greeks') else vectorized.GREEKS_DTYPE
+
+
+def _pack(name, results, shape):
+    """Scalar results of every element as the array or record array ``optrush.vectorized`` would return."""
+    vectorized = _module('vectorized')
+    if name.endswith('greeks'):
+        dtype = _greeks_dtype(name)
+        return np.array(results, dtype=float).reshape(-1).view(dtype).view(np.recarray).reshape(shape)
+    if name in IV_FUNCTIONS:
+        sigma, iterations, converged = zip(*results) if results else ((), (), ())
+        return vectorized._iv_result(np.array(sigma, dtype=float), iterations, converged, shape)
+    return np.array(results, dtype=float).reshape(shape)
+
+
+def _loop(name, args, kwargs):
+    flat, keywords, shape = _inputs(args, kwargs)
+    function = _scalar(name)
+    options = {key: value for key, value in kwargs.items() if key not in keywords}
+    rows = zip(*(a.tolist() for a in flat), *(keywords[key].tolist() for key in keywords))
+    n = len(flat)
+    results = [function(*row[:n], **dict(zip(keywords, row[n:])), **options) for row in rows]
+    return _pack(name, results, shape)
+
+
+def _batch_kernel(name):
+    """The extension's batch kernel for ``name``, or None when there is none or the extension is not used."""
+    module = implementation()
+    if module.__name__.endswith('models'):
+        return None
+    return getattr(module, f'{name}_batch', None)
+
+
+def _batch_inputs(args, keywords):
+    """1-d contiguous inputs of a Rust batch kernel, and the broadcast shape.
+
+    Inputs of size 1 are passed as length-1 arrays, which the kernels broadcast, and full-shape contiguous
+    arrays as views, so only inputs that really need broadcasting are copied.
+    """
+    arrays = [np.asarray(a) for a in args]
+    keywords = {key: np.asarray(value) for key, value in keywords.items() if value is not None}
+    shape = np.broadcast_shapes(*(a.shape for a in arrays), *(a.shape for a in keywords.values()))
+
+    def flat(a, dtype=float):
+        if a.size == 1:
+            return np.ascontiguousarray(a, dtype=dtype).reshape(1)
+        return np.ascontiguousarray(np.broadcast_to(a, shape), dtype=dtype).reshape(-1)
+    return [flat(a) for a in arrays], {key: flat(a, a.dtype) for key, a in keywords.items()}, shape
+
+
+def _run_batch(kernel, name, args, kwargs, threads):
+    """Call a Rust batch kernel, allocating its output."""
+    keywords = {key: kwargs.get(key) for key in ('is_call', 'sigma')}
+    inputs, keywords, shape = _batch_inputs(args, keywords)
+    n = math.prod(shape)
+    if name in IV_FUNCTIONS:
+        out = np.full(n, np.nan) if 'sigma' not in keywords else np.broadcast_to(keywords['sigma'], (n,)).astype(float)
+        iterations = np.empty(n, dtype=np.int64)
+        tol, max_iterations = kwargs.get('tol'), kwargs.get('max_iterations', 100)
+        kernel(*inputs, out, iterations, 1e-8 if tol is None else tol, max_iterations, threads)
+        converged = iterations >= 0
+        return _module('vectorized')._iv_result(out, np.where(converged, iterations, max_iterations), converged, shape)
+    if name.endswith('greeks'):
+        is_call = keywords.get('is_call', np.ones(1, dtype=bool)).astype(bool, copy=False)
+        dtype = _greeks_dtype(name)
+        out = np.empty(n, dtype=dtype).view(np.recarray)
+        kernel(*inputs, is_call, out.view(np.float64).reshape(n, len(dtype)), threads)
+    else:
+        out = np.empty(n)
+        kernel(*inputs, out, threads)
+    return out.reshape(shape)
+
+
+def _vectorized(name, args, kwargs, threads):
+    """``optrush.vectorized`` over the whole input, or over ``threads`` chunks run by a thread pool."""
+    function = getattr(_module('vectorized'), name)
+    if name in IV_FUNCTIONS and kwargs.get('tol') is None:
+        kwargs = dict(kwargs, tol=1e-10)
+    if threads <= 1:
+        return function(*args, **kwargs)
+    flat, keywords, shape = _inputs(args, kwargs)
+    options = {key: value for key, value in kwargs.items() if key not in keywords}
+    n = flat[0].size
+    chunk = math.ceil(n / threads)
+    bounds = [(start, min(start + chunk, n)) for start in range(0, n, chunk)]
+    with ThreadPoolExecutor(threads) as pool:
+        parts = list(pool.map(lambda b: function(*(a[b[0]:b[1]] for a in flat),
+                                                 **{key: value[b[0]:b[1]] for key, value in keywords.items()},
+                                                 **options), bounds))
+    if not parts:
+        return function(*flat, **keywords, **options)
+    result = np.concatenate(parts).reshape(shape)
+    return result.view(np.recarray) if result.dtype.names else result
+
+
+def _call(name, args, kwargs):
+    path = route(*args, **kwargs)
+    if path == 'scalar':
+        return _scalar(name)(*args, **kwargs)
+    if path == 'loop':
+        return _loop(name, args, kwargs)
+    threads = thresholds['threads'] if path == 'parallel' else 1
+    kernel = _batch_kernel(name)
+    if kernel is not None and set(kwargs) <= (_IV_OPTIONS if name in IV_FUNCTIONS else {'is_call'}):
+        return _run_batch(kernel, name, args, kwargs, threads)
+    return _vectorized(name, args, kwargs, threads)
+
+
+def _dispatcher(name):
+    """The public function ``name``, choosing a route on every call."""
+    reference = getattr(_module('models'), name)
+    signature = inspect.signature(reference)
+    required = [key for key, parameter in signature.parameters.items() if parameter.default is parameter.empty]
+    options = signature.parameters.keys() - required
+
+    @functools.wraps(reference)
+    def dispatch(*args, **kwargs):
+        if len(args) != len(required) or not kwargs.keys() <= options:
+            # Contract inputs positional and options such as is_call and sigma by keyword, whatever the call
+            bound = signature.bind(*args, **kwargs).arguments
+            args = tuple(bound.pop(key) for key in required)
+            kwargs = bound
+        if not instrument.enabled:
+            return _call(name, args, kwargs)
+        start = instrument.clock()
+        result = _call(name, args, kwargs)
+        instrument.record_result(name, start, result)
+        return result
+
+    dispatch.__doc__ = f'{reference.__doc__}\n\nDispatched by ``optrush.backend``; see the module documentation.'
+    return dispatch
+
+
+def implied_volatility(p, k, t, r, market_price, price_function, vega_function, sigma=0.2, tol=1e-5,
+                       max_iterations=100, full_output=False):
+    """Safeguarded Newton solve with user pricing functions, on scalars or arrays in lockstep.
+
+    Scalars go to ``models.implied_volatility`` and arrays to ``vectorized.implied_volatility``, whose
+    pricing functions must then accept arrays. The extension's ``implied_volatility`` is never used: it
+    calls the same Python functions and takes unguarded Newton steps.
+    """
+    module = _module('models' if route(p, k, t, r, market_price, sigma=sigma) == 'scalar' else 'vectorized')
+    if not instrument.enabled:
+        return module.implied_volatility(p, k, t, r, market_price, price_function, vega_function, sigma=sigma,
+                                         tol=tol, max_iterations=max_iterations, full_output=full_output)
+    start = instrument.clock()
+    result = module.implied_volatility(p, k, t, r, market_price, price_function, vega_function, sigma=sigma,
+                                       tol=tol, max_iterations=max_iterations, full_output=True)
+    instrument.record_result('implied_volatility', start, result)
+    return result if full_output else result.sigma
+
+
+def __getattr__(attribute):
+    if attribute not in FUNCTIONS and attribute not in IV_FUNCTIONS:
+        raise AttributeError(f'module {__name__!r} has no attribute {attribute!r}')
+    function = _dispatcher(attribute)
+    globals()[attribute] = function
+    return function
+
+
+def __dir__():
+    return sorted(set(globals()) | FUNCTIONS | IV_FUNCTIONS)
+
+
+if os.environ.get('OPTRUSH_DISPATCH'):
+    configure(os.environ['OPTRUSH_DISPATCH'])
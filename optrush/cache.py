@@ -0,0 +1,171 @@
+"""Bounded memoization of scalar pricing, greeks and implied-volatility calls.
+
+    from optrush.cache import PricingCache
+    cache = PricingCache(maxsize=100_000, ttl=5.0)
+    cache.bs_call_price(100.0, 105.0, 0.5, 0.02, 0.2)     # computed by optrush.backend
+    cache.bs_call_price(100.0, 105.0, 0.5, 0.02, 0.2)     # served from the cache
+    cache.stats().hit_rate
+
+Every function of ``optrush.backend`` is available as a method with the same
+signature. Keys are the function name and its arguments, bound to that
+signature with defaults filled in, quantized to ``precision`` relative to each
+value. Positional and keyword forms of a call share an entry, and so do inputs
+that differ only in their last bits. ``maxsize`` bounds the number of entries, evicting the
+least recently used, and entries older than ``ttl`` seconds are treated as
+misses. Only scalar calls are cached; calls with array arguments go straight
+to the backend and are counted as bypassed.
+
+Implied-volatility keys leave out the starting ``sigma``, whether passed
+positionally or by keyword, since it changes only the iteration count. On a
+miss, and with no ``sigma`` given, the solver is warm-started from the last
+converged sigma of the same contract. That means the same function, strike,
+expiry and rate, whatever the spot and market price of the tick. The Rust solver starts from a rough guess,
+so a close start can save several Newton iterations. The Python solvers
+already start from a close rational guess, so they only gain when the
+volatility barely moved.
+
+All methods are thread-safe. Values are computed outside the lock, so two
+threads missing on the same key at once may both compute it.
+"""
+import inspect
+import math
+import numbers
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from . import backend
+
+
+class CacheStats(NamedTuple):
+    """Counters of a ``PricingCache`` since creation or the last ``clear``."""
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    bypassed: int
+    warm_starts: int
+    size: int
+
+    @property
+    def hit_rate(self):
+        """Fraction of cacheable lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+_SCALARS = (numbers.Number, type(None))
+_COUNTERS = ('hits', 'misses', 'evictions', 'expirations', 'bypassed', 'warm_starts')
+_signatures = {}
+
+
+def _bind(name, args, kwargs):
+    """``args`` and ``kwargs`` bound to the signature of ``backend.<name>``."""
+    signature = _signatures.get(name)
+    if signature is None:
+        signature = _signatures[name] = inspect.signature(getattr(backend, name))
+    return signature.bind(*args, **kwargs)
+
+
+class PricingCache:
+    """LRU/TTL cache in front of the ``optrush.backend`` functions."""
+
+    def __init__(self, maxsize=65536, ttl=None, precision=1e-12, warm_start=True, clock=time.monotonic):
+        if maxsize < 1:
+            raise ValueError(f'maxsize must be positive, not {maxsize}')
+        if not 0 < precision < 1:
+            raise ValueError(f'precision must be in (0, 1), not {precision}')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.warm_start = warm_start
+        self.clock = clock
+        self._bits = math.ceil(-math.log2(precision))
+        self._entries = OrderedDict()
+        self._sigmas = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(_COUNTERS, 0)
+
+    def quantize(self, value):
+        """``value`` rounded to ``precision`` relative to itself; integers, flags and non-finite values unchanged."""
+        if not isinstance(value, numbers.Real) or isinstance(value, numbers.Integral):
+            return value
+        value = float(value)
+        if not math.isfinite(value):
+            return value
+        mantissa, exponent = math.frexp(value)
+        return math.ldexp(round(mantissa * (1 << self._bits)), exponent - self._bits)
+
+    def key(self, name, args, kwargs):
+        """Cache key of a call to ``name``; the IV starting point ``sigma`` is not part of it."""
+        return self._key(name, _bind(name, args, kwargs))
+
+    def _key(self, name, bound):
+        arguments = {parameter.name: parameter.default for parameter in bound.signature.parameters.values()}
+        arguments.update(bound.arguments)
+        if name in backend.IV_FUNCTIONS:
+            del arguments['sigma']
+        return (name, *map(self.quantize, arguments.values()))
+
+    def call(self, name, *args, **kwargs):
+        """``backend.<name>(*args, **kwargs)``, served from the cache when possible."""
+        function = getattr(backend, name)
+        values = args + tuple(kwargs.values())
+        if not all(isinstance(value, _SCALARS) for value in values):
+            with self._lock:
+                self._counts['bypassed'] += 1
+            return function(*args, **kwargs)
+        bound = _bind(name, args, kwargs)
+        key = self._key(name, bound)
+        contract = (name, *key[2:5]) if name in backend.IV_FUNCTIONS else None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expiry = entry
+                if expiry is None or self.clock() < expiry:
+                    self._entries.move_to_end(key)
+                    self._counts['hits'] += 1
+                    return value
+                del self._entries[key]
+                self._counts['expirations'] += 1
+            self._counts['misses'] += 1
+            start = self._sigmas.get(contract) if self.warm_start and contract is not None else None
+            if start is not None and bound.arguments.get('sigma') is None:
+                bound.arguments['sigma'] = start
+                self._counts['warm_starts'] += 1
+        value = function(*bound.args, **bound.kwargs)
+        with self._lock:
+            self._entries[key] = (value, None if self.ttl is None else self.clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._counts['evictions'] += 1
+            if contract is not None and value.converged:
+                self._sigmas[contract] = value.sigma
+                self._sigmas.move_to_end(contract)
+                if len(self._sigmas) > self.maxsize:
+                    self._sigmas.popitem(last=False)
+        return value
+
+    def stats(self):
+        """A ``CacheStats`` snapshot."""
+        with self._lock:
+            return CacheStats(**self._counts, size=len(self._entries))
+
+    def clear(self):
+        """Drop every entry and warm-start sigma, and zero the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._sigmas.clear()
+            self._counts = dict.fromkeys(_COUNTERS, 0)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getattr__(self, name):
+        if name not in backend.FUNCTIONS and name not in backend.IV_FUNCTIONS:
+            raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+        return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | backend.FUNCTIONS | backend.IV_FUNCTIONS)
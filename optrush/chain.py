@@ -0,0 +1,143 @@
+"""Prepared option chains for repricing the same contracts on every tick.
+
+A ``PreparedChain`` holds a fixed set of contracts priced with one model. The
+strike, expiry and rate invariants (``log(k)``, ``sqrt(t)``, ``exp(-r * t)``,
+...) are computed once, and the volatility terms whenever ``set_sigma`` changes
+them. Each call to ``price`` or ``greeks`` only recomputes the contracts whose
+spot/forward or sigma changed since the previous call and serves the rest from
+the cached results.
+"""
+import numpy as np
+
+from .vectorized import GREEKS_DTYPE, norm_cdf, norm_pdf
+
+
+MODELS = ('bs', 'bk', 'bach')
+
+
+class PreparedChain:
+    """Contracts with fixed strike, expiry, rate and call/put flag, repriced incrementally.
+
+    ``model`` is ``'bs'`` (spot inputs), ``'bk'`` or ``'bach'`` (forward inputs). The
+    arrays returned by ``price`` and ``greeks`` are read-only views of the cache and
+    are updated in place by the next call.
+    """
+
+    def __init__(self, model, k, t, r, sigma, is_call=True):
+        if model not in MODELS:
+            raise ValueError(f'unknown model {model!r}, expected one of {MODELS}')
+        k, t, r, is_call = (np.ravel(a) for a in np.broadcast_arrays(*map(np.asarray, (k, t, r, is_call))))
+        self.model = model
+        self.k = k.astype(float)
+        self.t = t.astype(float)
+        self.r = r.astype(float)
+        self.sign = np.where(is_call, 1.0, -1.0)
+        self.sqrt_t = np.sqrt(self.t)
+        self.df = np.exp(-self.r * self.t)
+        self.k_df = self.k * self.df
+        self.log_k = np.log(self.k) if model != 'bach' else None
+        self.sigma = np.full(len(self.k), np.nan)
+        self.vol = np.empty_like(self.sigma)
+        self.drift = np.empty_like(self.sigma)
+        self.theta_scale = np.empty_like(self.sigma)
+        self._price = np.full(len(self.k), np.nan)
+        self._price_spot = np.full(len(self.k), np.nan)
+        self._greeks = np.full(len(self.k), np.nan, dtype=GREEKS_DTYPE).view(np.recarray)
+        self._greeks_spot = np.full(len(self.k), np.nan)
+        self.recomputed = 0
+        self.set_sigma(sigma)
+
+    def __len__(self):
+        return len(self.k)
+
+    def set_sigma(self, sigma, index=slice(None)):
+        """Update the volatility of the contracts selected by ``index`` and mark those that changed as dirty."""
+        index = np.arange(len(self))[index]
+        sigma = np.broadcast_to(np.asarray(sigma, dtype=float), index.shape)
+        changed = index[self.sigma[index] != sigma]
+        if not changed.size:
+            return
+        sigma = sigma[self.sigma[index] != sigma]
+        self.sigma[changed] = sigma
+        self.vol[changed] = sigma * self.sqrt_t[changed]
+        self.theta_scale[changed] = 0.5 * sigma / self.sqrt_t[changed]
+        variance = 0.5 * sigma ** 2 * self.t[changed]
+        self.drift[changed] = variance + self.r[changed] * self.t[changed] if self.model == 'bs' else variance
+        self._price_spot[changed] = np.nan
+        self._greeks_spot[changed] = np.nan
+
+    def _dirty(self, cached_spot, spot):
+        """Broadcast ``spot`` to the chain and select the contracts whose cached spot differs (NaN never matches)."""
+        spot = np.broadcast_to(np.asarray(spot, dtype=float), (len(self),))
+        dirty = np.flatnonzero(cached_spot != spot)
+        self.recomputed = dirty.size
+        return spot, slice(None) if dirty.size == len(self) else dirty
+
+    def _d(self, s, i):
+        """d1 and d2 for the Black-Scholes and Black models, or d twice for Bachelier."""
+        if self.model == 'bach':
+            d = (s - self.k[i]) / self.vol[i]
+            return d, d
+        d1 = (np.log(s) - self.log_k[i] + self.drift[i]) / self.vol[i]
+        return d1, d1 - self.vol[i]
+
+    def price(self, spot):
+        """Price every contract at ``spot`` (a scalar or one value per contract), recomputing only dirty contracts."""
+        spot, i = self._dirty(self._price_spot, spot)
+        if self.recomputed:
+            s, sign = spot[i], self.sign[i]
+            d1, d2 = self._d(s, i)
+            if self.model == 'bs':
+                price = sign * (s * norm_cdf(sign * d1) - self.k_df[i] * norm_cdf(sign * d2))
+            elif self.model == 'bk':
+                price = sign * self.df[i] * (s * norm_cdf(sign * d1) - self.k[i] * norm_cdf(sign * d2))
+            else:
+                price = self.df[i] * (sign * (s - self.k[i]) * norm_cdf(sign * d1) + self.vol[i] * norm_pdf(d1))
+            self._price[i] = price
+            self._price_spot[i] = s
+        return self._readonly(self._price)
+
+    def greeks(self, spot):
+        """Price and greeks of every contract at ``spot`` as a ``GREEKS_DTYPE`` record array, recomputing only dirty contracts."""
+        spot, i = self._dirty(self._greeks_spot, spot)
+        if self.recomputed:
+            s, sign, df = spot[i], self.sign[i], self.df[i]
+            d1, d2 = self._d(s, i)
+            pdf_d1 = norm_pdf(d1)
+            cdf_d1 = norm_cdf(sign * d1)
+            out = self._greeks
+            if self.model == 'bs':
+                cdf_d2 = norm_cdf(sign * d2)
+                out.price[i] = sign * (s * cdf_d1 - self.k_df[i] * cdf_d2)
+                out.delta[i] = sign * cdf_d1
+                out.gamma[i] = pdf_d1 / (s * self.vol[i])
+                out.vega[i] = s * pdf_d1 * self.sqrt_t[i]
+                out.theta[i] = -s * pdf_d1 * self.theta_scale[i] - sign * self.r[i] * self.k_df[i] * cdf_d2
+                out.rho[i] = sign * self.k_df[i] * self.t[i] * cdf_d2
+            elif self.model == 'bk':
+                price = sign * df * (s * cdf_d1 - self.k[i] * norm_cdf(sign * d2))
+                out.price[i] = price
+                out.delta[i] = sign * df * cdf_d1
+                out.gamma[i] = df * pdf_d1 / (s * self.vol[i])
+                out.vega[i] = df * s * pdf_d1 * self.sqrt_t[i]
+                out.theta[i] = -s * df * pdf_d1 * self.theta_scale[i] + self.r[i] * price
+                out.rho[i] = -self.t[i] * price
+            else:
+                price = df * (sign * (s - self.k[i]) * cdf_d1 + self.vol[i] * pdf_d1)
+                out.price[i] = price
+                out.delta[i] = sign * df * cdf_d1
+                out.gamma[i] = df * pdf_d1 / self.vol[i]
+                out.vega[i] = df * self.sqrt_t[i] * pdf_d1
+                out.theta[i] = -df * pdf_d1 * self.theta_scale[i] + self.r[i] * price
+                out.rho[i] = sign * self.t[i] * price
+            self._greeks_spot[i] = s
+            self._price[i] = out.price[i]
+            self._price_spot[i] = s
+        return self._readonly(self._greeks)
+
+    @staticmethod
+    def _readonly(values):
+        """A read-only view of a cache array."""
+        view = values.view()
+        view.flags.writeable = False
+        return view
@@ -0,0 +1,156 @@
+"""Opt-in counters and histograms for the pricing, greeks and implied-volatility entry points.
+
+    from optrush import backend, instrument
+    instrument.enable()
+    backend.bs_call_iv(spot, strikes, 0.5, 0.02, quotes)
+    stats = instrument.snapshot()['backend']['bs_call_iv']
+    stats['calls'], stats['nonconverged'], stats['iterations']
+
+Two layers keep statistics. ``backend`` covers every function dispatched by
+``optrush.backend``, whichever route and implementation served it. ``extension``
+holds the Rust extension's own counters for its batch kernels, its scalar IV
+solvers and ``implied_volatility``; it is empty when the extension is not built.
+``enable``, ``disable`` and ``reset`` act on both.
+
+Each entry of a layer is keyed by function name and holds:
+
+    model           'bs', 'bk', 'bach', or None for the normal distribution functions
+    calls           number of calls
+    elements        number of contracts priced or quotes solved
+    seconds         total wall time
+    latency         call counts per ``LATENCY_BUCKETS`` bucket: bucket b holds calls
+                    that took [2**(b - 1), 2**b) nanoseconds, the last one anything longer
+    sizes           call counts per element count, bucketed the same way
+    iterations      quote counts per solver iteration count, the last bucket
+                    counting ``ITERATION_BUCKETS - 1`` iterations or more (IV only)
+    nonconverged    quotes the solver did not converge on (IV only)
+
+Disabled, which is the default unless ``OPTRUSH_INSTRUMENT=1`` is set, an entry
+point pays one attribute lookup in Python and one relaxed atomic load in Rust.
+"""
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+
+LATENCY_BUCKETS = 40
+ITERATION_BUCKETS = 101
+
+enabled = os.environ.get('OPTRUSH_INSTRUMENT', '0') not in ('', '0')
+_stats = {}
+_lock = threading.Lock()
+clock = time.perf_counter_ns
+
+
+def _model(name):
+    prefix = name.split('_', 1)[0]
+    return prefix if prefix in ('bs', 'bk', 'bach') else None
+
+
+def _bucket(value):
+    """Index of the log2 histogram bucket holding the non-negative integer ``value``."""
+    return min(int(value).bit_length(), LATENCY_BUCKETS - 1)
+
+
+class _Stats:
+    """Running totals of one function."""
+    __slots__ = ('calls', 'elements', 'nanoseconds', 'nonconverged', 'latency', 'sizes', 'iterations')
+
+    def __init__(self):
+        self.calls = self.elements = self.nanoseconds = self.nonconverged = 0
+        self.latency = [0] * LATENCY_BUCKETS
+        self.sizes = [0] * LATENCY_BUCKETS
+        self.iterations = [0] * ITERATION_BUCKETS
+
+    def as_dict(self, name):
+        return {'model': _model(name), 'calls': self.calls, 'elements': self.elements,
+                'seconds': self.nanoseconds * 1e-9, 'latency': list(self.latency), 'sizes': list(self.sizes),
+                'iterations': list(self.iterations), 'nonconverged': self.nonconverged}
+
+
+def record(name, nanoseconds, elements=1, iterations=None, converged=None):
+    """Add one call of ``name`` that took ``nanoseconds`` on ``elements`` contracts.
+
+    For solvers, ``iterations`` and ``converged`` hold the per-quote results, as scalars or arrays.
+    """
+    counts = ()
+    if isinstance(iterations, np.ndarray):
+        histogram = np.bincount(np.minimum(iterations[iterations >= 0], ITERATION_BUCKETS - 1),
+                                minlength=ITERATION_BUCKETS)
+        counts = [(int(i), int(histogram[i])) for i in np.flatnonzero(histogram)]
+        failures = converged.size - int(np.count_nonzero(converged))
+    elif iterations is not None:
+        counts = [(min(int(iterations), ITERATION_BUCKETS - 1), 1)]
+        failures = 0 if converged else 1
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = _Stats()
+        stats.calls += 1
+        stats.elements += elements
+        stats.nanoseconds += nanoseconds
+        stats.latency[_bucket(nanoseconds)] += 1
+        stats.sizes[_bucket(elements)] += 1
+        for i, count in counts:
+            stats.iterations[i] += count
+        if iterations is not None:
+            stats.nonconverged += failures
+
+
+def record_result(name, start, result):
+    """``record`` a call of ``name`` started at ``clock()`` time ``start`` from the result it returned."""
+    elapsed = clock() - start
+    if not isinstance(result, np.ndarray):     # a float, models.Greeks or models.IVResult
+        if isinstance(result, tuple) and hasattr(result, 'converged'):
+            return record(name, elapsed, 1, result.iterations, result.converged)
+        return record(name, elapsed)
+    if result.dtype.names and 'converged' in result.dtype.names:
+        return record(name, elapsed, result.size, np.ravel(result['iterations']), np.ravel(result['converged']))
+    record(name, elapsed, result.size)
+
+
+def _extension():
+    """The Rust extension if it is already imported; instrumentation never imports it by itself."""
+    return sys.modules.get(f'{__package__}.optrush')
+
+
+def enable():
+    """Start collecting statistics in both layers."""
+    global enabled
+    enabled = True
+    extension = _extension()
+    if extension is not None:
+        extension.instrumentation(True)
+
+
+def disable():
+    """Stop collecting statistics; what was collected is kept until ``reset``."""
+    global enabled
+    enabled = False
+    extension = _extension()
+    if extension is not None:
+        extension.instrumentation(False)
+
+
+def reset():
+    """Drop all statistics."""
+    with _lock:
+        _stats.clear()
+    extension = _extension()
+    if extension is not None:
+        extension.instrumentation_reset()
+
+
+def snapshot():
+    """A copy of the statistics so far, as ``{'backend': {name: stats}, 'extension': {name: stats}}``."""
+    with _lock:
+        python = {name: stats.as_dict(name) for name, stats in sorted(_stats.items())}
+    extension = _extension()
+    rust = {}
+    if extension is not None:
+        for name, stats in sorted(extension.instrumentation_snapshot().items()):
+            rust[name] = dict(stats, model=_model(name))
+    return {'backend': python, 'extension': rust}
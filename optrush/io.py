@@ -0,0 +1,173 @@
+"""Columnar chain files that are memory-mapped into the array kernels.
+
+A chain file is a directory with one ``.npy`` file per column and a
+``schema.json`` header recording the row count, the column dtypes and any
+constant columns (a single rate, say) stored as scalars:
+
+    chain/
+        schema.json     {"format": "optrush-chain", "version": 1, "rows": n,
+                         "columns": {"strike": "<f8", ...}, "constants": {"rate": 0.03}}
+        strike.npy
+        ...
+
+``open_chain`` memory-maps every column, so opening a file costs nothing and
+only the pages that are touched are read. ``map_chain`` runs a kernel over
+chunks of rows and writes every chunk of the result straight into
+memory-mapped output columns. Heap memory is therefore bounded by
+``chunk_size``, whatever the size of the file. The column names used by
+``price_chain`` and ``implied_vol_chain`` are those of ``optrush.portfolio``:
+``spot`` (the forward for the Black and Bachelier models), ``strike``,
+``expiry`` (years), ``rate``, ``sigma``, ``price`` and ``is_call``.
+"""
+import json
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+from . import vectorized
+from .chain import MODELS
+
+
+FORMAT = 'optrush-chain'
+FORMAT_VERSION = 1
+CHUNK_SIZE = 1 << 18
+
+
+class Chain(Mapping):
+    """Read-only mapping from column name to a memory-mapped column of a chain file.
+
+    Constant columns are returned as zero-copy broadcasts of their value.
+    """
+
+    def __init__(self, path, mmap_mode='r'):
+        with open(os.path.join(path, 'schema.json')) as f:
+            schema = json.load(f)
+        if schema.get('format') != FORMAT or schema.get('version') != FORMAT_VERSION:
+            raise ValueError(f'{path} is not a version {FORMAT_VERSION} {FORMAT} file')
+        self.path = path
+        self.rows = schema['rows']
+        self.constants = schema['constants']
+        self.columns = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode)
+                        for name in schema['columns']}
+
+    def __getitem__(self, name):
+        if name in self.columns:
+            return self.columns[name]
+        return np.broadcast_to(np.asarray(self.constants[name]), (self.rows,))
+
+    def __iter__(self):
+        yield from self.columns
+        yield from self.constants
+
+    def __len__(self):
+        return len(self.columns) + len(self.constants)
+
+    def chunk(self, name, start, stop):
+        """Rows ``start:stop`` of a column, or the scalar value of a constant column."""
+        if name in self.columns:
+            return self.columns[name][start:stop]
+        return np.asarray(self.constants[name])
+
+
+def open_chain(path, mmap_mode='r'):
+    """Open the chain file ``path``, memory-mapping its columns unless ``mmap_mode`` is None."""
+    return Chain(path, mmap_mode)
+
+
+class ChainWriter:
+    """Writes a chain file of ``rows`` rows chunk by chunk; the schema is written by ``close``.
+
+    Columns are created on first write with the dtype of the data, as ``.npy`` files opened
+    with ``numpy.lib.format.open_memmap``, and flushed after every chunk.
+    """
+
+    def __init__(self, path, rows, constants=None):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.rows = rows
+        self.constants = dict(constants or {})
+        self.columns = {}
+
+    def write(self, start, columns):
+        """Store each array of the mapping ``columns`` at rows ``start:start + len(array)``."""
+        for name, values in columns.items():
+            values = np.asarray(values)
+            if name not in self.columns:
+                self.columns[name] = np.lib.format.open_memmap(
+                    os.path.join(self.path, f'{name}.npy'), mode='w+', dtype=values.dtype, shape=(self.rows,))
+            column = self.columns[name]
+            column[start:start + len(values)] = values
+            column.flush()
+
+    def close(self):
+        """Flush every column and write ``schema.json``."""
+        schema = {'format': FORMAT, 'version': FORMAT_VERSION, 'rows': self.rows,
+                  'columns': {name: column.dtype.str for name, column in self.columns.items()},
+                  'constants': self.constants}
+        for column in self.columns.values():
+            column.flush()
+        self.columns = {}
+        with open(os.path.join(self.path, 'schema.json'), 'w') as f:
+            json.dump(schema, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_chain(path, columns, chunk_size=CHUNK_SIZE):
+    """Write a mapping or DataFrame of columns to ``path``; scalar values are stored as constants."""
+    arrays = {name: np.asarray(values) for name, values in columns.items()}
+    constants = {name: values.item() for name, values in arrays.items() if values.ndim == 0}
+    arrays = {name: values for name, values in arrays.items() if values.ndim}
+    rows = len(next(iter(arrays.values()))) if arrays else 0
+    with ChainWriter(path, rows, constants) as writer:
+        for start in range(0, rows, chunk_size):
+            writer.write(start, {name: values[start:start + chunk_size] for name, values in arrays.items()})
+    return open_chain(path)
+
+
+def map_chain(function, source, destination, inputs, chunk_size=CHUNK_SIZE):
+    """Apply ``function`` to the ``inputs`` columns of ``source`` chunk by chunk, writing the result to ``destination``.
+
+    ``function`` receives one argument per input name and returns a record array, whose fields become
+    the columns of the destination chain.
+    """
+    chain = source if isinstance(source, Chain) else open_chain(source)
+    missing = [name for name in inputs if name not in chain]
+    if missing:
+        raise KeyError(f'{chain.path} has no columns {missing}')
+    with ChainWriter(destination, chain.rows) as writer:
+        for start in range(0, chain.rows, chunk_size):
+            stop = min(start + chunk_size, chain.rows)
+            result = function(*(chain.chunk(name, start, stop) for name in inputs))
+            writer.write(start, {name: np.broadcast_to(result[name], (stop - start,)) for name in result.dtype.names})
+    return open_chain(destination)
+
+
+def _check_model(model):
+    if model not in MODELS:
+        raise ValueError(f'unknown model {model!r}, expected one of {MODELS}')
+
+
+def price_chain(source, destination, model, chunk_size=CHUNK_SIZE):
+    """Write the price and greeks of every row of ``source`` to ``destination``, one column per greek."""
+    _check_model(model)
+    greeks = getattr(vectorized, f'{model}_greeks')
+    return map_chain(lambda s, k, t, r, sigma, is_call: greeks(s, k, t, r, sigma, is_call=is_call),
+                     source, destination, ('spot', 'strike', 'expiry', 'rate', 'sigma', 'is_call'), chunk_size)
+
+
+def implied_vol_chain(source, destination, model, chunk_size=CHUNK_SIZE, tol=1e-10, max_iterations=100):
+    """Write the implied volatility of the ``price`` of every row of ``source`` to ``destination``.
+
+    The result has the ``vectorized.IV_DTYPE`` columns ``sigma``, ``iterations`` and ``converged``.
+    """
+    _check_model(model)
+    solve = getattr(vectorized, f'{model}_iv')
+    return map_chain(lambda s, k, t, r, price, is_call: solve(s, k, t, r, price, is_call=is_call, tol=tol,
+                                                             max_iterations=max_iterations),
+                     source, destination, ('spot', 'strike', 'expiry', 'rate', 'price', 'is_call'), chunk_size)
@@ -0,0 +1,241 @@
+"""Table-driven implied volatility for the Black and Bachelier models.
+
+Both models reduce to a normalised price that depends on few variables:
+
+    Black       b(x, s) for x = -|ln(F / K)| and total volatility s = sigma * sqrt(t)
+    Bachelier   nu(d) = time value / |F - K| for d = |F - K| / (sigma * sqrt(t))
+
+A table tabulates the inverse of that map. ``BlackIVTable`` keeps one row per
+x, spaced geometrically in |x|, holding ln(s) against the increasing key
+ln(b / (b_max - b)) with b_max = exp(x / 2). ``BachelierIVTable`` keeps a
+single row of ln(d) against ln(nu). A query finds its cell with one
+``searchsorted`` over all rows, evaluates a cubic Hermite interpolant with
+the exact derivatives stored at the nodes, blends the two neighbouring Black
+rows linearly in ln|x|, and takes at most one Householder step of the solvers
+in ``optrush.vectorized``. Quotes outside a table are handed to the full
+solver.
+
+Accuracy of the default tables, as relative error in sigma (the worst case
+over 10^5 random quotes, also recorded in ``accuracy`` by ``build``):
+
+    Black       |x| <= 6 and 1e-4 <= s <= 10: 2e-4 interpolated, 1e-9 polished
+    Bachelier   1e-8 <= d <= 35:              1e-7 interpolated, 5e-13 polished
+
+The polished Black bound is only reached by quotes with b below about 1e-100,
+where it is the rounding floor of b(x, s) itself, shared by the full solver;
+elsewhere the error stays within a few 1e-11.
+
+Tables are saved as a directory of ``.npy`` files with a JSON header, and
+``load`` memory-maps them. Worker processes therefore share one copy of the
+pages instead of building their own.
+"""
+import functools
+import json
+import os
+
+import numpy as np
+
+from .vectorized import (FRAC_1_SQRT_2PI, _bach_iv, _bach_time_value_step, _black_iv, _broadcast, _iv_result,
+                         _normalized_black, _normalized_black_step, norm_cdf, norm_pdf)
+
+
+FORMAT_VERSION = 1
+
+
+class _HermiteTable:
+    """Rows of increasing keys with the value and d(value)/d(key) at every node.
+
+    Row i is stored with ``i * offset`` added to its keys, so the flattened keys are sorted and one
+    ``searchsorted`` locates a cell in any row.
+    """
+    kind = None
+
+    def __init__(self, keys, values, slopes, offset, accuracy=None, **params):
+        self.keys, self.values, self.slopes = keys, values, slopes
+        self.offset = offset
+        self.accuracy = accuracy or {}
+        self.params = params
+
+    def _interpolate(self, row, key):
+        """Interpolated value of ``key`` in ``row``, and whether the key lies inside that row."""
+        n = self.keys.shape[1]
+        keys, values, slopes = self.keys.ravel(), self.values.ravel(), self.slopes.ravel()
+        key = key + row * self.offset
+        first = row * n
+        j = np.clip(np.searchsorted(keys, key) - 1, first, first + n - 2)
+        k0, k1 = keys[j], keys[j + 1]
+        h = k1 - k0
+        u = (key - k0) / h
+        value = ((2 * u - 3) * u * u + 1) * values[j] + ((u - 2) * u + 1) * u * h * slopes[j] \
+            + (3 - 2 * u) * u * u * values[j + 1] + (u - 1) * u * u * h * slopes[j + 1]
+        return value, (keys[first] <= key) & (key <= keys[first + n - 1])
+
+    def save(self, path):
+        """Write the table to the directory ``path`` as one ``.npy`` file per array and ``header.json``."""
+        os.makedirs(path, exist_ok=True)
+        for name in ('keys', 'values', 'slopes'):
+            np.save(os.path.join(path, f'{name}.npy'), np.ascontiguousarray(getattr(self, name)))
+        header = {'kind': self.kind, 'version': FORMAT_VERSION, 'offset': self.offset, 'accuracy': self.accuracy,
+                  'params': self.params}
+        with open(os.path.join(path, 'header.json'), 'w') as f:
+            json.dump(header, f, indent=2)
+
+
+class BlackIVTable(_HermiteTable):
+    """Inverse of the normalised Black price b(x, s) on rows of x = -|ln(F / K)|."""
+    kind = 'black'
+
+    @classmethod
+    def build(cls, rows=256, columns=256, x_min=1e-8, x_max=6.0, s_min=1e-5, s_max=50.0):
+        """Tabulate ``rows`` values of |x| in [x_min, x_max] by ``columns`` values of s up to ``s_max``.
+
+        Each row starts where b(x, s) is about 1e-300, or at ``s_min`` near the money.
+        """
+        x = -np.geomspace(x_min, x_max, rows)[:, None]
+        start = np.log(np.maximum(-x / 37, s_min))
+        log_s = start + np.linspace(0, 1, columns) * (np.log(s_max) - start)
+        s = np.exp(log_s)
+        b = _normalized_black(x, s)
+        gap = np.exp(0.5 * x) * norm_cdf(-x / s - 0.5 * s) + np.exp(-0.5 * x) * norm_cdf(x / s - 0.5 * s)
+        keys = np.log(b) - np.log(gap)
+        slopes = 1 / (s * FRAC_1_SQRT_2PI * np.exp(-0.5 * (x * x / (s * s) + 0.25 * s * s)) * (1 / b + 1 / gap))
+        offset = float(np.ceil(keys.max() - keys.min()) + 1)
+        table = cls(keys + offset * np.arange(rows)[:, None], log_s, slopes, offset, rows=rows, columns=columns,
+                    x_min=x_min, x_max=x_max, s_min=s_min, s_max=s_max)
+        table.accuracy = table.measure()
+        return table
+
+    def lookup(self, x, beta, polish=True):
+        """Total volatility s with b(x, s) = beta for x <= 0, and a mask of the quotes inside the table."""
+        x, beta = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(beta, dtype=float))
+        p = self.params
+        with np.errstate(all='ignore'):
+            key = np.log(beta) - np.log(np.exp(0.5 * x) - beta)
+            scale = (p['rows'] - 1) / np.log(p['x_max'] / p['x_min'])
+            position = np.log(np.clip(-x, p['x_min'], p['x_max']) / p['x_min']) * scale
+            row = np.clip(np.floor(position), 0, p['rows'] - 2).astype(np.intp)
+            weight = position - row
+            below, inside_below = self._interpolate(row, key)
+            above, inside_above = self._interpolate(row + 1, key)
+            s = np.exp(below + weight * (above - below))
+            inside = inside_below & inside_above & (-x <= p['x_max'])
+            if polish:
+                _, step = _normalized_black_step(s, x, beta, s * s < -2 * x)
+                s = np.where(np.isfinite(step), s + step, s)
+        return np.where(inside, s, np.nan), inside
+
+    def measure(self, samples=100_000, seed=0, x_max=6.0, s_min=1e-4, s_max=10.0):
+        """Largest relative error in s, interpolated and polished, over random quotes in the documented domain."""
+        rng = np.random.default_rng(seed)
+        x = -np.exp(rng.uniform(np.log(self.params['x_min']), np.log(x_max), samples))
+        s = np.exp(rng.uniform(np.log(np.maximum(-x / 30, s_min)), np.log(s_max)))
+        beta = _normalized_black(x, s)
+        return {'interpolated': float(np.max(np.abs(self.lookup(x, beta, polish=False)[0] / s - 1))),
+                'polished': float(np.max(np.abs(self.lookup(x, beta)[0] / s - 1)))}
+
+
+class BachelierIVTable(_HermiteTable):
+    """Inverse of the normalised Bachelier time value nu(d) = pdf(d) / d - cdf(-d)."""
+    kind = 'bachelier'
+
+    @classmethod
+    def build(cls, points=1024, d_min=1e-8, d_max=35.0):
+        """Tabulate ``points`` values of d in [d_min, d_max], spaced geometrically."""
+        d = np.geomspace(d_max, d_min, points)[None, :]
+        pdf = norm_pdf(d)
+        nu = pdf / d - norm_cdf(-d)
+        # d ln(d) / d ln(nu) = nu / (d * dnu/dd) with dnu/dd = -pdf / d^2
+        table = cls(np.log(nu), np.log(d), -nu * d / pdf, 0.0, points=points, d_min=d_min, d_max=d_max)
+        table.accuracy = table.measure()
+        return table
+
+    def lookup(self, nu, polish=True):
+        """d with nu(d) = ``nu``, and a mask of the quotes inside the table."""
+        nu = np.asarray(nu, dtype=float)
+        with np.errstate(all='ignore'):
+            log_d, inside = self._interpolate(np.zeros(nu.shape, dtype=np.intp), np.log(nu))
+            d = np.exp(log_d)
+            if polish:
+                _, step = _bach_time_value_step(d, nu)
+                d = np.where(np.isfinite(step), d + step, d)
+        return np.where(inside, d, np.nan), inside
+
+    def measure(self, samples=100_000, seed=0, d_min=1e-8, d_max=35.0):
+        """Largest relative error in d, interpolated and polished, over random quotes in the documented domain."""
+        d = np.exp(np.random.default_rng(seed).uniform(np.log(d_min), np.log(d_max), samples))
+        nu = norm_pdf(d) / d - norm_cdf(-d)
+        return {'interpolated': float(np.max(np.abs(self.lookup(nu, polish=False)[0] / d - 1))),
+                'polished': float(np.max(np.abs(self.lookup(nu)[0] / d - 1)))}
+
+
+TABLES = {table.kind: table for table in (BlackIVTable, BachelierIVTable)}
+
+
+def load(path, mmap_mode='r'):
+    """Open a table written by ``save``, memory-mapping its arrays unless ``mmap_mode`` is None."""
+    with open(os.path.join(path, 'header.json')) as f:
+        header = json.load(f)
+    if header.get('version') != FORMAT_VERSION or header.get('kind') not in TABLES:
+        raise ValueError(f'{path} is not a version {FORMAT_VERSION} implied-volatility table')
+    arrays = (np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mmap_mode) for name in ('keys', 'values', 'slopes'))
+    return TABLES[header['kind']](*arrays, header['offset'], header['accuracy'], **header['params'])
+
+
+@functools.lru_cache(maxsize=None)
+def default_table(kind):
+    """The default ``'black'`` or ``'bachelier'`` table, built once per process on first use."""
+    return TABLES[kind].build()
+
+
+def _black_table_iv(f, k, t, r, market_price, is_call, table, polish):
+    """Implied Black volatility from ``table``, solving quotes outside it with ``vectorized`` in full."""
+    f, k, t, r, market_price, is_call = np.broadcast_arrays(f, k, t, r, market_price, is_call)
+    shape = f.shape
+    f, k, t, r, market_price = (np.ravel(a).astype(float) for a in (f, k, t, r, market_price))
+    is_call = np.ravel(is_call)
+    sign = np.where(is_call, 1.0, -1.0)
+    with np.errstate(all='ignore'):
+        beta = (market_price * np.exp(r * t) - np.maximum(sign * (f - k), 0)) / np.sqrt(f * k)
+        x = -np.abs(np.log(f / k))
+    s, inside = (table or default_table('black')).lookup(x, beta, polish)
+    iv = _iv_result(s / np.sqrt(t), int(polish), inside, f.size)
+    miss = np.flatnonzero(~inside)
+    if miss.size:
+        iv[miss] = _black_iv(f[miss], k[miss], t[miss], r[miss], market_price[miss], is_call[miss], np.nan, 1e-10, 100)
+    return iv.reshape(shape)
+
+
+@_broadcast
+def bs_iv(s, k, t, r, market_price, is_call=True, table=None, polish=True):
+    """Black-Scholes volatilities of a whole chain from a ``BlackIVTable`` (the default one if None)."""
+    return _black_table_iv(s * np.exp(r * t), k, t, r, market_price, is_call, table, polish)
+
+
+@_broadcast
+def bk_iv(f, k, t, r, market_price, is_call=True, table=None, polish=True):
+    """Black model volatilities of a whole chain from a ``BlackIVTable`` (the default one if None)."""
+    return _black_table_iv(f, k, t, r, market_price, is_call, table, polish)
+
+
+@_broadcast
+def bach_iv(f, k, t, r, market_price, is_call=True, table=None, polish=True):
+    """Bachelier volatilities of a whole chain from a ``BachelierIVTable`` (the default one if None).
+
+    At the money and where d is below the table, the solver's closed forms are used; quotes with d
+    above it are solved in full.
+    """
+    f, k, t, r, market_price, is_call = np.broadcast_arrays(f, k, t, r, market_price, is_call)
+    shape = f.shape
+    f, k, t, r, market_price = (np.ravel(a).astype(float) for a in (f, k, t, r, market_price))
+    is_call = np.ravel(is_call)
+    table = table or default_table('bachelier')
+    with np.errstate(all='ignore'):
+        time_value = market_price * np.exp(r * t) - np.maximum(np.where(is_call, 1.0, -1.0) * (f - k), 0)
+        nu = time_value / np.abs(f - k)
+        d, inside = table.lookup(nu, polish)
+        sigma = np.abs(f - k) / (d * np.sqrt(t))
+    iv = _iv_result(sigma, int(polish), inside, f.size)
+    miss = np.flatnonzero(~inside)
+    if miss.size:
+        iv[miss] = _bach_iv(f[miss], k[miss], t[miss], r[miss], market_price[miss], is_call[miss], np.nan, 1e-10, 100)
+    return iv.reshape(shape)
@@ -1,16 +1,115 @@
 import math
-from scipy.stats import norm
-from typing import Callable
+from typing import Callable, NamedTuple, Union
+
+
+class Greeks(NamedTuple):
+    """Price and first-order greeks of a single option."""
+    price: float
+    delta: float
+    gamma: float
+    vega: float
+    theta: float
+    rho: float
+
+
+class FullGreeks(NamedTuple):
+    """Price and greeks of a single option up to third order.
+
+    ``vanna``, ``volga``, ``speed``, ``zomma`` and ``ultima`` are the derivatives of delta by sigma, vega by
+    sigma, gamma by spot, gamma by sigma and volga by sigma. ``charm`` and ``color`` are the decay of delta and
+    gamma, minus their derivatives by t, with the sign convention of theta.
+    """
+    price: float
+    delta: float
+    gamma: float
+    vega: float
+    theta: float
+    rho: float
+    vanna: float
+    volga: float
+    charm: float
+    speed: float
+    zomma: float
+    color: float
+    ultima: float
+
+
+class IVResult(NamedTuple):
+    """Implied volatility of a single quote with the solver's iteration count and convergence flag."""
+    sigma: float
+    iterations: int
+    converged: bool
+
+
+FRAC_1_SQRT_2 = 1 / math.sqrt(2)
+FRAC_1_SQRT_2PI = 1 / math.sqrt(2 * math.pi)
+# Acklam's rational approximation of the inverse normal CDF (relative error below 1.15e-9): numerator and
+# denominator coefficients in the central region |p - 1/2| <= 1/2 - NORM_PPF_TAIL, and in the lower tail
+NORM_PPF_TAIL = 0.02425
+NORM_PPF_CENTRAL = ((-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02, 1.383577518672690e+02,
+                     -3.066479806614716e+01, 2.506628277459239e+00),
+                    (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02, 6.680131188771972e+01,
+                     -1.328068155288572e+01, 1.0))
+NORM_PPF_LOWER = ((-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00, -2.549732539343734e+00,
+                   4.374664141464968e+00, 2.938163982698783e+00),
+                  (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00, 1.0))
+
+
+def _horner(coefficients, x):
+    """Evaluate the polynomial with ``coefficients`` (highest degree first) at x, a float or an array."""
+    result = 0.0
+    for c in coefficients:
+        result = result * x + c
+    return result
 
 
 def norm_cdf(x):
-    """Compute the cumulative distribution function of the standard normal distribution."""
-    return norm.cdf(x)
+    """Compute the cumulative distribution function of the standard normal distribution.
+
+    Uses the C library's ``erfc``, so the relative error stays below 2e-13 for x >= -37
+    (dominated by the rounding of x / sqrt(2)) instead of degrading in the lower tail.
+    Arrays and lists are passed on to ``vectorized.norm_cdf``.
+    """
+    try:
+        return 0.5 * math.erfc(-x * FRAC_1_SQRT_2)
+    except TypeError:
+        from .vectorized import norm_cdf
+        return norm_cdf(x)
 
 
 def norm_pdf(x):
-    """Compute the probability density function of the standard normal distribution."""
-    return norm.pdf(x)
+    """Compute the probability density function of the standard normal distribution.
+
+    Arrays and lists are passed on to ``vectorized.norm_pdf``.
+    """
+    try:
+        return FRAC_1_SQRT_2PI * math.exp(-0.5 * x * x)
+    except TypeError:
+        from .vectorized import norm_pdf
+        return norm_pdf(x)
+
+
+def norm_ppf(p):
+    """Compute the inverse of the standard normal cumulative distribution function.
+
+    Acklam's approximation refined by one Halley step, with the residual taken from ``erfc`` in the
+    lower tail and from ``erf`` around the median so that it does not cancel; the upper half follows
+    by symmetry. Relative error is within a few ulps.
+    """
+    if not 0 < p < 1:
+        return -math.inf if p == 0 else math.inf if p == 1 else math.nan
+    q = min(p, 1 - p)
+    if q < NORM_PPF_TAIL:
+        r = math.sqrt(-2 * math.log(q))
+        x = _horner(NORM_PPF_LOWER[0], r) / _horner(NORM_PPF_LOWER[1], r)
+        residual = norm_cdf(x) - q
+    else:
+        r = q - 0.5
+        x = r * _horner(NORM_PPF_CENTRAL[0], r * r) / _horner(NORM_PPF_CENTRAL[1], r * r)
+        residual = 0.5 * math.erf(x * FRAC_1_SQRT_2) - r
+    u = residual / norm_pdf(x)
+    x -= u / (1 + 0.5 * x * u)
+    return x if p <= 0.5 else -x
 
 
 def bs_d1(s, k, t, r, sigma):
@@ -85,6 +184,55 @@ def bs_put_rho(s, k, t, r, sigma):
     return -k * t * math.exp(-r * t) * norm_cdf(-bs_d2(s, k, t, r, sigma))
 
 
+def bs_greeks(s, k, t, r, sigma, is_call=True):
+    """Compute the Black-Scholes price and all greeks in one pass, sharing d1, d2 and the discount factor."""
+    sign = 1 if is_call else -1
+    sqrt_t = math.sqrt(t)
+    d1 = (math.log(s / k) + (r + 0.5 * sigma ** 2) * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    df = math.exp(-r * t)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(sign * d1)
+    cdf_d2 = norm_cdf(sign * d2)
+    return Greeks(
+        price=sign * (s * cdf_d1 - k * df * cdf_d2),
+        delta=sign * cdf_d1,
+        gamma=pdf_d1 / (s * sigma * sqrt_t),
+        vega=s * pdf_d1 * sqrt_t,
+        theta=-s * pdf_d1 * sigma / (2 * sqrt_t) - sign * r * k * df * cdf_d2,
+        rho=sign * k * t * df * cdf_d2)
+
+
+def bs_full_greeks(s, k, t, r, sigma, is_call=True):
+    """Compute the Black-Scholes price and greeks up to third order in one pass from their closed forms."""
+    sign = 1 if is_call else -1
+    sqrt_t = math.sqrt(t)
+    d1 = (math.log(s / k) + (r + 0.5 * sigma ** 2) * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    df = math.exp(-r * t)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(sign * d1)
+    cdf_d2 = norm_cdf(sign * d2)
+    gamma = pdf_d1 / (s * sigma * sqrt_t)
+    vega = s * pdf_d1 * sqrt_t
+    volga = vega * d1 * d2 / sigma
+    d1_t = (r / sigma + 0.5 * sigma) / sqrt_t - d1 / (2 * t)
+    return FullGreeks(
+        price=sign * (s * cdf_d1 - k * df * cdf_d2),
+        delta=sign * cdf_d1,
+        gamma=gamma,
+        vega=vega,
+        theta=-s * pdf_d1 * sigma / (2 * sqrt_t) - sign * r * k * df * cdf_d2,
+        rho=sign * k * t * df * cdf_d2,
+        vanna=-pdf_d1 * d2 / sigma,
+        volga=volga,
+        charm=-pdf_d1 * d1_t,
+        speed=-gamma / s * (d1 / (sigma * sqrt_t) + 1),
+        zomma=gamma * (d1 * d2 - 1) / sigma,
+        color=gamma * (d1 * d1_t + 0.5 / t),
+        ultima=-vega * (d1 * d2 * (1 - d1 * d2) + d1 * d1 + d2 * d2) / sigma ** 2)
+
+
 def bk_d1(f, k, t, sigma):
     """Calculate d1 for the Black model."""
     return (math.log(f / k) + 0.5 * sigma ** 2 * t) / (sigma * math.sqrt(t))
@@ -99,24 +247,24 @@ def bk_call_price(f, k, t, r, sigma):
     """Calculate the Black model price for a European call option on a futures contract."""
     d1 = bk_d1(f, k, t, sigma)
     d2 = bk_d2(f, k, t, sigma)
-    return math.exp(-r * t) * (f * norm.cdf(d1) - k * norm.cdf(d2))
+    return math.exp(-r * t) * (f * norm_cdf(d1) - k * norm_cdf(d2))
 
 
 def bk_put_price(f, k, t, r, sigma):
     """Calculate the Black model price for a European put option on a futures contract."""
     d1 = bk_d1(f, k, t, sigma)
     d2 = bk_d2(f, k, t, sigma)
-    return math.exp(-r * t) * (k * norm.cdf(-d2) - f * norm.cdf(-d1))
+    return math.exp(-r * t) * (k * norm_cdf(-d2) - f * norm_cdf(-d1))
 
 
 def bk_call_delta(f, k, t, r, sigma):
     """Calculate the delta of a call option using the Black model."""
-    return math.exp(-r * t) * norm.cdf(bk_d1(f, k, t, sigma))
+    return math.exp(-r * t) * norm_cdf(bk_d1(f, k, t, sigma))
 
 
 def bk_put_delta(f, k, t, r, sigma):
     """Calculate the delta of a put option using the Black model."""
-    return -math.exp(-r * t) * norm.cdf(-bk_d1(f, k, t, sigma))
+    return -math.exp(-r * t) * norm_cdf(-bk_d1(f, k, t, sigma))
 
 
 def bk_gamma(f, k, t, r, sigma):
@@ -158,6 +306,54 @@ def bk_put_theta(f, k, t, r, sigma):
     return term1 + term2
 
 
+def bk_greeks(f, k, t, r, sigma, is_call=True):
+    """Compute the Black model price and all greeks in one pass, sharing d1, d2 and the discount factor."""
+    sign = 1 if is_call else -1
+    sqrt_t = math.sqrt(t)
+    d1 = (math.log(f / k) + 0.5 * sigma ** 2 * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    df = math.exp(-r * t)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(sign * d1)
+    price = sign * df * (f * cdf_d1 - k * norm_cdf(sign * d2))
+    return Greeks(
+        price=price,
+        delta=sign * df * cdf_d1,
+        gamma=df * pdf_d1 / (f * sigma * sqrt_t),
+        vega=df * f * pdf_d1 * sqrt_t,
+        theta=-f * df * pdf_d1 * sigma / (2 * sqrt_t) + r * price,
+        rho=-t * price)
+
+
+def bk_full_greeks(f, k, t, r, sigma, is_call=True):
+    """Compute the Black model price and greeks up to third order in one pass from their closed forms."""
+    sign = 1 if is_call else -1
+    sqrt_t = math.sqrt(t)
+    d1 = (math.log(f / k) + 0.5 * sigma ** 2 * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    df = math.exp(-r * t)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(sign * d1)
+    price = sign * df * (f * cdf_d1 - k * norm_cdf(sign * d2))
+    delta = sign * df * cdf_d1
+    gamma = df * pdf_d1 / (f * sigma * sqrt_t)
+    vega = df * f * pdf_d1 * sqrt_t
+    return FullGreeks(
+        price=price,
+        delta=delta,
+        gamma=gamma,
+        vega=vega,
+        theta=-f * df * pdf_d1 * sigma / (2 * sqrt_t) + r * price,
+        rho=-t * price,
+        vanna=-df * pdf_d1 * d2 / sigma,
+        volga=vega * d1 * d2 / sigma,
+        charm=r * delta + df * pdf_d1 * d2 / (2 * t),
+        speed=-gamma / f * (d1 / (sigma * sqrt_t) + 1),
+        zomma=gamma * (d1 * d2 - 1) / sigma,
+        color=gamma * (r + (1 - d1 * d2) / (2 * t)),
+        ultima=-vega * (d1 * d2 * (1 - d1 * d2) + d1 * d1 + d2 * d2) / sigma ** 2)
+
+
 def implied_volatility(
     p: float,
     k: float,
@@ -168,15 +364,29 @@ def implied_volatility(
     vega_function: Callable[[float, float, float, float, float], float],
     sigma: float = 0.2,
     tol: float = 1e-5,
-    max_iterations: int = 100) -> float:
-    """Compute the implied volatility for a European call option on a futures contract using the Newton-Raphson method."""
-    for _ in range(max_iterations):
-        price = price_function(p, k, t, r, sigma)
-        diff = market_price - price
+    max_iterations: int = 100,
+    full_output: bool = False) -> Union[float, IVResult]:
+    """Compute the implied volatility for any pricing function using Newton-Raphson safeguarded by bisection.
+
+    Every evaluated sigma tightens a bracket around the root. A Newton step that leaves it, grows sigma more than
+    fourfold, or comes from a vega that is not positive is replaced by a geometric bisection of the bracket.
+    With ``full_output`` an ``IVResult`` is returned so callers can tell a converged sigma from the last iterate.
+    """
+    lower, upper = 0.0, math.inf
+    for iteration in range(1, max_iterations + 1):
+        diff = market_price - price_function(p, k, t, r, sigma)
         if abs(diff) < tol:
-            return sigma
-        sigma += diff / vega_function(p, k, t, r, sigma)
-    return sigma
+            return IVResult(sigma, iteration, True) if full_output else sigma
+        if diff > 0:
+            lower = sigma
+        else:
+            upper = sigma
+        vega = vega_function(p, k, t, r, sigma)
+        step = sigma + diff / vega if vega > 0 else math.nan
+        if not lower < step < min(upper, 4 * sigma):
+            step = math.sqrt(lower * upper) if lower > 0 and upper < math.inf else 0.5 * upper if lower == 0 else 4 * sigma
+        sigma = step
+    return IVResult(sigma, max_iterations, False) if full_output else sigma
 
 
 # Bachelier Model Functions
@@ -246,3 +456,223 @@ def bach_put_rho(f, k, t, r, sigma):
     """Calculate Rho for a put option using the Bachelier model."""
     d = bach_d(f, k, t, sigma)
     return -t * math.exp(-r * t) * ((k - f) * norm_cdf(-d) + sigma * math.sqrt(t) * norm_pdf(d))
+
+
+def bach_greeks(f, k, t, r, sigma, is_call=True):
+    """Compute the Bachelier model price and all greeks in one pass, sharing d and the discount factor."""
+    sign = 1 if is_call else -1
+    sqrt_t = math.sqrt(t)
+    d = (f - k) / (sigma * sqrt_t)
+    df = math.exp(-r * t)
+    pdf_d = norm_pdf(d)
+    cdf_d = norm_cdf(sign * d)
+    price = df * (sign * (f - k) * cdf_d + sigma * sqrt_t * pdf_d)
+    return Greeks(
+        price=price,
+        delta=sign * df * cdf_d,
+        gamma=df * pdf_d / (sigma * sqrt_t),
+        vega=df * sqrt_t * pdf_d,
+        theta=-0.5 * df * sigma * pdf_d / sqrt_t + r * price,
+        rho=sign * t * price)
+
+
+def bach_full_greeks(f, k, t, r, sigma, is_call=True):
+    """Compute the Bachelier model price and greeks up to third order in one pass from their closed forms."""
+    sign = 1 if is_call else -1
+    sqrt_t = math.sqrt(t)
+    d = (f - k) / (sigma * sqrt_t)
+    df = math.exp(-r * t)
+    pdf_d = norm_pdf(d)
+    cdf_d = norm_cdf(sign * d)
+    price = df * (sign * (f - k) * cdf_d + sigma * sqrt_t * pdf_d)
+    delta = sign * df * cdf_d
+    gamma = df * pdf_d / (sigma * sqrt_t)
+    volga = df * sqrt_t * pdf_d * d * d / sigma
+    return FullGreeks(
+        price=price,
+        delta=delta,
+        gamma=gamma,
+        vega=df * sqrt_t * pdf_d,
+        theta=-0.5 * df * sigma * pdf_d / sqrt_t + r * price,
+        rho=sign * t * price,
+        vanna=-df * pdf_d * d / sigma,
+        volga=volga,
+        charm=r * delta + df * pdf_d * d / (2 * t),
+        speed=-gamma * d / (sigma * sqrt_t),
+        zomma=gamma * (d * d - 1) / sigma,
+        color=gamma * (r + (1 - d * d) / (2 * t)),
+        ultima=volga * (d * d - 3) / sigma)
+
+
+# Implied Volatility Solvers
+def _householder(nu, h2, h3):
+    """Third-order Householder step from the Newton step nu and the second and third derivatives over the first."""
+    return nu * (1 + 0.5 * h2 * nu) / (1 + nu * (h2 + h3 * nu / 6))
+
+
+def _normalized_black(x, s):
+    """Normalised Black call price b(x, s) for log-moneyness x = ln(F/K) and total volatility s = sigma * sqrt(t)."""
+    return math.exp(0.5 * x) * norm_cdf(x / s + 0.5 * s) - math.exp(-0.5 * x) * norm_cdf(x / s - 0.5 * s)
+
+
+def _normalized_black_guess(x, beta, s_c, b_c):
+    """Starting total volatility for b(x, s) = beta, split at the inflexion point (s_c, b_c) as in Let's Be Rational."""
+    atm = 2 * norm_ppf(min(0.5 * (1 + beta * math.exp(-0.5 * x)), 1 - 2 ** -53))
+    if beta >= b_c:
+        return max(s_c, atm)
+    u = norm_cdf(x / (math.sqrt(3) * s_c)) * (beta / b_c) ** (1 / 3)
+    return min(s_c, max(x / (math.sqrt(3) * norm_ppf(u)), atm))
+
+
+def _normalized_black_iv(x, beta, s, tol, max_iterations):
+    """Solve b(x, s) = beta for an out-of-the-money quote, x < 0 and 0 < beta < exp(x / 2).
+
+    Below the inflexion point the objective is 1 / ln(b), which is close to linear in s; above it b itself.
+    Householder steps run inside a bracket that every evaluation tightens, falling back to bisection.
+    """
+    s_c = math.sqrt(-2 * x)
+    b_c = _normalized_black(x, s_c)
+    lower_region = beta < b_c
+    if s is None:
+        s = _normalized_black_guess(x, beta, s_c, b_c)
+    log_beta = math.log(beta)
+    lower, upper = 0.0, math.inf
+    for iteration in range(1, max_iterations + 1):
+        b = _normalized_black(x, s)
+        if b > beta:
+            upper = s
+        elif b < beta:
+            lower = s
+        else:
+            return s, iteration, True
+        b1 = FRAC_1_SQRT_2PI * math.exp(-0.5 * (x * x / (s * s) + 0.25 * s * s))
+        step = math.nan
+        if b1 > 0:
+            w = x * x / s ** 3 - 0.25 * s
+            b2 = b1 * w
+            b3 = b1 * (w * w - 3 * x * x / s ** 4 - 0.25)
+            if lower_region and b > 0:
+                ln_b = math.log(b)
+                l1 = b1 / b
+                l2 = b2 / b - l1 * l1
+                l3 = b3 / b - 3 * l1 * b2 / b + 2 * l1 ** 3
+                f = 1 / ln_b - 1 / log_beta
+                f1 = -l1 / ln_b ** 2
+                f2 = -l2 / ln_b ** 2 + 2 * l1 * l1 / ln_b ** 3
+                f3 = -l3 / ln_b ** 2 + 6 * l1 * l2 / ln_b ** 3 - 6 * l1 ** 3 / ln_b ** 4
+            else:
+                f, f1, f2, f3 = b - beta, b1, b2, b3
+            step = _householder(-f / f1, f2 / f1, f3 / f1)
+        if abs(step) <= tol * s:
+            return s + step, iteration, True
+        s_next = s + step
+        if not lower < s_next < upper:
+            s_next = 0.5 * (lower + upper) if upper < math.inf else 2 * s
+            if upper - lower <= tol * s_next:
+                return s_next, iteration, True
+        s = s_next
+    return s, max_iterations, False
+
+
+def _black_iv(f, k, t, r, market_price, is_call, sigma, tol, max_iterations):
+    """Implied Black volatility of a discounted option price on forward f, or NaN outside the arbitrage bounds."""
+    sign = 1 if is_call else -1
+    beta = (market_price * math.exp(r * t) - max(sign * (f - k), 0)) / math.sqrt(f * k)
+    x = -abs(math.log(f / k))
+    if not 0 < beta < math.exp(0.5 * x):
+        return IVResult(math.nan, 0, False)
+    sqrt_t = math.sqrt(t)
+    if x == 0 and beta < 1 - 2 ** -52:
+        return IVResult(2 * norm_ppf(0.5 * (1 + beta)) / sqrt_t, 0, True)
+    start = None if sigma is None else sigma * sqrt_t
+    s, iterations, converged = _normalized_black_iv(x, beta, start, tol, max_iterations)
+    return IVResult(s / sqrt_t, iterations, converged)
+
+
+def _bach_time_value_iv(nu, d, tol, max_iterations):
+    """Solve g(d) = pdf(d) / d - cdf(-d) = nu for d > 0 with Householder steps on ln(g) inside a bracket."""
+    if d is None:
+        d = FRAC_1_SQRT_2PI / (nu + 0.5)
+        if nu < 0.08:
+            d = 1.0
+            for _ in range(3):
+                d = math.sqrt(max(-2 * (math.log(nu / FRAC_1_SQRT_2PI) + 3 * math.log(d)), 1e-6))
+        elif d < 1e-8:
+            # g(d) = 1 / (sqrt(2 pi) d) - 1/2 + O(d), so the guess is already exact in double precision
+            return d, 0, True
+    log_nu = math.log(nu)
+    lower, upper = 0.0, math.inf
+    for iteration in range(1, max_iterations + 1):
+        pdf = norm_pdf(d)
+        g = pdf / d - norm_cdf(-d)
+        if g > nu:
+            lower = d
+        elif g < nu:
+            upper = d
+        else:
+            return d, iteration, True
+        step = math.nan
+        if pdf > 0:
+            g1 = -pdf / d ** 2
+            g2 = pdf * (d * d + 2) / d ** 3
+            g3 = -pdf * (1 + 3 / d ** 2 + 6 / d ** 4)
+            if g > 0:
+                l1 = g1 / g
+                f, f1, f2, f3 = math.log(g) - log_nu, l1, g2 / g - l1 * l1, g3 / g - 3 * l1 * g2 / g + 2 * l1 ** 3
+            else:
+                f, f1, f2, f3 = g - nu, g1, g2, g3
+            step = _householder(-f / f1, f2 / f1, f3 / f1)
+        if abs(step) <= tol * d:
+            return d + step, iteration, True
+        d_next = d + step
+        if not lower < d_next < upper:
+            d_next = 0.5 * (lower + upper) if upper < math.inf else 2 * d
+            if upper - lower <= tol * d_next:
+                return d_next, iteration, True
+        d = d_next
+    return d, max_iterations, False
+
+
+def _bach_iv(f, k, t, r, market_price, is_call, sigma, tol, max_iterations):
+    """Implied Bachelier volatility of a discounted option price, or NaN when it is not above intrinsic value."""
+    sign = 1 if is_call else -1
+    time_value = market_price * math.exp(r * t) - max(sign * (f - k), 0)
+    moneyness = abs(f - k)
+    sqrt_t = math.sqrt(t)
+    if not time_value > 0:
+        return IVResult(math.nan, 0, False)
+    if moneyness == 0:
+        return IVResult(time_value / (FRAC_1_SQRT_2PI * sqrt_t), 0, True)
+    start = None if sigma is None else moneyness / (sigma * sqrt_t)
+    d, iterations, converged = _bach_time_value_iv(time_value / moneyness, start, tol, max_iterations)
+    return IVResult(moneyness / (d * sqrt_t), iterations, converged)
+
+
+def bs_call_iv(s, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for the Black-Scholes volatility of a call; ``tol`` is relative to sigma and ``sigma`` is an optional warm start."""
+    return _black_iv(s * math.exp(r * t), k, t, r, market_price, True, sigma, tol, max_iterations)
+
+
+def bs_put_iv(s, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for the Black-Scholes volatility of a put; ``tol`` is relative to sigma and ``sigma`` is an optional warm start."""
+    return _black_iv(s * math.exp(r * t), k, t, r, market_price, False, sigma, tol, max_iterations)
+
+
+def bk_call_iv(f, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for the Black model volatility of a call; ``tol`` is relative to sigma and ``sigma`` is an optional warm start."""
+    return _black_iv(f, k, t, r, market_price, True, sigma, tol, max_iterations)
+
+
+def bk_put_iv(f, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for the Black model volatility of a put; ``tol`` is relative to sigma and ``sigma`` is an optional warm start."""
+    return _black_iv(f, k, t, r, market_price, False, sigma, tol, max_iterations)
+
+
+def bach_call_iv(f, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for the Bachelier volatility of a call; ``tol`` is relative to sigma and ``sigma`` is an optional warm start."""
+    return _bach_iv(f, k, t, r, market_price, True, sigma, tol, max_iterations)
+
+
+def bach_put_iv(f, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for the Bachelier volatility of a put; ``tol`` is relative to sigma and ``sigma`` is an optional warm start."""
+    return _bach_iv(f, k, t, r, market_price, False, sigma, tol, max_iterations)
@@ -0,0 +1,108 @@
+"""Position-weighted greeks for a columnar portfolio.
+
+``positions`` is a pandas DataFrame, or anything with a ``to_pandas`` method
+such as a pyarrow Table, with one row per position and the columns:
+
+    model       'bs', 'bk' or 'bach'
+    is_call     booleans, or strings starting with 'C'/'P' (case-insensitive)
+    underlying  key used to look up spot/forward and rate
+    strike      strike price
+    expiry      year fraction, or datetimes together with ``as_of``
+    quantity    signed number of contracts
+    sigma       volatility in the model's units
+
+and optionally ``multiplier`` (contract size), ``spot`` and ``rate``. Rows are
+split by model and every group is priced with one call to the matching
+``optrush.vectorized`` greeks kernel, so no Python object is created per row.
+"""
+import numpy as np
+import pandas as pd
+
+from . import vectorized
+from .chain import MODELS
+
+
+GREEKS = ('value', 'delta', 'gamma', 'vega', 'theta', 'rho')
+EXPIRY_BUCKETS = ((1 / 12, '1M'), (0.25, '3M'), (0.5, '6M'), (1.0, '1Y'), (2.0, '2Y'), (5.0, '5Y'), (np.inf, '5Y+'))
+
+
+def _frame(positions):
+    """The positions as a DataFrame, converting Arrow tables and similar columnar containers."""
+    return positions.to_pandas() if hasattr(positions, 'to_pandas') else positions
+
+
+def _years(expiry, as_of):
+    """Time to expiry in years from a year-fraction column, or a datetime column measured from ``as_of``."""
+    if pd.api.types.is_datetime64_any_dtype(expiry):
+        if as_of is None:
+            raise ValueError('as_of is required when expiry holds dates')
+        return ((expiry - pd.Timestamp(as_of)) / pd.Timedelta(days=365)).to_numpy(dtype=float)
+    return expiry.to_numpy(dtype=float)
+
+
+def _is_call(flags):
+    """Boolean call flags from a boolean column or a column of 'C'/'P'/'call'/'put' strings."""
+    if pd.api.types.is_bool_dtype(flags):
+        return flags.to_numpy(dtype=bool)
+    return flags.astype(str).str[:1].str.upper().eq('C').to_numpy()
+
+
+def _per_position(frame, name, values, default=None):
+    """A per-position array from a scalar, a mapping keyed by underlying, or the column ``name``."""
+    if values is None:
+        if name in frame:
+            return frame[name].to_numpy(dtype=float)
+        if default is None:
+            raise ValueError(f'positions need a {name!r} column when {name} is not given')
+        values = default
+    if isinstance(values, (dict, pd.Series)):
+        looked_up = frame['underlying'].map(values).to_numpy(dtype=float)
+        missing = np.isnan(looked_up)
+        if missing.any():
+            raise KeyError(f'no {name} for underlyings {sorted(frame["underlying"][missing].unique())}')
+        return looked_up
+    return np.broadcast_to(np.asarray(values, dtype=float), (len(frame),))
+
+
+def position_greeks(positions, spot=None, rate=None, as_of=None):
+    """Value and greeks of every position, weighted by quantity and multiplier, as a DataFrame aligned with ``positions``.
+
+    ``spot`` and ``rate`` are scalars or mappings from underlying to value; when omitted the
+    ``spot`` column is required and the ``rate`` column or zero is used.
+    """
+    frame = _frame(positions)
+    s = _per_position(frame, 'spot', spot)
+    r = _per_position(frame, 'rate', rate, default=0.0)
+    k = frame['strike'].to_numpy(dtype=float)
+    t = _years(frame['expiry'], as_of)
+    sigma = frame['sigma'].to_numpy(dtype=float)
+    is_call = _is_call(frame['is_call'])
+    unknown = ~frame['model'].isin(MODELS)
+    if unknown.any():
+        # Checked up front: groupby drops missing models, whose rows would otherwise stay unset
+        raise ValueError(f'unknown model {frame["model"][unknown].iloc[0]!r}, expected one of {MODELS}')
+    out = np.empty((len(frame), len(GREEKS)))
+    for model, index in frame.groupby('model', sort=False).indices.items():
+        greeks = getattr(vectorized, f'{model}_greeks')(s[index], k[index], t[index], r[index], sigma[index],
+                                                         is_call=is_call[index])
+        for column, name in enumerate(greeks.dtype.names):
+            out[index, column] = greeks[name]
+    weight = frame['quantity'].to_numpy(dtype=float)
+    if 'multiplier' in frame:
+        weight = weight * frame['multiplier'].to_numpy(dtype=float)
+    out *= weight[:, None]
+    return pd.DataFrame(out, index=frame.index, columns=list(GREEKS))
+
+
+def aggregate_greeks(positions, spot=None, rate=None, as_of=None, buckets=EXPIRY_BUCKETS):
+    """Position-weighted value and greeks summed by underlying and expiry bucket.
+
+    ``buckets`` is a sequence of (upper bound in years, label) pairs in increasing order; a
+    position falls in the first bucket whose bound is at least its time to expiry.
+    """
+    frame = _frame(positions)
+    greeks = position_greeks(frame, spot, rate, as_of)
+    bucket = pd.cut(_years(frame['expiry'], as_of), bins=[-np.inf] + [edge for edge, _ in buckets],
+                    labels=[label for _, label in buckets])
+    keys = [frame['underlying'], pd.Series(bucket, index=frame.index, name='expiry_bucket')]
+    return greeks.groupby(keys, observed=True).sum()
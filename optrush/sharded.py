@@ -0,0 +1,159 @@
+"""Greeks of large batches on a process pool sharing its columns through shared memory.
+
+A ``ShardedPricer`` owns one ``multiprocessing.shared_memory`` block holding
+the input columns (spot, strike, expiry, rate, sigma, is_call) and the output
+greeks of ``size`` contracts. Every worker maps the block once, when the pool
+starts. After that, a task is just ``(model, backend, start, stop)``: the
+worker prices rows ``start:stop`` in place, and nothing but those few integers
+and strings is pickled. Callers can write inputs straight into ``columns``, and
+``greeks`` returns a view of the shared output, so no column is copied either
+way.
+
+Backends run inside the workers:
+
+    python      a loop over ``optrush.models`` (pure Python, GIL-bound)
+    numpy       ``optrush.vectorized``
+    rust        a loop over the scalar functions of the extension
+    rust-batch  the extension's ``*_greeks_batch`` kernels on each shard
+
+Each worker is a separate process, so even the Python backend scales with the
+number of cores.
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import models, vectorized
+from .chain import MODELS
+from .vectorized import GREEKS_DTYPE
+try:
+    from . import optrush
+except ImportError:
+    optrush = None
+
+
+BACKENDS = ('python', 'numpy', 'rust', 'rust-batch')
+INPUTS = (('s', np.float64), ('k', np.float64), ('t', np.float64), ('r', np.float64), ('sigma', np.float64),
+          ('is_call', np.bool_))
+
+
+def _layout(size):
+    """Byte offsets of every input column and of the output in a block for ``size`` contracts, and its total size."""
+    offsets, position = {}, 0
+    for name, dtype in INPUTS:
+        offsets[name] = position
+        position += -(-size * np.dtype(dtype).itemsize // 8) * 8
+    offsets['out'] = position
+    return offsets, position + size * GREEKS_DTYPE.itemsize
+
+
+def _views(buffer, size):
+    """Input columns and output greeks of ``size`` contracts as arrays over ``buffer``.
+
+    ``np.frombuffer`` holds the buffer exported while an array is alive, so the block cannot be
+    unmapped from under a view.
+    """
+    offsets, _ = _layout(size)
+    columns = {name: np.frombuffer(buffer, dtype, size, offsets[name]) for name, dtype in INPUTS}
+    out = np.frombuffer(buffer, GREEKS_DTYPE, size, offsets['out']).view(np.recarray)
+    return columns, out
+
+
+_worker = {}
+_mapped = []
+
+
+def _attach(name, size):
+    """Pool initializer: map the shared block once per worker process."""
+    block = shared_memory.SharedMemory(name)
+    _worker['block'] = block
+    _worker['columns'], _worker['out'] = _views(block.buf, size)
+
+
+def _price_shard(model, backend, start, stop):
+    """Write the greeks of rows ``start:stop`` into the shared output."""
+    columns, out = _worker['columns'], _worker['out']
+    s, k, t, r, sigma, is_call = (columns[name][start:stop] for name, _ in INPUTS)
+    if backend == 'numpy':
+        out[start:stop] = getattr(vectorized, f'{model}_greeks')(s, k, t, r, sigma, is_call=is_call)
+    elif backend == 'rust-batch':
+        table = out[start:stop].view(np.float64).reshape(stop - start, len(GREEKS_DTYPE))
+        getattr(optrush, f'{model}_greeks_batch')(s, k, t, r, sigma, is_call, table, 1)
+    else:
+        greeks = getattr(models if backend == 'python' else optrush, f'{model}_greeks')
+        rows = zip(s.tolist(), k.tolist(), t.tolist(), r.tolist(), sigma.tolist(), is_call.tolist())
+        out[start:stop] = [greeks(*row) for row in rows]
+
+
+class ShardedPricer:
+    """Process pool pricing up to ``size`` contracts at a time out of one shared-memory block.
+
+    ``workers`` defaults to the number of CPUs. Each call is split into about four shards per worker,
+    or shards of ``shard_size`` rows when given. Use as a context manager, or call ``close`` to stop the
+    pool and release the block. Arrays returned by ``greeks`` that outlive the pricer keep the block
+    mapped until the process exits, so copy the results worth keeping and drop the views.
+    """
+
+    def __init__(self, size, workers=None, shard_size=None):
+        self.size = size
+        self.workers = workers or os.cpu_count()
+        self.shard_size = shard_size
+        self._block = shared_memory.SharedMemory(create=True, size=max(1, _layout(size)[1]))
+        self.columns, self._out = _views(self._block.buf, size)
+        self.columns['is_call'][:] = True
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_attach, initargs=(self._block.name, size))
+
+    def greeks(self, model, s=None, k=None, t=None, r=None, sigma=None, is_call=None, backend='numpy'):
+        """Price, delta, gamma, vega, theta and rho as a ``GREEKS_DTYPE`` view of the shared output.
+
+        Inputs are broadcast against each other and copied into ``columns`` unless they already are
+        those arrays; an input left as None keeps what ``columns`` holds (``is_call`` starts out True).
+        The view is overwritten by the next call.
+        """
+        if model not in MODELS:
+            raise ValueError(f'unknown model {model!r}, expected one of {MODELS}')
+        if backend not in BACKENDS:
+            raise ValueError(f'unknown backend {backend!r}, expected one of {BACKENDS}')
+        if backend.startswith('rust') and optrush is None:
+            raise ImportError(f'the {backend!r} backend needs the Rust extension; run `make develop`')
+        given = {name: value for name, value in zip(self.columns, (s, k, t, r, sigma, is_call)) if value is not None}
+        arrays = np.broadcast_arrays(*map(np.asarray, given.values()))
+        n = arrays[0].size if arrays and arrays[0].ndim else self.size
+        if n > self.size:
+            raise ValueError(f'{n} contracts do not fit a pricer of size {self.size}')
+        for (name, value), array in zip(given.items(), arrays):
+            if value is not self.columns[name]:
+                self.columns[name][:n] = np.ravel(array)
+        shard = self.shard_size or max(1, math.ceil(n / (4 * self.workers)))
+        tasks = [self._pool.submit(_price_shard, model, backend, start, min(start + shard, n))
+                 for start in range(0, n, shard)]
+        for task in tasks:
+            task.result()
+        return self._out[:n]
+
+    def close(self):
+        """Shut the pool down and free the shared block."""
+        self._pool.shutdown()
+        self.columns = self._out = None
+        self._block.unlink()
+        try:
+            self._block.close()
+        except BufferError:
+            # arrays returned by ``greeks`` are still alive; keep the mapping for the life of the process
+            _mapped.append(self._block)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def sharded_greeks(model, s, k, t, r, sigma, is_call=True, backend='numpy', workers=None, shard_size=None):
+    """One-off ``ShardedPricer`` call returning a private copy of the greeks record array."""
+    size = np.broadcast(*map(np.asarray, (s, k, t, r, sigma, is_call))).size
+    with ShardedPricer(size, workers, shard_size) as pricer:
+        return pricer.greeks(model, s, k, t, r, sigma, is_call, backend).copy()
@@ -0,0 +1,193 @@
+"""Tick-driven repricing of a fixed set of contracts in micro-batches.
+
+A ``StreamPricer`` knows the static terms of every contract (strike, expiry,
+rate, call/put) and turns a stream of ``(contract_id, spot, price)`` updates
+into batches. A batch is closed when it reaches ``max_batch`` updates or when
+its oldest update has waited ``max_delay`` seconds. Within a batch only the
+latest update per contract is priced. Quotes with a market price are inverted
+with the vectorized implied-vol solver, warm-started from the contract's
+previous sigma, and the greeks of every updated contract are computed at the
+latest sigma. Each batch is emitted as a ``StreamBatch``.
+
+``stream`` consumes any iterable and yields batches; ``run`` consumes an
+``asyncio.Queue`` bounded by ``max_pending``, so producers awaiting ``submit``
+are held back when pricing falls behind. ``submit`` raises ``KeyError`` for an
+unknown contract. A batch that fails to price or emit is reported to
+``on_error``, or logged, and counted in ``failures``; ``run`` keeps draining the
+queue either way. Arrival-to-emit latency of every update is recorded in
+``stats``.
+"""
+import asyncio
+import logging
+import time
+from typing import Hashable, NamedTuple, Optional
+
+import numpy as np
+
+from . import vectorized
+from .chain import MODELS
+
+
+class Update(NamedTuple):
+    """One tick: a new spot/forward and, optionally, a market price for the contract."""
+    contract_id: Hashable
+    spot: float
+    price: Optional[float] = None
+
+
+class StreamBatch(NamedTuple):
+    """Result of one micro-batch; arrays are aligned with ``contract_id``."""
+    contract_id: list
+    spot: np.ndarray
+    sigma: np.ndarray
+    converged: np.ndarray
+    greeks: np.recarray
+    updates: int
+    latency: np.ndarray
+
+
+class LatencyStats:
+    """Arrival-to-emit latencies of the most recent ``capacity`` updates, in seconds."""
+
+    def __init__(self, capacity=100_000):
+        self._samples = np.empty(capacity)
+        self.count = 0
+        self.batches = 0
+
+    def record(self, latencies):
+        """Add the latencies of one batch, overwriting the oldest samples once full."""
+        latencies = np.asarray(latencies, dtype=float)
+        kept = latencies[-len(self._samples):]
+        slots = (self.count + len(latencies) - len(kept) + np.arange(len(kept))) % len(self._samples)
+        self._samples[slots] = kept
+        self.count += len(latencies)
+        self.batches += 1
+
+    def percentiles(self, q=(50, 90, 99, 99.9)):
+        """Latency percentiles over the retained samples as a ``{q: seconds}`` dict."""
+        samples = self._samples[:min(self.count, len(self._samples))]
+        if not samples.size:
+            return {p: np.nan for p in q}
+        return dict(zip(q, np.percentile(samples, q)))
+
+    def reset(self):
+        """Forget every recorded sample."""
+        self.count = 0
+        self.batches = 0
+
+
+class StreamPricer:
+    """Micro-batching pricer for a fixed set of contracts on one model.
+
+    ``sigma`` seeds the volatility used for updates without a price and the warm start of the
+    first implied-vol solve; contracts without one stay NaN until a price arrives.
+    """
+
+    def __init__(self, model, contract_ids, k, t, r, is_call=True, sigma=np.nan, max_batch=1024,
+                 max_delay=1e-3, max_pending=65536, stats=None):
+        if model not in MODELS:
+            raise ValueError(f'unknown model {model!r}, expected one of {MODELS}')
+        self.model = model
+        self.index = {contract_id: i for i, contract_id in enumerate(contract_ids)}
+        k, t, r, is_call, sigma = (np.ravel(a) for a in np.broadcast_arrays(*map(np.asarray, (k, t, r, is_call, sigma))))
+        if len(k) != len(self.index):
+            raise ValueError(f'{len(self.index)} contract ids but {len(k)} contract terms')
+        self.k, self.t, self.r = k.astype(float), t.astype(float), r.astype(float)
+        self.is_call = is_call.astype(bool)
+        self.sigma = sigma.astype(float).copy()
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.stats = stats or LatencyStats()
+        self.failures = 0
+        self._queue = None
+
+    def process(self, updates, arrivals=None):
+        """Price one batch of updates immediately; ``arrivals`` are their ``time.perf_counter`` timestamps."""
+        latest = {}
+        for update in updates:
+            latest[update[0]] = update
+        ids = list(latest)
+        index = np.fromiter((self.index[i] for i in ids), dtype=np.intp, count=len(ids))
+        spot = np.fromiter((u[1] for u in latest.values()), dtype=float, count=len(ids))
+        price = np.fromiter((np.nan if len(u) < 3 or u[2] is None else u[2] for u in latest.values()), dtype=float, count=len(ids))
+        k, t, r, is_call = self.k[index], self.t[index], self.r[index], self.is_call[index]
+        sigma = self.sigma[index]
+        converged = np.zeros(len(ids), dtype=bool)
+        quoted = np.flatnonzero(~np.isnan(price))
+        if quoted.size:
+            iv = getattr(vectorized, f'{self.model}_iv')(spot[quoted], k[quoted], t[quoted], r[quoted], price[quoted],
+                                                         is_call=is_call[quoted], sigma=sigma[quoted])
+            converged[quoted] = iv.converged
+            sigma[quoted[iv.converged]] = iv.sigma[iv.converged]
+            self.sigma[index[quoted[iv.converged]]] = iv.sigma[iv.converged]
+        greeks = getattr(vectorized, f'{self.model}_greeks')(spot, k, t, r, sigma, is_call=is_call)
+        emitted = time.perf_counter()
+        latency = emitted - np.asarray(arrivals if arrivals is not None else [emitted] * len(updates), dtype=float)
+        self.stats.record(latency)
+        return StreamBatch(ids, spot, sigma, converged, greeks, len(updates), latency)
+
+    def stream(self, updates):
+        """Yield a ``StreamBatch`` whenever ``max_batch`` updates are pending or the oldest has waited ``max_delay``.
+
+        The deadline is only checked when the next update arrives, or when ``updates`` is exhausted.
+        """
+        pending, arrivals = [], []
+        for update in updates:
+            arrivals.append(time.perf_counter())
+            pending.append(update)
+            if len(pending) >= self.max_batch or arrivals[-1] - arrivals[0] >= self.max_delay:
+                yield self.process(pending, arrivals)
+                pending, arrivals = [], []
+        if pending:
+            yield self.process(pending, arrivals)
+
+    @property
+    def queue(self):
+        """The bounded queue feeding ``run``, created inside the running event loop on first use."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_pending)
+        return self._queue
+
+    async def submit(self, contract_id, spot, price=None):
+        """Enqueue an update, waiting while ``max_pending`` updates are already queued."""
+        if contract_id not in self.index:
+            raise KeyError(contract_id)
+        await self.queue.put((Update(contract_id, spot, price), time.perf_counter()))
+
+    async def run(self, emit, on_error=None):
+        """Consume the queue until cancelled, calling ``emit(batch)`` (sync or async) for every micro-batch.
+
+        An exception raised while pricing or emitting a batch is passed to ``on_error(exception, updates)``
+        (sync or async), or logged when there is none, and the loop goes on with the next batch.
+        """
+        queue = self.queue
+        while True:
+            update, arrival = await queue.get()
+            pending, arrivals = [update], [arrival]
+            deadline = arrival + self.max_delay
+            while len(pending) < self.max_batch:
+                try:
+                    if queue.empty():
+                        timeout = deadline - time.perf_counter()
+                        if timeout <= 0:
+                            break
+                        update, arrival = await asyncio.wait_for(queue.get(), timeout)
+                    else:
+                        update, arrival = queue.get_nowait()
+                except asyncio.TimeoutError:
+                    break
+                pending.append(update)
+                arrivals.append(arrival)
+            try:
+                result = emit(self.process(pending, arrivals))
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as exception:
+                self.failures += 1
+                if on_error is None:
+                    logging.getLogger(__name__).exception('failed to price a batch of %d updates', len(pending))
+                    continue
+                result = on_error(exception, pending)
+                if asyncio.iscoroutine(result):
+                    await result
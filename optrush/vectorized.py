@@ -0,0 +1,800 @@
+"""Array versions of the pricers, greeks and implied-volatility solvers in ``optrush.models``.
+
+Every function takes the same arguments as its scalar counterpart, but each
+argument may be a NumPy array (or anything ``np.asarray`` accepts). Inputs are
+broadcast against each other and the result is an array of the broadcast shape.
+The implied-volatility solvers return a record array with the sigma, iteration
+count and convergence flag of every quote.
+
+The normal CDF and its inverse come from ``scipy.special``, imported on first
+use so that importing this module only costs NumPy. Without scipy, or with
+the environment variable ``OPTRUSH_SCIPY=0``, NumPy implementations of the
+same functions are used instead.
+"""
+import functools
+import os
+
+import numpy as np
+
+from .models import NORM_PPF_CENTRAL, NORM_PPF_LOWER, NORM_PPF_TAIL, FullGreeks, _horner
+
+
+def _broadcast(func):
+    """Convert every positional argument to an array before calling ``func``."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return func(*map(np.asarray, args), **kwargs)
+    return wrapper
+
+
+GREEKS_DTYPE = np.dtype([(name, np.float64) for name in ('price', 'delta', 'gamma', 'vega', 'theta', 'rho')])
+
+
+def _greeks(price, delta, gamma, vega, theta, rho):
+    """Pack the greek arrays into a record array with ``GREEKS_DTYPE`` fields."""
+    return _records(GREEKS_DTYPE, (price, delta, gamma, vega, theta, rho))
+
+
+FULL_GREEKS_DTYPE = np.dtype([(name, np.float64) for name in FullGreeks._fields])
+
+
+def _full_greeks(*fields):
+    """Pack the greek arrays, in ``models.FullGreeks`` order, into a record array with ``FULL_GREEKS_DTYPE`` fields."""
+    return _records(FULL_GREEKS_DTYPE, fields)
+
+
+def _records(dtype, fields):
+    fields = np.broadcast_arrays(*fields)
+    out = np.empty(fields[0].shape, dtype=dtype).view(np.recarray)
+    for name, values in zip(dtype.names, fields):
+        out[name] = values
+    return out
+
+
+FRAC_1_SQRT_2 = 1 / np.sqrt(2)
+FRAC_1_SQRT_2PI = 1 / np.sqrt(2 * np.pi)
+
+# W. J. Cody's rational approximations (Math. Comp. 23, 1969) of erf on |y| <= 0.5, and of erfc on
+# 0.5 < y <= 4 and y > 4, as numerator and denominator coefficients, highest degree first
+_ERF_SMALL = ((1.85777706184603153e-1, 3.16112374387056560e+0, 1.13864154151050156e+2, 3.77485237685302021e+2,
+               3.20937758913846947e+3),
+              (1.0, 2.36012909523441209e+1, 2.44024637934444173e+2, 1.28261652607737228e+3, 2.84423683343917062e+3))
+_ERFC_MEDIUM = ((2.15311535474403846e-8, 5.64188496988670089e-1, 8.88314979438837594e+0, 6.61191906371416295e+1,
+                 2.98635138197400131e+2, 8.81952221241769090e+2, 1.71204761263407058e+3, 2.05107837782607147e+3,
+                 1.23033935479799725e+3),
+                (1.0, 1.57449261107098347e+1, 1.17693950891312499e+2, 5.37181101862009858e+2, 1.62138957456669019e+3,
+                 3.29079923573345963e+3, 4.36261909014324716e+3, 3.43936767414372164e+3, 1.23033935480374942e+3))
+_ERFC_LARGE = ((1.63153871373020978e-2, 3.05326634961232344e-1, 3.60344899949804439e-1, 1.25781726111229246e-1,
+                1.60837851487422766e-2, 6.58749161529837803e-4),
+               (1.0, 2.56852019228982242e+0, 1.87295284992346725e+0, 5.27905102951428412e-1, 6.05183413124413191e-2,
+                2.33520497626869185e-3))
+
+
+def _erf_parts(y):
+    """erf(y) where |y| <= 0.5 and erfc(|y|) elsewhere, from Cody's approximations."""
+    y = np.asarray(y, dtype=float)
+    a = np.abs(y)
+    with np.errstate(all='ignore'):
+        small = y * _horner(_ERF_SMALL[0], y * y) / _horner(_ERF_SMALL[1], y * y)
+        medium = _horner(_ERFC_MEDIUM[0], a) / _horner(_ERFC_MEDIUM[1], a)
+        z = 1 / (a * a)
+        large = (1 / np.sqrt(np.pi) - z * _horner(_ERFC_LARGE[0], z) / _horner(_ERFC_LARGE[1], z)) / a
+        # exp(-a^2) split as exp(-b^2) * exp(-(a - b)(a + b)) with b = a rounded down to 1/16 keeps it exact
+        b = np.floor(16 * a) / 16
+        tail = np.exp(-b * b) * np.exp(-(a - b) * (a + b)) * np.where(a <= 4, medium, large)
+    return np.where(a <= 0.5, small, np.where(a >= 27, 0.0, tail))
+
+
+def _numpy_ndtr(x):
+    """Normal CDF from Cody's erf/erfc; relative error is close to that of ``scipy.special.ndtr``."""
+    y = np.asarray(x, dtype=float) * FRAC_1_SQRT_2
+    parts = _erf_parts(y)
+    return np.where(np.abs(y) <= 0.5, 0.5 + 0.5 * parts, np.where(y < 0, 0.5 * parts, 1 - 0.5 * parts))
+
+
+def _numpy_ndtri(p):
+    """Inverse normal CDF, the array form of ``models.norm_ppf``."""
+    p = np.asarray(p, dtype=float)
+    q = np.minimum(p, 1 - p)
+    with np.errstate(all='ignore'):
+        r = np.sqrt(-2 * np.log(q))
+        lower = _horner(NORM_PPF_LOWER[0], r) / _horner(NORM_PPF_LOWER[1], r)
+        c = q - 0.5
+        central = c * _horner(NORM_PPF_CENTRAL[0], c * c) / _horner(NORM_PPF_CENTRAL[1], c * c)
+        tail = q < NORM_PPF_TAIL
+        x = np.where(tail, lower, central)
+        y = x * FRAC_1_SQRT_2
+        parts = _erf_parts(y)
+        # x <= 0 here, so cdf(x) = erfc(-y) / 2 in the tail, and cdf(x) - 1/2 = erf(y) / 2 around the median
+        half_erf = np.where(np.abs(y) <= 0.5, 0.5 * parts, 0.5 * parts - 0.5)
+        residual = np.where(tail, 0.5 * parts - q, half_erf - c)
+        u = residual / norm_pdf(x)
+        x = x - u / (1 + 0.5 * x * u)
+    x = np.where(p <= 0.5, x, -x)
+    return np.where(p == 0, -np.inf, np.where(p == 1, np.inf, np.where((0 < p) & (p < 1), x, np.nan)))
+
+
+@functools.lru_cache(maxsize=None)
+def special_functions():
+    """``(ndtr, ndtri)`` from ``scipy.special``, or the NumPy fallbacks when scipy is missing or ``OPTRUSH_SCIPY=0``."""
+    if os.environ.get('OPTRUSH_SCIPY', '1') != '0':
+        try:
+            from scipy.special import ndtr, ndtri
+            return ndtr, ndtri
+        except ImportError:
+            pass
+    return _numpy_ndtr, _numpy_ndtri
+
+
+def ndtr(x):
+    """Normal CDF ufunc from ``special_functions``."""
+    return special_functions()[0](x)
+
+
+def ndtri(p):
+    """Inverse normal CDF ufunc from ``special_functions``."""
+    return special_functions()[1](p)
+
+
+def norm_cdf(x):
+    """Compute the cumulative distribution function of the standard normal distribution.
+
+    ``scipy.special.ndtr`` is the erfc-based ufunc behind ``scipy.stats.norm.cdf``
+    without the distribution object's argument handling; relative error is below
+    3e-13 for x >= -37.
+    """
+    return ndtr(x)
+
+
+def norm_pdf(x):
+    """Compute the probability density function of the standard normal distribution."""
+    return FRAC_1_SQRT_2PI * np.exp(-0.5 * np.square(x))
+
+
+@_broadcast
+def bs_d1(s, k, t, r, sigma):
+    """Calculate d1 used in various greeks."""
+    return (np.log(s / k) + (r + 0.5 * sigma ** 2) * t) / (sigma * np.sqrt(t))
+
+
+@_broadcast
+def bs_d2(s, k, t, r, sigma):
+    """Calculate d2 used in various greeks."""
+    return bs_d1(s, k, t, r, sigma) - sigma * np.sqrt(t)
+
+
+@_broadcast
+def bs_call_price(s, k, t, r, sigma):
+    """Compute the Black-Scholes price for European call options on a stock."""
+    d1 = bs_d1(s, k, t, r, sigma)
+    d2 = bs_d2(s, k, t, r, sigma)
+    return s * norm_cdf(d1) - k * np.exp(-r * t) * norm_cdf(d2)
+
+
+@_broadcast
+def bs_put_price(s, k, t, r, sigma):
+    """Compute the Black-Scholes price for European put options on a stock."""
+    d1 = bs_d1(s, k, t, r, sigma)
+    d2 = bs_d2(s, k, t, r, sigma)
+    return k * np.exp(-r * t) * norm_cdf(-d2) - s * norm_cdf(-d1)
+
+
+@_broadcast
+def bs_call_delta(s, k, t, r, sigma):
+    """Calculate Delta for call options."""
+    return norm_cdf(bs_d1(s, k, t, r, sigma))
+
+
+@_broadcast
+def bs_put_delta(s, k, t, r, sigma):
+    """Calculate Delta for put options."""
+    return norm_cdf(bs_d1(s, k, t, r, sigma)) - 1
+
+
+@_broadcast
+def bs_gamma(s, k, t, r, sigma):
+    """Calculate Gamma for both call and put options."""
+    return norm_pdf(bs_d1(s, k, t, r, sigma)) / (s * sigma * np.sqrt(t))
+
+
+@_broadcast
+def bs_vega(s, k, t, r, sigma):
+    """Calculate Vega for both call and put options."""
+    return s * norm_pdf(bs_d1(s, k, t, r, sigma)) * np.sqrt(t)
+
+
+@_broadcast
+def bs_call_theta(s, k, t, r, sigma):
+    """Calculate Theta for call options."""
+    d1 = bs_d1(s, k, t, r, sigma)
+    d2 = bs_d2(s, k, t, r, sigma)
+    term1 = -s * norm_pdf(d1) * sigma / (2 * np.sqrt(t))
+    term2 = r * k * np.exp(-r * t) * norm_cdf(d2)
+    return term1 - term2
+
+
+@_broadcast
+def bs_put_theta(s, k, t, r, sigma):
+    """Calculate Theta for put options."""
+    d1 = bs_d1(s, k, t, r, sigma)
+    d2 = bs_d2(s, k, t, r, sigma)
+    term1 = -s * norm_pdf(d1) * sigma / (2 * np.sqrt(t))
+    term2 = r * k * np.exp(-r * t) * norm_cdf(-d2)
+    return term1 + term2
+
+
+@_broadcast
+def bs_call_rho(s, k, t, r, sigma):
+    """Calculate Rho for call options."""
+    return k * t * np.exp(-r * t) * norm_cdf(bs_d2(s, k, t, r, sigma))
+
+
+@_broadcast
+def bs_put_rho(s, k, t, r, sigma):
+    """Calculate Rho for put options."""
+    return -k * t * np.exp(-r * t) * norm_cdf(-bs_d2(s, k, t, r, sigma))
+
+
+@_broadcast
+def bs_greeks(s, k, t, r, sigma, is_call=True):
+    """Compute the Black-Scholes price and all greeks in one pass; ``is_call`` may be a boolean array."""
+    sign = np.where(is_call, 1.0, -1.0)
+    sqrt_t = np.sqrt(t)
+    d1 = (np.log(s / k) + (r + 0.5 * sigma ** 2) * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    df = np.exp(-r * t)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(sign * d1)
+    cdf_d2 = norm_cdf(sign * d2)
+    return _greeks(
+        price=sign * (s * cdf_d1 - k * df * cdf_d2),
+        delta=sign * cdf_d1,
+        gamma=pdf_d1 / (s * sigma * sqrt_t),
+        vega=s * pdf_d1 * sqrt_t,
+        theta=-s * pdf_d1 * sigma / (2 * sqrt_t) - sign * r * k * df * cdf_d2,
+        rho=sign * k * t * df * cdf_d2)
+
+
+@_broadcast
+def bs_full_greeks(s, k, t, r, sigma, is_call=True):
+    """Compute the Black-Scholes price and greeks up to third order in one pass; see ``models.FullGreeks``."""
+    sign = np.where(is_call, 1.0, -1.0)
+    sqrt_t = np.sqrt(t)
+    d1 = (np.log(s / k) + (r + 0.5 * sigma ** 2) * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    df = np.exp(-r * t)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(sign * d1)
+    cdf_d2 = norm_cdf(sign * d2)
+    gamma = pdf_d1 / (s * sigma * sqrt_t)
+    vega = s * pdf_d1 * sqrt_t
+    d1_t = (r / sigma + 0.5 * sigma) / sqrt_t - d1 / (2 * t)
+    return _full_greeks(
+        sign * (s * cdf_d1 - k * df * cdf_d2),
+        sign * cdf_d1,
+        gamma,
+        vega,
+        -s * pdf_d1 * sigma / (2 * sqrt_t) - sign * r * k * df * cdf_d2,
+        sign * k * t * df * cdf_d2,
+        -pdf_d1 * d2 / sigma,
+        vega * d1 * d2 / sigma,
+        -pdf_d1 * d1_t,
+        -gamma / s * (d1 / (sigma * sqrt_t) + 1),
+        gamma * (d1 * d2 - 1) / sigma,
+        gamma * (d1 * d1_t + 0.5 / t),
+        -vega * (d1 * d2 * (1 - d1 * d2) + d1 * d1 + d2 * d2) / sigma ** 2)
+
+
+@_broadcast
+def bk_d1(f, k, t, sigma):
+    """Calculate d1 for the Black model."""
+    return (np.log(f / k) + 0.5 * sigma ** 2 * t) / (sigma * np.sqrt(t))
+
+
+@_broadcast
+def bk_d2(f, k, t, sigma):
+    """Calculate d2 for the Black model."""
+    return bk_d1(f, k, t, sigma) - sigma * np.sqrt(t)
+
+
+@_broadcast
+def bk_call_price(f, k, t, r, sigma):
+    """Calculate the Black model price for European call options on futures contracts."""
+    d1 = bk_d1(f, k, t, sigma)
+    d2 = bk_d2(f, k, t, sigma)
+    return np.exp(-r * t) * (f * norm_cdf(d1) - k * norm_cdf(d2))
+
+
+@_broadcast
+def bk_put_price(f, k, t, r, sigma):
+    """Calculate the Black model price for European put options on futures contracts."""
+    d1 = bk_d1(f, k, t, sigma)
+    d2 = bk_d2(f, k, t, sigma)
+    return np.exp(-r * t) * (k * norm_cdf(-d2) - f * norm_cdf(-d1))
+
+
+@_broadcast
+def bk_call_delta(f, k, t, r, sigma):
+    """Calculate the delta of call options using the Black model."""
+    return np.exp(-r * t) * norm_cdf(bk_d1(f, k, t, sigma))
+
+
+@_broadcast
+def bk_put_delta(f, k, t, r, sigma):
+    """Calculate the delta of put options using the Black model."""
+    return -np.exp(-r * t) * norm_cdf(-bk_d1(f, k, t, sigma))
+
+
+@_broadcast
+def bk_gamma(f, k, t, r, sigma):
+    """Calculate Gamma for both call and put options."""
+    d1 = bk_d1(f, k, t, sigma)
+    return np.exp(-r * t) * norm_pdf(d1) / (f * sigma * np.sqrt(t))
+
+
+@_broadcast
+def bk_vega(f, k, t, r, sigma):
+    """Calculate the vega for European options on futures contracts."""
+    d1 = bk_d1(f, k, t, sigma)
+    return np.exp(-r * t) * f * norm_pdf(d1) * np.sqrt(t)
+
+
+@_broadcast
+def bk_call_rho(f, k, t, r, sigma):
+    """Calculate Rho for call options using the Black model."""
+    return -t * bk_call_price(f, k, t, r, sigma)
+
+
+@_broadcast
+def bk_put_rho(f, k, t, r, sigma):
+    """Calculate Rho for put options using the Black model."""
+    return -t * bk_put_price(f, k, t, r, sigma)
+
+
+@_broadcast
+def bk_call_theta(f, k, t, r, sigma):
+    """Calculate Theta for call options using the Black model."""
+    d1 = bk_d1(f, k, t, sigma)
+    d2 = bk_d2(f, k, t, sigma)
+    term1 = -f * np.exp(-r * t) * norm_pdf(d1) * sigma / (2 * np.sqrt(t))
+    term2 = r * np.exp(-r * t) * (f * norm_cdf(d1) - k * norm_cdf(d2))
+    return term1 + term2
+
+
+@_broadcast
+def bk_put_theta(f, k, t, r, sigma):
+    """Calculate Theta for put options using the Black model."""
+    d1 = bk_d1(f, k, t, sigma)
+    d2 = bk_d2(f, k, t, sigma)
+    term1 = -f * np.exp(-r * t) * norm_pdf(d1) * sigma / (2 * np.sqrt(t))
+    term2 = r * np.exp(-r * t) * (k * norm_cdf(-d2) - f * norm_cdf(-d1))
+    return term1 + term2
+
+
+@_broadcast
+def bk_greeks(f, k, t, r, sigma, is_call=True):
+    """Compute the Black model price and all greeks in one pass; ``is_call`` may be a boolean array."""
+    sign = np.where(is_call, 1.0, -1.0)
+    sqrt_t = np.sqrt(t)
+    d1 = (np.log(f / k) + 0.5 * sigma ** 2 * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    df = np.exp(-r * t)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(sign * d1)
+    price = sign * df * (f * cdf_d1 - k * norm_cdf(sign * d2))
+    return _greeks(
+        price=price,
+        delta=sign * df * cdf_d1,
+        gamma=df * pdf_d1 / (f * sigma * sqrt_t),
+        vega=df * f * pdf_d1 * sqrt_t,
+        theta=-f * df * pdf_d1 * sigma / (2 * sqrt_t) + r * price,
+        rho=-t * price)
+
+
+@_broadcast
+def bk_full_greeks(f, k, t, r, sigma, is_call=True):
+    """Compute the Black model price and greeks up to third order in one pass; see ``models.FullGreeks``."""
+    sign = np.where(is_call, 1.0, -1.0)
+    sqrt_t = np.sqrt(t)
+    d1 = (np.log(f / k) + 0.5 * sigma ** 2 * t) / (sigma * sqrt_t)
+    d2 = d1 - sigma * sqrt_t
+    df = np.exp(-r * t)
+    pdf_d1 = norm_pdf(d1)
+    cdf_d1 = norm_cdf(sign * d1)
+    price = sign * df * (f * cdf_d1 - k * norm_cdf(sign * d2))
+    delta = sign * df * cdf_d1
+    gamma = df * pdf_d1 / (f * sigma * sqrt_t)
+    vega = df * f * pdf_d1 * sqrt_t
+    return _full_greeks(
+        price,
+        delta,
+        gamma,
+        vega,
+        -f * df * pdf_d1 * sigma / (2 * sqrt_t) + r * price,
+        -t * price,
+        -df * pdf_d1 * d2 / sigma,
+        vega * d1 * d2 / sigma,
+        r * delta + df * pdf_d1 * d2 / (2 * t),
+        -gamma / f * (d1 / (sigma * sqrt_t) + 1),
+        gamma * (d1 * d2 - 1) / sigma,
+        gamma * (r + (1 - d1 * d2) / (2 * t)),
+        -vega * (d1 * d2 * (1 - d1 * d2) + d1 * d1 + d2 * d2) / sigma ** 2)
+
+
+# Bachelier Model Functions
+@_broadcast
+def bach_d(f, k, t, sigma):
+    return (f - k) / (sigma * np.sqrt(t))
+
+
+@_broadcast
+def bach_call_price(f, k, t, r, sigma):
+    """Calculate the Bachelier model price for European call options."""
+    d = bach_d(f, k, t, sigma)
+    return np.exp(-r * t) * ((f - k) * norm_cdf(d) + sigma * np.sqrt(t) * norm_pdf(d))
+
+
+@_broadcast
+def bach_put_price(f, k, t, r, sigma):
+    """Calculate the Bachelier model price for European put options."""
+    d = bach_d(f, k, t, sigma)
+    return np.exp(-r * t) * ((k - f) * norm_cdf(-d) + sigma * np.sqrt(t) * norm_pdf(d))
+
+
+@_broadcast
+def bach_call_delta(f, k, t, r, sigma):
+    """Calculate the delta of call options using the Bachelier model."""
+    d = bach_d(f, k, t, sigma)
+    return np.exp(-r * t) * norm_cdf(d)
+
+
+@_broadcast
+def bach_put_delta(f, k, t, r, sigma):
+    """Calculate the delta of put options using the Bachelier model."""
+    d = bach_d(f, k, t, sigma)
+    return -np.exp(-r * t) * norm_cdf(-d)
+
+
+@_broadcast
+def bach_gamma(f, k, t, r, sigma):
+    """Calculate Gamma for both call and put options using the Bachelier model."""
+    d = bach_d(f, k, t, sigma)
+    return np.exp(-r * t) * norm_pdf(d) / (sigma * np.sqrt(t))
+
+
+@_broadcast
+def bach_vega(f, k, t, r, sigma):
+    """Calculate Vega for both call and put options using the Bachelier model."""
+    d = bach_d(f, k, t, sigma)
+    return np.exp(-r * t) * np.sqrt(t) * norm_pdf(d)
+
+
+@_broadcast
+def bach_call_theta(f, k, t, r, sigma):
+    """Calculate Theta for call options using the Bachelier model."""
+    d = bach_d(f, k, t, sigma)
+    term1 = -0.5 * np.exp(-r * t) * sigma * norm_pdf(d) / np.sqrt(t)
+    term2 = r * bach_call_price(f, k, t, r, sigma)
+    return term1 + term2
+
+
+@_broadcast
+def bach_put_theta(f, k, t, r, sigma):
+    """Calculate Theta for put options using the Bachelier model."""
+    d = bach_d(f, k, t, sigma)
+    term1 = -0.5 * np.exp(-r * t) * sigma * norm_pdf(d) / np.sqrt(t)
+    term2 = r * bach_put_price(f, k, t, r, sigma)
+    return term1 + term2
+
+
+@_broadcast
+def bach_call_rho(f, k, t, r, sigma):
+    """Calculate Rho for call options using the Bachelier model."""
+    return t * bach_call_price(f, k, t, r, sigma)
+
+
+@_broadcast
+def bach_put_rho(f, k, t, r, sigma):
+    """Calculate Rho for put options using the Bachelier model."""
+    return -t * bach_put_price(f, k, t, r, sigma)
+
+
+@_broadcast
+def bach_greeks(f, k, t, r, sigma, is_call=True):
+    """Compute the Bachelier model price and all greeks in one pass; ``is_call`` may be a boolean array."""
+    sign = np.where(is_call, 1.0, -1.0)
+    sqrt_t = np.sqrt(t)
+    d = (f - k) / (sigma * sqrt_t)
+    df = np.exp(-r * t)
+    pdf_d = norm_pdf(d)
+    cdf_d = norm_cdf(sign * d)
+    price = df * (sign * (f - k) * cdf_d + sigma * sqrt_t * pdf_d)
+    return _greeks(
+        price=price,
+        delta=sign * df * cdf_d,
+        gamma=df * pdf_d / (sigma * sqrt_t),
+        vega=df * sqrt_t * pdf_d,
+        theta=-0.5 * df * sigma * pdf_d / sqrt_t + r * price,
+        rho=sign * t * price)
+
+
+@_broadcast
+def bach_full_greeks(f, k, t, r, sigma, is_call=True):
+    """Compute the Bachelier model price and greeks up to third order in one pass; see ``models.FullGreeks``."""
+    sign = np.where(is_call, 1.0, -1.0)
+    sqrt_t = np.sqrt(t)
+    d = (f - k) / (sigma * sqrt_t)
+    df = np.exp(-r * t)
+    pdf_d = norm_pdf(d)
+    cdf_d = norm_cdf(sign * d)
+    price = df * (sign * (f - k) * cdf_d + sigma * sqrt_t * pdf_d)
+    delta = sign * df * cdf_d
+    gamma = df * pdf_d / (sigma * sqrt_t)
+    volga = df * sqrt_t * pdf_d * d * d / sigma
+    return _full_greeks(
+        price,
+        delta,
+        gamma,
+        df * sqrt_t * pdf_d,
+        -0.5 * df * sigma * pdf_d / sqrt_t + r * price,
+        sign * t * price,
+        -df * pdf_d * d / sigma,
+        volga,
+        r * delta + df * pdf_d * d / (2 * t),
+        -gamma * d / (sigma * sqrt_t),
+        gamma * (d * d - 1) / sigma,
+        gamma * (r + (1 - d * d) / (2 * t)),
+        volga * (d * d - 3) / sigma)
+
+
+IV_DTYPE = np.dtype([('sigma', np.float64), ('iterations', np.int64), ('converged', np.bool_)])
+
+
+def _iv_result(sigma, iterations, converged, shape):
+    """Pack solver output into a record array with ``IV_DTYPE`` fields and the broadcast input shape."""
+    out = np.empty(len(sigma), dtype=IV_DTYPE).view(np.recarray)
+    out.sigma, out.iterations, out.converged = sigma, iterations, converged
+    return out.reshape(shape)
+
+
+def implied_volatility(p, k, t, r, market_price, price_function, vega_function, sigma=0.2, tol=1e-5,
+                       max_iterations=100, full_output=False):
+    """Array version of ``models.implied_volatility``; the pricing functions must accept arrays.
+
+    All quotes take safeguarded Newton steps in lockstep. ``price_function`` and ``vega_function`` are
+    only called on the quotes that have not converged yet, so a chain costs as many vectorised calls as
+    its slowest quote needs iterations.
+    """
+    p, k, t, r, market_price, sigma = np.broadcast_arrays(*map(np.asarray, (p, k, t, r, market_price, sigma)))
+    shape = p.shape
+    p, k, t, r, market_price = (np.ravel(a).astype(float) for a in (p, k, t, r, market_price))
+    sigma = np.ravel(sigma).astype(float)
+    iterations = np.zeros(sigma.size, dtype=np.int64)
+    converged = np.zeros(sigma.size, dtype=bool)
+    lower, upper = np.zeros(sigma.size), np.full(sigma.size, np.inf)
+    active = np.arange(sigma.size)
+    with np.errstate(all='ignore'):
+        for iteration in range(1, max_iterations + 1):
+            if not active.size:
+                break
+            args = p[active], k[active], t[active], r[active]
+            s = sigma[active]
+            diff = market_price[active] - price_function(*args, s)
+            done = np.abs(diff) < tol
+            lo = np.where(diff > 0, s, lower[active])
+            hi = np.where(diff > 0, upper[active], s)
+            vega = vega_function(*args, s)
+            step = np.where(vega > 0, s + diff / vega, np.nan)
+            bisected = np.where(lo > 0, np.sqrt(lo * hi), 0.5 * hi)
+            bisected = np.where(np.isfinite(hi), bisected, 4 * s)
+            inside = (lo < step) & (step < np.minimum(hi, 4 * s))
+            sigma[active] = np.where(done, s, np.where(inside, step, bisected))
+            lower[active], upper[active] = lo, hi
+            iterations[active] = iteration
+            converged[active[done]] = True
+            active = active[~done]
+    if full_output:
+        return _iv_result(sigma, iterations, converged, shape)
+    return sigma.reshape(shape)
+
+
+def _householder(nu, h2, h3):
+    """Third-order Householder step from the Newton step nu and the second and third derivatives over the first."""
+    return nu * (1 + 0.5 * h2 * nu) / (1 + nu * (h2 + h3 * nu / 6))
+
+
+def _bracketed_householder(z, evaluate, params, tol, max_iterations):
+    """Solve every quote in lockstep, dropping converged quotes from the working set after each pass.
+
+    ``evaluate(z, *params)`` returns the signed gap (positive when z lies above the root) and a
+    Householder step, NaN where none is available. Each quote keeps its own bracket, and steps that
+    leave it are replaced by bisection, or doubling while no upper bound is known.
+    """
+    z = z.astype(float)
+    iterations = np.zeros(z.size, dtype=np.int64)
+    converged = np.zeros(z.size, dtype=bool)
+    lower, upper = np.zeros(z.size), np.full(z.size, np.inf)
+    active = np.arange(z.size)
+    with np.errstate(all='ignore'):
+        for iteration in range(1, max_iterations + 1):
+            if not active.size:
+                break
+            zi = z[active]
+            gap, step = evaluate(zi, *(param[active] for param in params))
+            lo = np.where(gap < 0, zi, lower[active])
+            hi = np.where(gap > 0, zi, upper[active])
+            exact = gap == 0
+            small = np.abs(step) <= tol * zi
+            newton = zi + step
+            inside = (lo < newton) & (newton < hi)
+            bisected = np.where(np.isfinite(hi), 0.5 * (lo + hi), 2 * zi)
+            z[active] = np.where(exact, zi, np.where(small | inside, newton, bisected))
+            done = exact | small | (~inside & (hi - lo <= tol * bisected))
+            lower[active], upper[active] = lo, hi
+            iterations[active] = iteration
+            converged[active[done]] = True
+            active = active[~done]
+    return z, iterations, converged
+
+
+def _normalized_black(x, s):
+    """Normalised Black call price b(x, s) for log-moneyness x = ln(F/K) and total volatility s = sigma * sqrt(t)."""
+    return np.exp(0.5 * x) * norm_cdf(x / s + 0.5 * s) - np.exp(-0.5 * x) * norm_cdf(x / s - 0.5 * s)
+
+
+def _normalized_black_guess(x, beta, s_c, b_c):
+    """Starting total volatility for b(x, s) = beta, split at the inflexion point (s_c, b_c) as in Let's Be Rational."""
+    atm = 2 * ndtri(np.minimum(0.5 * (1 + beta * np.exp(-0.5 * x)), 1 - 2 ** -53))
+    u = norm_cdf(x / (np.sqrt(3) * s_c)) * np.cbrt(beta / b_c)
+    lower = np.minimum(s_c, np.maximum(x / (np.sqrt(3) * ndtri(u)), atm))
+    return np.where(beta < b_c, lower, np.maximum(s_c, atm))
+
+
+def _normalized_black_step(s, x, beta, lower_region):
+    """Gap and Householder step for b(x, s) = beta, on 1 / ln(b) below the inflexion point and on b above it."""
+    b = _normalized_black(x, s)
+    b1 = FRAC_1_SQRT_2PI * np.exp(-0.5 * (x * x / (s * s) + 0.25 * s * s))
+    w = x * x / s ** 3 - 0.25 * s
+    b2 = b1 * w
+    b3 = b1 * (w * w - 3 * x * x / s ** 4 - 0.25)
+    log_space = lower_region & (b > 0)
+    ln_b = np.log(np.where(log_space, b, 0.5))
+    l1 = b1 / b
+    l2 = b2 / b - l1 * l1
+    l3 = b3 / b - 3 * l1 * b2 / b + 2 * l1 ** 3
+    f = np.where(log_space, 1 / ln_b - 1 / np.log(beta), b - beta)
+    f1 = np.where(log_space, -l1 / ln_b ** 2, b1)
+    f2 = np.where(log_space, -l2 / ln_b ** 2 + 2 * l1 * l1 / ln_b ** 3, b2)
+    f3 = np.where(log_space, -l3 / ln_b ** 2 + 6 * l1 * l2 / ln_b ** 3 - 6 * l1 ** 3 / ln_b ** 4, b3)
+    return b - beta, np.where(b1 > 0, _householder(-f / f1, f2 / f1, f3 / f1), np.nan)
+
+
+def _black_iv(f, k, t, r, market_price, is_call, sigma, tol, max_iterations):
+    """Implied Black volatility of discounted option prices on forwards f, NaN outside the arbitrage bounds."""
+    f, k, t, r, market_price, is_call, sigma = np.broadcast_arrays(f, k, t, r, market_price, is_call, sigma)
+    shape = f.shape
+    f, k, t, r, market_price, sigma = (np.ravel(a).astype(float) for a in (f, k, t, r, market_price, sigma))
+    sign = np.where(np.ravel(is_call), 1.0, -1.0)
+    sqrt_t = np.sqrt(t)
+    result = np.full(f.size, np.nan)
+    iterations = np.zeros(f.size, dtype=np.int64)
+    converged = np.zeros(f.size, dtype=bool)
+    with np.errstate(all='ignore'):
+        beta = (market_price * np.exp(r * t) - np.maximum(sign * (f - k), 0)) / np.sqrt(f * k)
+        x = -np.abs(np.log(f / k))
+        valid = (0 < beta) & (beta < np.exp(0.5 * x))
+        atm = valid & (x == 0) & (beta < 1 - 2 ** -52)
+        result[atm] = 2 * ndtri(0.5 * (1 + beta[atm]))
+        converged[atm] = True
+        solve = np.flatnonzero(valid & ~atm)
+        x, beta = x[solve], beta[solve]
+        s_c = np.sqrt(-2 * x)
+        b_c = _normalized_black(x, s_c)
+        start = _normalized_black_guess(x, beta, s_c, b_c)
+        warm = sigma[solve] * sqrt_t[solve]
+        start = np.where(np.isfinite(warm) & (warm > 0), warm, start)
+    result[solve], iterations[solve], converged[solve] = _bracketed_householder(
+        start, _normalized_black_step, (x, beta, beta < b_c), tol, max_iterations)
+    return _iv_result(result / sqrt_t, iterations, converged, shape)
+
+
+def _bach_time_value_step(d, nu):
+    """Gap and Householder step on ln(g) for g(d) = pdf(d) / d - cdf(-d) = nu, which decreases in d."""
+    pdf = norm_pdf(d)
+    g = pdf / d - norm_cdf(-d)
+    g1 = -pdf / d ** 2
+    g2 = pdf * (d * d + 2) / d ** 3
+    g3 = -pdf * (1 + 3 / d ** 2 + 6 / d ** 4)
+    log_space = g > 0
+    l1 = g1 / g
+    f = np.where(log_space, np.log(np.where(log_space, g, 1.0)) - np.log(nu), g - nu)
+    f1 = np.where(log_space, l1, g1)
+    f2 = np.where(log_space, g2 / g - l1 * l1, g2)
+    f3 = np.where(log_space, g3 / g - 3 * l1 * g2 / g + 2 * l1 ** 3, g3)
+    return nu - g, np.where(pdf > 0, _householder(-f / f1, f2 / f1, f3 / f1), np.nan)
+
+
+def _bach_iv(f, k, t, r, market_price, is_call, sigma, tol, max_iterations):
+    """Implied Bachelier volatility of discounted option prices, NaN where they are not above intrinsic value."""
+    f, k, t, r, market_price, is_call, sigma = np.broadcast_arrays(f, k, t, r, market_price, is_call, sigma)
+    shape = f.shape
+    f, k, t, r, market_price, sigma = (np.ravel(a).astype(float) for a in (f, k, t, r, market_price, sigma))
+    sign = np.where(np.ravel(is_call), 1.0, -1.0)
+    sqrt_t = np.sqrt(t)
+    moneyness = np.abs(f - k)
+    result = np.full(f.size, np.nan)
+    iterations = np.zeros(f.size, dtype=np.int64)
+    converged = np.zeros(f.size, dtype=bool)
+    with np.errstate(all='ignore'):
+        time_value = market_price * np.exp(r * t) - np.maximum(sign * (f - k), 0)
+        valid = time_value > 0
+        atm = valid & (moneyness == 0)
+        result[atm] = time_value[atm] / (FRAC_1_SQRT_2PI * sqrt_t[atm])
+        nu = time_value / moneyness
+        # g(d) = 1 / (sqrt(2 pi) d) - 1/2 + O(d), so the small-d guess is exact in double precision below 1e-8
+        d = FRAC_1_SQRT_2PI / (nu + 0.5)
+        large = np.ones_like(nu)
+        for _ in range(3):
+            large = np.sqrt(np.maximum(-2 * (np.log(nu / FRAC_1_SQRT_2PI) + 3 * np.log(large)), 1e-6))
+        d = np.where(nu < 0.08, large, d)
+        exact = valid & ~atm & (nu >= 0.08) & (d < 1e-8)
+        result[exact] = moneyness[exact] / (d[exact] * sqrt_t[exact])
+        converged[atm | exact] = True
+        solve = np.flatnonzero(valid & ~atm & ~exact)
+        warm = moneyness[solve] / (sigma[solve] * sqrt_t[solve])
+        start = np.where(np.isfinite(warm) & (warm > 0), warm, d[solve])
+    d, iterations[solve], converged[solve] = _bracketed_householder(
+        start, _bach_time_value_step, (nu[solve],), tol, max_iterations)
+    result[solve] = moneyness[solve] / (d * sqrt_t[solve])
+    return _iv_result(result, iterations, converged, shape)
+
+
+@_broadcast
+def bs_iv(s, k, t, r, market_price, is_call=True, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for Black-Scholes volatilities of a whole chain; ``is_call`` may be a boolean array and ``sigma`` a warm start."""
+    sigma = np.nan if sigma is None else sigma
+    return _black_iv(s * np.exp(r * t), k, t, r, market_price, is_call, sigma, tol, max_iterations)
+
+
+@_broadcast
+def bk_iv(f, k, t, r, market_price, is_call=True, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for Black model volatilities of a whole chain; ``is_call`` may be a boolean array and ``sigma`` a warm start."""
+    sigma = np.nan if sigma is None else sigma
+    return _black_iv(f, k, t, r, market_price, is_call, sigma, tol, max_iterations)
+
+
+@_broadcast
+def bach_iv(f, k, t, r, market_price, is_call=True, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for Bachelier volatilities of a whole chain; ``is_call`` may be a boolean array and ``sigma`` a warm start."""
+    sigma = np.nan if sigma is None else sigma
+    return _bach_iv(f, k, t, r, market_price, is_call, sigma, tol, max_iterations)
+
+
+def bs_call_iv(s, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for Black-Scholes call volatilities; see ``bs_iv``."""
+    return bs_iv(s, k, t, r, market_price, is_call=True, sigma=sigma, tol=tol, max_iterations=max_iterations)
+
+
+def bs_put_iv(s, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for Black-Scholes put volatilities; see ``bs_iv``."""
+    return bs_iv(s, k, t, r, market_price, is_call=False, sigma=sigma, tol=tol, max_iterations=max_iterations)
+
+
+def bk_call_iv(f, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for Black model call volatilities; see ``bk_iv``."""
+    return bk_iv(f, k, t, r, market_price, is_call=True, sigma=sigma, tol=tol, max_iterations=max_iterations)
+
+
+def bk_put_iv(f, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for Black model put volatilities; see ``bk_iv``."""
+    return bk_iv(f, k, t, r, market_price, is_call=False, sigma=sigma, tol=tol, max_iterations=max_iterations)
+
+
+def bach_call_iv(f, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for Bachelier call volatilities; see ``bach_iv``."""
+    return bach_iv(f, k, t, r, market_price, is_call=True, sigma=sigma, tol=tol, max_iterations=max_iterations)
+
+
+def bach_put_iv(f, k, t, r, market_price, sigma=None, tol=1e-10, max_iterations=100):
+    """Solve for Bachelier put volatilities; see ``bach_iv``."""
+    return bach_iv(f, k, t, r, market_price, is_call=False, sigma=sigma, tol=tol, max_iterations=max_iterations)
@@ -1,16 +1,94 @@
+use numpy::{PyReadonlyArray1, PyReadwriteArray1, PyReadwriteArray2};
+use pyo3::exceptions::{PyRuntimeError, PyValueError};
 use pyo3::prelude::*;
-use statrs::distribution::{Normal, Continuous, ContinuousCDF};
+use pyo3::types::PyDict;
+use rayon::prelude::*;
+use rayon::{ThreadPool, ThreadPoolBuilder};
+use std::collections::HashMap;
+use std::sync::atomic::{AtomicBool, AtomicU64, Ordering};
+use std::sync::{Arc, Mutex, OnceLock};
+use std::time::Instant;
+use std::f64::consts::{FRAC_1_SQRT_2, PI};
 
+const FRAC_1_SQRT_PI: f64 = 5.6418958354775628695e-1;
+const FRAC_1_SQRT_2PI: f64 = 3.9894228040143267794e-1;
+
+const ERFC_A: [f64; 5] = [
+    3.16112374387056560e00, 1.13864154151050156e02, 3.77485237685302021e02,
+    3.20937758913846947e03, 1.85777706184603153e-1,
+];
+const ERFC_B: [f64; 4] = [
+    2.36012909523441209e01, 2.44024637934444173e02, 1.28261652607737228e03,
+    2.84423683343917062e03,
+];
+const ERFC_C: [f64; 9] = [
+    5.64188496988670089e-1, 8.88314979438837594e00, 6.61191906371416295e01,
+    2.98635138197400131e02, 8.81952221241769090e02, 1.71204761263407058e03,
+    2.05107837782607147e03, 1.23033935479799725e03, 2.15311535474403846e-8,
+];
+const ERFC_D: [f64; 8] = [
+    1.57449261107098347e01, 1.17693950891312499e02, 5.37181101862009858e02,
+    1.62138957456669019e03, 3.29079923573345963e03, 4.36261909014324716e03,
+    3.43936767414372164e03, 1.23033935480374942e03,
+];
+const ERFC_P: [f64; 6] = [
+    3.05326634961232344e-1, 3.60344899949804439e-1, 1.25781726111229246e-1,
+    1.60837851487422766e-2, 6.58749161529837803e-4, 1.63153871373020978e-2,
+];
+const ERFC_Q: [f64; 5] = [
+    2.56852019228982242e00, 1.87295284992346725e00, 5.27905102951428412e-1,
+    6.05183413124413191e-2, 2.33520497626869185e-3,
+];
+
+/// Complementary error function, W. J. Cody's rational Chebyshev approximation
+/// (SPECFUN CALERF). Relative error is below 1e-15 wherever erfc(x) is a normal
+/// double. exp(-x^2) is split into two factors so the tail keeps full precision.
+#[inline]
+fn erfc(x: f64) -> f64 {
+    let y = x.abs();
+    if y <= 0.46875 {
+        let ysq = y * y;
+        let mut num = ERFC_A[4] * ysq;
+        let mut den = ysq;
+        for i in 0..3 {
+            num = (num + ERFC_A[i]) * ysq;
+            den = (den + ERFC_B[i]) * ysq;
+        }
+        return 1.0 - x * (num + ERFC_A[3]) / (den + ERFC_B[3]);
+    }
+    let mut result = if y <= 4.0 {
+        let mut num = ERFC_C[8] * y;
+        let mut den = y;
+        for i in 0..7 {
+            num = (num + ERFC_C[i]) * y;
+            den = (den + ERFC_D[i]) * y;
+        }
+        (num + ERFC_C[7]) / (den + ERFC_D[7])
+    } else {
+        let ysq = 1.0 / (y * y);
+        let mut num = ERFC_P[5] * ysq;
+        let mut den = ysq;
+        for i in 0..4 {
+            num = (num + ERFC_P[i]) * ysq;
+            den = (den + ERFC_Q[i]) * ysq;
+        }
+        (FRAC_1_SQRT_PI - ysq * (num + ERFC_P[4]) / (den + ERFC_Q[4])) / y
+    };
+    let ysq = (y * 16.0).trunc() / 16.0;
+    result *= (-ysq * ysq).exp() * (-(y - ysq) * (y + ysq)).exp();
+    if x < 0.0 { 2.0 - result } else { result }
+}
+
+/// Standard normal CDF via erfc. Relative error is below 2e-13 for x >= -37,
+/// dominated by the rounding of x / sqrt(2); absolute error is below 3e-16.
 #[pyfunction]
 fn norm_cdf(x: f64) -> f64 {
-    let normal = Normal::new(0.0, 1.0).unwrap();
-    normal.cdf(x)
+    0.5 * erfc(-x * FRAC_1_SQRT_2)
 }
 
 #[pyfunction]
 fn norm_pdf(x: f64) -> f64 {
-    let normal = Normal::new(0.0, 1.0).unwrap();
-    normal.pdf(x)
+    FRAC_1_SQRT_2PI * (-0.5 * x * x).exp()
 }
 
 #[pyfunction]
@@ -85,6 +163,63 @@ fn bs_put_rho(s: f64, k: f64, t: f64, r: f64, sigma: f64) -> f64 {
     -k * t * (-r * t).exp() * norm_cdf(-bs_d2(s, k, t, r, sigma))
 }
 
+/// Price, delta, gamma, vega, theta and rho sharing d1, d2 and the discount factor.
+#[pyfunction]
+#[pyo3(signature = (s, k, t, r, sigma, is_call=true))]
+fn bs_greeks(s: f64, k: f64, t: f64, r: f64, sigma: f64, is_call: bool) -> (f64, f64, f64, f64, f64, f64) {
+    let sign = if is_call { 1.0 } else { -1.0 };
+    let sqrt_t = t.sqrt();
+    let d1 = (s.ln() - k.ln() + (r + 0.5 * sigma.powi(2)) * t) / (sigma * sqrt_t);
+    let d2 = d1 - sigma * sqrt_t;
+    let df = (-r * t).exp();
+    let pdf_d1 = norm_pdf(d1);
+    let cdf_d1 = norm_cdf(sign * d1);
+    let cdf_d2 = norm_cdf(sign * d2);
+    let price = sign * (s * cdf_d1 - k * df * cdf_d2);
+    let delta = sign * cdf_d1;
+    let gamma = pdf_d1 / (s * sigma * sqrt_t);
+    let vega = s * pdf_d1 * sqrt_t;
+    let theta = -s * pdf_d1 * sigma / (2.0 * sqrt_t) - sign * r * k * df * cdf_d2;
+    let rho = sign * k * t * df * cdf_d2;
+    (price, delta, gamma, vega, theta, rho)
+}
+
+/// Price and greeks up to third order, in the field order of models.FullGreeks:
+/// price, delta, gamma, vega, theta, rho, vanna, volga, charm, speed, zomma,
+/// color and ultima. Charm and color are decays, minus the derivative by t.
+const FULL_GREEKS: usize = 13;
+
+#[pyfunction]
+#[pyo3(signature = (s, k, t, r, sigma, is_call=true))]
+fn bs_full_greeks(s: f64, k: f64, t: f64, r: f64, sigma: f64, is_call: bool) -> [f64; FULL_GREEKS] {
+    let sign = if is_call { 1.0 } else { -1.0 };
+    let sqrt_t = t.sqrt();
+    let d1 = (s.ln() - k.ln() + (r + 0.5 * sigma.powi(2)) * t) / (sigma * sqrt_t);
+    let d2 = d1 - sigma * sqrt_t;
+    let df = (-r * t).exp();
+    let pdf_d1 = norm_pdf(d1);
+    let cdf_d1 = norm_cdf(sign * d1);
+    let cdf_d2 = norm_cdf(sign * d2);
+    let gamma = pdf_d1 / (s * sigma * sqrt_t);
+    let vega = s * pdf_d1 * sqrt_t;
+    let d1_t = (r / sigma + 0.5 * sigma) / sqrt_t - d1 / (2.0 * t);
+    [
+        sign * (s * cdf_d1 - k * df * cdf_d2),
+        sign * cdf_d1,
+        gamma,
+        vega,
+        -s * pdf_d1 * sigma / (2.0 * sqrt_t) - sign * r * k * df * cdf_d2,
+        sign * k * t * df * cdf_d2,
+        -pdf_d1 * d2 / sigma,
+        vega * d1 * d2 / sigma,
+        -pdf_d1 * d1_t,
+        -gamma / s * (d1 / (sigma * sqrt_t) + 1.0),
+        gamma * (d1 * d2 - 1.0) / sigma,
+        gamma * (d1 * d1_t + 0.5 / t),
+        -vega * (d1 * d2 * (1.0 - d1 * d2) + d1 * d1 + d2 * d2) / sigma.powi(2),
+    ]
+}
+
 #[pyfunction]
 fn bk_d1(f: f64, k: f64, t: f64, sigma: f64) -> f64 {
     (f.ln() - k.ln() + 0.5 * sigma.powi(2) * t) / (sigma * t.sqrt())
@@ -159,6 +294,200 @@ fn bk_put_theta(f: f64, k: f64, t: f64, r: f64, sigma: f64) -> f64 {
     term1 + term2
 }
 
+/// Price, delta, gamma, vega, theta and rho sharing d1, d2 and the discount factor.
+#[pyfunction]
+#[pyo3(signature = (f, k, t, r, sigma, is_call=true))]
+fn bk_greeks(f: f64, k: f64, t: f64, r: f64, sigma: f64, is_call: bool) -> (f64, f64, f64, f64, f64, f64) {
+    let sign = if is_call { 1.0 } else { -1.0 };
+    let sqrt_t = t.sqrt();
+    let d1 = (f.ln() - k.ln() + 0.5 * sigma.powi(2) * t) / (sigma * sqrt_t);
+    let d2 = d1 - sigma * sqrt_t;
+    let df = (-r * t).exp();
+    let pdf_d1 = norm_pdf(d1);
+    let cdf_d1 = norm_cdf(sign * d1);
+    let price = sign * df * (f * cdf_d1 - k * norm_cdf(sign * d2));
+    let delta = sign * df * cdf_d1;
+    let gamma = df * pdf_d1 / (f * sigma * sqrt_t);
+    let vega = df * f * pdf_d1 * sqrt_t;
+    let theta = -f * df * pdf_d1 * sigma / (2.0 * sqrt_t) + r * price;
+    let rho = -t * price;
+    (price, delta, gamma, vega, theta, rho)
+}
+
+#[pyfunction]
+#[pyo3(signature = (f, k, t, r, sigma, is_call=true))]
+fn bk_full_greeks(f: f64, k: f64, t: f64, r: f64, sigma: f64, is_call: bool) -> [f64; FULL_GREEKS] {
+    let sign = if is_call { 1.0 } else { -1.0 };
+    let sqrt_t = t.sqrt();
+    let d1 = (f.ln() - k.ln() + 0.5 * sigma.powi(2) * t) / (sigma * sqrt_t);
+    let d2 = d1 - sigma * sqrt_t;
+    let df = (-r * t).exp();
+    let pdf_d1 = norm_pdf(d1);
+    let cdf_d1 = norm_cdf(sign * d1);
+    let price = sign * df * (f * cdf_d1 - k * norm_cdf(sign * d2));
+    let delta = sign * df * cdf_d1;
+    let gamma = df * pdf_d1 / (f * sigma * sqrt_t);
+    let vega = df * f * pdf_d1 * sqrt_t;
+    [
+        price,
+        delta,
+        gamma,
+        vega,
+        -f * df * pdf_d1 * sigma / (2.0 * sqrt_t) + r * price,
+        -t * price,
+        -df * pdf_d1 * d2 / sigma,
+        vega * d1 * d2 / sigma,
+        r * delta + df * pdf_d1 * d2 / (2.0 * t),
+        -gamma / f * (d1 / (sigma * sqrt_t) + 1.0),
+        gamma * (d1 * d2 - 1.0) / sigma,
+        gamma * (r + (1.0 - d1 * d2) / (2.0 * t)),
+        -vega * (d1 * d2 * (1.0 - d1 * d2) + d1 * d1 + d2 * d2) / sigma.powi(2),
+    ]
+}
+
+// Instrumentation: per-function counters for the entry points Python calls
+// directly, that is the batch kernels, the IV solvers and implied_volatility.
+// The scalar pricing functions double as the kernels everything else is built
+// from, so their calls are counted by optrush.instrument on the Python side.
+// Counters are off unless turned on from Python or with OPTRUSH_INSTRUMENT=1;
+// off, an entry point pays one relaxed atomic load. Histogram layouts match
+// optrush.instrument: bucket b of a log2 histogram holds [2^(b-1), 2^b).
+
+const LATENCY_BUCKETS: usize = 40;
+const ITERATION_BUCKETS: usize = 101;
+
+static INSTRUMENT: AtomicBool = AtomicBool::new(false);
+
+struct Counters {
+    calls: AtomicU64,
+    elements: AtomicU64,
+    nanoseconds: AtomicU64,
+    nonconverged: AtomicU64,
+    latency: [AtomicU64; LATENCY_BUCKETS],
+    sizes: [AtomicU64; LATENCY_BUCKETS],
+    iterations: [AtomicU64; ITERATION_BUCKETS],
+}
+
+impl Counters {
+    fn new() -> Self {
+        Counters {
+            calls: AtomicU64::new(0),
+            elements: AtomicU64::new(0),
+            nanoseconds: AtomicU64::new(0),
+            nonconverged: AtomicU64::new(0),
+            latency: std::array::from_fn(|_| AtomicU64::new(0)),
+            sizes: std::array::from_fn(|_| AtomicU64::new(0)),
+            iterations: std::array::from_fn(|_| AtomicU64::new(0)),
+        }
+    }
+
+    fn reset(&self) {
+        let totals = [&self.calls, &self.elements, &self.nanoseconds, &self.nonconverged];
+        let histograms = self.latency.iter().chain(&self.sizes).chain(&self.iterations);
+        totals.into_iter().chain(histograms).for_each(|c| c.store(0, Ordering::Relaxed));
+    }
+}
+
+fn registry() -> &'static Mutex<Vec<(&'static str, &'static Counters)>> {
+    static REGISTRY: OnceLock<Mutex<Vec<(&'static str, &'static Counters)>>> = OnceLock::new();
+    REGISTRY.get_or_init(Default::default)
+}
+
+fn register(name: &'static str) -> &'static Counters {
+    let counters: &'static Counters = Box::leak(Box::new(Counters::new()));
+    registry().lock().unwrap().push((name, counters));
+    counters
+}
+
+fn bucket(value: u64) -> usize {
+    ((u64::BITS - value.leading_zeros()) as usize).min(LATENCY_BUCKETS - 1)
+}
+
+/// One call in progress, only created while instrumentation is on.
+struct Probe {
+    counters: &'static Counters,
+    start: Instant,
+}
+
+impl Probe {
+    /// Count one solved quote.
+    fn quote(&self, iterations: usize, converged: bool) {
+        self.counters.iterations[iterations.min(ITERATION_BUCKETS - 1)].fetch_add(1, Ordering::Relaxed);
+        if !converged {
+            self.counters.nonconverged.fetch_add(1, Ordering::Relaxed);
+        }
+    }
+
+    /// Count the quotes of a batch from its iteration counts, -1 marking a quote that did not converge.
+    fn quotes(&self, iterations: &[i64]) {
+        let mut counts = [0u64; ITERATION_BUCKETS];
+        let mut failed = 0;
+        for &n in iterations {
+            if n < 0 { failed += 1 } else { counts[(n as usize).min(ITERATION_BUCKETS - 1)] += 1 }
+        }
+        for (counter, n) in self.counters.iterations.iter().zip(counts).filter(|(_, n)| *n > 0) {
+            counter.fetch_add(n, Ordering::Relaxed);
+        }
+        self.counters.nonconverged.fetch_add(failed, Ordering::Relaxed);
+    }
+
+    fn finish(self, elements: usize) {
+        let nanoseconds = self.start.elapsed().as_nanos() as u64;
+        let c = self.counters;
+        c.calls.fetch_add(1, Ordering::Relaxed);
+        c.elements.fetch_add(elements as u64, Ordering::Relaxed);
+        c.nanoseconds.fetch_add(nanoseconds, Ordering::Relaxed);
+        c.latency[bucket(nanoseconds)].fetch_add(1, Ordering::Relaxed);
+        c.sizes[bucket(elements as u64)].fetch_add(1, Ordering::Relaxed);
+    }
+}
+
+/// `Some(Probe)` for the entry point `$name` while instrumentation is on, else `None`.
+macro_rules! probe {
+    ($name:expr) => {{
+        static COUNTERS: OnceLock<&'static Counters> = OnceLock::new();
+        if INSTRUMENT.load(Ordering::Relaxed) {
+            Some(Probe { counters: *COUNTERS.get_or_init(|| register($name)), start: Instant::now() })
+        } else {
+            None
+        }
+    }};
+}
+
+/// Turn the counters on or off and return the previous setting; without an argument only read it.
+#[pyfunction]
+#[pyo3(signature = (enabled=None))]
+fn instrumentation(enabled: Option<bool>) -> bool {
+    match enabled {
+        Some(on) => INSTRUMENT.swap(on, Ordering::Relaxed),
+        None => INSTRUMENT.load(Ordering::Relaxed),
+    }
+}
+
+#[pyfunction]
+fn instrumentation_reset() {
+    registry().lock().unwrap().iter().for_each(|(_, counters)| counters.reset());
+}
+
+/// Counters of every entry point called while instrumentation was on, keyed by function name.
+#[pyfunction]
+fn instrumentation_snapshot(py: Python) -> PyResult<PyObject> {
+    let load = |counters: &[AtomicU64]| counters.iter().map(|c| c.load(Ordering::Relaxed)).collect::<Vec<u64>>();
+    let snapshot = PyDict::new(py);
+    for (name, c) in registry().lock().unwrap().iter() {
+        let stats = PyDict::new(py);
+        stats.set_item("calls", c.calls.load(Ordering::Relaxed))?;
+        stats.set_item("elements", c.elements.load(Ordering::Relaxed))?;
+        stats.set_item("seconds", c.nanoseconds.load(Ordering::Relaxed) as f64 * 1e-9)?;
+        stats.set_item("latency", load(&c.latency[..]))?;
+        stats.set_item("sizes", load(&c.sizes[..]))?;
+        stats.set_item("iterations", load(&c.iterations[..]))?;
+        stats.set_item("nonconverged", c.nonconverged.load(Ordering::Relaxed))?;
+        snapshot.set_item(*name, stats)?;
+    }
+    Ok(snapshot.to_object(py))
+}
+
 #[pyfunction]
 fn implied_volatility(
     p: f64,
@@ -173,16 +502,25 @@ fn implied_volatility(
     max_iteration: usize,
     py: Python
 ) -> PyResult<f64> {
+    let probe = probe!("implied_volatility");
     let mut sigma = sigma;
-    for _ in 0..max_iteration {
+    for i in 0..max_iteration {
         let price: f64 = price_function.call1(py, (p, k, t, r, sigma))?.extract(py)?;
         let diff = market_price - price;
         if diff.abs() < tol {
+            if let Some(probe) = probe {
+                probe.quote(i + 1, true);
+                probe.finish(1);
+            }
             return Ok(sigma);
         }
         let vega: f64 = vega_function.call1(py, (p, k, t, r, sigma))?.extract(py)?;
         sigma += diff / vega;
     }
+    if let Some(probe) = probe {
+        probe.quote(max_iteration, false);
+        probe.finish(1);
+    }
     Ok(sigma)
 }
 
@@ -287,9 +625,478 @@ fn bach_put_rho(f: f64, k: f64, t: f64, r: f64, sigma: f64) -> f64 {
     -t * (-r * t).exp() * ((k - f) * norm_cdf(-d) + sigma * t.sqrt() * norm_pdf(d))
 }
 
+/// Price, delta, gamma, vega, theta and rho sharing d and the discount factor.
+#[pyfunction]
+#[pyo3(signature = (f, k, t, r, sigma, is_call=true))]
+fn bach_greeks(f: f64, k: f64, t: f64, r: f64, sigma: f64, is_call: bool) -> (f64, f64, f64, f64, f64, f64) {
+    let sign = if is_call { 1.0 } else { -1.0 };
+    let sqrt_t = t.sqrt();
+    let d = (f - k) / (sigma * sqrt_t);
+    let df = (-r * t).exp();
+    let pdf_d = norm_pdf(d);
+    let cdf_d = norm_cdf(sign * d);
+    let price = df * (sign * (f - k) * cdf_d + sigma * sqrt_t * pdf_d);
+    let delta = sign * df * cdf_d;
+    let gamma = df * pdf_d / (sigma * sqrt_t);
+    let vega = df * sqrt_t * pdf_d;
+    let theta = -0.5 * df * sigma * pdf_d / sqrt_t + r * price;
+    let rho = sign * t * price;
+    (price, delta, gamma, vega, theta, rho)
+}
+
+#[pyfunction]
+#[pyo3(signature = (f, k, t, r, sigma, is_call=true))]
+fn bach_full_greeks(f: f64, k: f64, t: f64, r: f64, sigma: f64, is_call: bool) -> [f64; FULL_GREEKS] {
+    let sign = if is_call { 1.0 } else { -1.0 };
+    let sqrt_t = t.sqrt();
+    let d = (f - k) / (sigma * sqrt_t);
+    let df = (-r * t).exp();
+    let pdf_d = norm_pdf(d);
+    let cdf_d = norm_cdf(sign * d);
+    let price = df * (sign * (f - k) * cdf_d + sigma * sqrt_t * pdf_d);
+    let delta = sign * df * cdf_d;
+    let gamma = df * pdf_d / (sigma * sqrt_t);
+    let volga = df * sqrt_t * pdf_d * d * d / sigma;
+    [
+        price,
+        delta,
+        gamma,
+        df * sqrt_t * pdf_d,
+        -0.5 * df * sigma * pdf_d / sqrt_t + r * price,
+        sign * t * price,
+        -df * pdf_d * d / sigma,
+        volga,
+        r * delta + df * pdf_d * d / (2.0 * t),
+        -gamma * d / (sigma * sqrt_t),
+        gamma * (d * d - 1.0) / sigma,
+        gamma * (r + (1.0 - d * d) / (2.0 * t)),
+        volga * (d * d - 3.0) / sigma,
+    ]
+}
+
+// Batch entry points: read NumPy buffers in place, write into a preallocated
+// output array and release the GIL while the kernel runs. Every input must have
+// the output's length or length 1, in which case it is broadcast.
+//
+// `threads` selects the execution mode: 1 runs on the calling thread, 0 uses
+// one worker per core and any other value a pool of that many workers. Pools
+// are work-stealing (rayon) over chunks of PARALLEL_CHUNK contracts and are
+// cached per size, so repeated calls don't pay for thread start-up.
+
+const PARALLEL_CHUNK: usize = 4096;
+
+#[inline(always)]
+fn at<T: Copy>(x: &[T], i: usize) -> T {
+    if x.len() == 1 { x[0] } else { x[i] }
+}
+
+fn check_lengths(n: usize, lengths: &[usize]) -> PyResult<()> {
+    match lengths.iter().find(|&&len| len != n && len != 1) {
+        Some(len) => Err(PyValueError::new_err(format!(
+            "input of length {} cannot be broadcast to output of length {}", len, n
+        ))),
+        None => Ok(()),
+    }
+}
+
+fn thread_pool(threads: usize, n: usize) -> PyResult<Option<Arc<ThreadPool>>> {
+    static POOLS: OnceLock<Mutex<HashMap<usize, Arc<ThreadPool>>>> = OnceLock::new();
+    if threads == 1 || n <= PARALLEL_CHUNK {
+        return Ok(None);
+    }
+    let mut pools = POOLS.get_or_init(Default::default).lock().unwrap();
+    if let Some(pool) = pools.get(&threads) {
+        return Ok(Some(pool.clone()));
+    }
+    let pool = ThreadPoolBuilder::new()
+        .num_threads(threads)
+        .build()
+        .map_err(|e| PyRuntimeError::new_err(e.to_string()))?;
+    let pool = Arc::new(pool);
+    pools.insert(threads, pool.clone());
+    Ok(Some(pool))
+}
+
+/// Call `kernel(i, row)` for every contract `i`, where `row` is its `width`-wide slot in `out`.
+fn run_batch<F>(out: &mut [f64], width: usize, pool: Option<&ThreadPool>, kernel: F)
+where
+    F: Fn(usize, &mut [f64]) + Sync,
+{
+    match pool {
+        None => out.chunks_exact_mut(width).enumerate().for_each(|(i, row)| kernel(i, row)),
+        Some(pool) => pool.install(|| {
+            out.par_chunks_mut(PARALLEL_CHUNK * width).enumerate().for_each(|(c, chunk)| {
+                for (j, row) in chunk.chunks_exact_mut(width).enumerate() {
+                    kernel(c * PARALLEL_CHUNK + j, row);
+                }
+            })
+        }),
+    }
+}
+
+macro_rules! batch_pyfunction {
+    ($batch:ident, $kernel:ident, $spot:ident) => {
+        #[pyfunction]
+        #[pyo3(signature = ($spot, k, t, r, sigma, out, threads=1))]
+        fn $batch(
+            py: Python,
+            $spot: PyReadonlyArray1<f64>,
+            k: PyReadonlyArray1<f64>,
+            t: PyReadonlyArray1<f64>,
+            r: PyReadonlyArray1<f64>,
+            sigma: PyReadonlyArray1<f64>,
+            mut out: PyReadwriteArray1<f64>,
+            threads: usize,
+        ) -> PyResult<()> {
+            let ($spot, k, t, r, sigma) = ($spot.as_slice()?, k.as_slice()?, t.as_slice()?, r.as_slice()?, sigma.as_slice()?);
+            let out = out.as_slice_mut()?;
+            check_lengths(out.len(), &[$spot.len(), k.len(), t.len(), r.len(), sigma.len()])?;
+            let pool = thread_pool(threads, out.len())?;
+            let (n, probe) = (out.len(), probe!(stringify!($batch)));
+            py.allow_threads(|| {
+                run_batch(out, 1, pool.as_deref(), |i, o| {
+                    o[0] = $kernel(at($spot, i), at(k, i), at(t, i), at(r, i), at(sigma, i));
+                })
+            });
+            if let Some(probe) = probe { probe.finish(n) }
+            Ok(())
+        }
+    };
+}
+
+macro_rules! greeks_batch_pyfunction {
+    ($batch:ident, $kernel:ident, $spot:ident) => {
+        /// Fill an (n, 6) array with price, delta, gamma, vega, theta and rho.
+        #[pyfunction]
+        #[pyo3(signature = ($spot, k, t, r, sigma, is_call, out, threads=1))]
+        fn $batch(
+            py: Python,
+            $spot: PyReadonlyArray1<f64>,
+            k: PyReadonlyArray1<f64>,
+            t: PyReadonlyArray1<f64>,
+            r: PyReadonlyArray1<f64>,
+            sigma: PyReadonlyArray1<f64>,
+            is_call: PyReadonlyArray1<bool>,
+            mut out: PyReadwriteArray2<f64>,
+            threads: usize,
+        ) -> PyResult<()> {
+            let ($spot, k, t, r, sigma) = ($spot.as_slice()?, k.as_slice()?, t.as_slice()?, r.as_slice()?, sigma.as_slice()?);
+            let is_call = is_call.as_slice()?;
+            let shape = out.shape().to_vec();
+            if shape[1] != 6 {
+                return Err(PyValueError::new_err("output must have shape (n, 6)"));
+            }
+            let out = out.as_slice_mut()?;
+            check_lengths(shape[0], &[$spot.len(), k.len(), t.len(), r.len(), sigma.len(), is_call.len()])?;
+            let pool = thread_pool(threads, shape[0])?;
+            let probe = probe!(stringify!($batch));
+            py.allow_threads(|| {
+                run_batch(out, 6, pool.as_deref(), |i, row| {
+                    let (price, delta, gamma, vega, theta, rho) =
+                        $kernel(at($spot, i), at(k, i), at(t, i), at(r, i), at(sigma, i), at(is_call, i));
+                    row.copy_from_slice(&[price, delta, gamma, vega, theta, rho]);
+                })
+            });
+            if let Some(probe) = probe { probe.finish(shape[0]) }
+            Ok(())
+        }
+    };
+}
+
+macro_rules! full_greeks_batch_pyfunction {
+    ($batch:ident, $kernel:ident, $spot:ident) => {
+        /// Fill an (n, 13) array with the models.FullGreeks fields.
+        #[pyfunction]
+        #[pyo3(signature = ($spot, k, t, r, sigma, is_call, out, threads=1))]
+        fn $batch(
+            py: Python,
+            $spot: PyReadonlyArray1<f64>,
+            k: PyReadonlyArray1<f64>,
+            t: PyReadonlyArray1<f64>,
+            r: PyReadonlyArray1<f64>,
+            sigma: PyReadonlyArray1<f64>,
+            is_call: PyReadonlyArray1<bool>,
+            mut out: PyReadwriteArray2<f64>,
+            threads: usize,
+        ) -> PyResult<()> {
+            let ($spot, k, t, r, sigma) = ($spot.as_slice()?, k.as_slice()?, t.as_slice()?, r.as_slice()?, sigma.as_slice()?);
+            let is_call = is_call.as_slice()?;
+            let shape = out.shape().to_vec();
+            if shape[1] != FULL_GREEKS {
+                return Err(PyValueError::new_err(format!("output must have shape (n, {})", FULL_GREEKS)));
+            }
+            let out = out.as_slice_mut()?;
+            check_lengths(shape[0], &[$spot.len(), k.len(), t.len(), r.len(), sigma.len(), is_call.len()])?;
+            let pool = thread_pool(threads, shape[0])?;
+            let probe = probe!(stringify!($batch));
+            py.allow_threads(|| {
+                run_batch(out, FULL_GREEKS, pool.as_deref(), |i, row| {
+                    row.copy_from_slice(&$kernel(at($spot, i), at(k, i), at(t, i), at(r, i), at(sigma, i), at(is_call, i)));
+                })
+            });
+            if let Some(probe) = probe { probe.finish(shape[0]) }
+            Ok(())
+        }
+    };
+}
+
+#[pyfunction]
+#[pyo3(signature = (x, out, threads=1))]
+fn norm_cdf_batch(py: Python, x: PyReadonlyArray1<f64>, mut out: PyReadwriteArray1<f64>, threads: usize) -> PyResult<()> {
+    let x = x.as_slice()?;
+    let out = out.as_slice_mut()?;
+    check_lengths(out.len(), &[x.len()])?;
+    let pool = thread_pool(threads, out.len())?;
+    let (n, probe) = (out.len(), probe!("norm_cdf_batch"));
+    py.allow_threads(|| run_batch(out, 1, pool.as_deref(), |i, o| o[0] = norm_cdf(at(x, i))));
+    if let Some(probe) = probe { probe.finish(n) }
+    Ok(())
+}
+
+#[pyfunction]
+#[pyo3(signature = (x, out, threads=1))]
+fn norm_pdf_batch(py: Python, x: PyReadonlyArray1<f64>, mut out: PyReadwriteArray1<f64>, threads: usize) -> PyResult<()> {
+    let x = x.as_slice()?;
+    let out = out.as_slice_mut()?;
+    check_lengths(out.len(), &[x.len()])?;
+    let pool = thread_pool(threads, out.len())?;
+    let (n, probe) = (out.len(), probe!("norm_pdf_batch"));
+    py.allow_threads(|| run_batch(out, 1, pool.as_deref(), |i, o| o[0] = norm_pdf(at(x, i))));
+    if let Some(probe) = probe { probe.finish(n) }
+    Ok(())
+}
+
+batch_pyfunction!(bs_call_price_batch, bs_call_price, s);
+batch_pyfunction!(bs_put_price_batch, bs_put_price, s);
+batch_pyfunction!(bs_call_delta_batch, bs_call_delta, s);
+batch_pyfunction!(bs_put_delta_batch, bs_put_delta, s);
+batch_pyfunction!(bs_gamma_batch, bs_gamma, s);
+batch_pyfunction!(bs_vega_batch, bs_vega, s);
+batch_pyfunction!(bs_call_theta_batch, bs_call_theta, s);
+batch_pyfunction!(bs_put_theta_batch, bs_put_theta, s);
+batch_pyfunction!(bs_call_rho_batch, bs_call_rho, s);
+batch_pyfunction!(bs_put_rho_batch, bs_put_rho, s);
+greeks_batch_pyfunction!(bs_greeks_batch, bs_greeks, s);
+full_greeks_batch_pyfunction!(bs_full_greeks_batch, bs_full_greeks, s);
+
+batch_pyfunction!(bk_call_price_batch, bk_call_price, f);
+batch_pyfunction!(bk_put_price_batch, bk_put_price, f);
+batch_pyfunction!(bk_call_delta_batch, bk_call_delta, f);
+batch_pyfunction!(bk_put_delta_batch, bk_put_delta, f);
+batch_pyfunction!(bk_gamma_batch, bk_gamma, f);
+batch_pyfunction!(bk_vega_batch, bk_vega, f);
+batch_pyfunction!(bk_call_theta_batch, bk_call_theta, f);
+batch_pyfunction!(bk_put_theta_batch, bk_put_theta, f);
+batch_pyfunction!(bk_call_rho_batch, bk_call_rho, f);
+batch_pyfunction!(bk_put_rho_batch, bk_put_rho, f);
+greeks_batch_pyfunction!(bk_greeks_batch, bk_greeks, f);
+full_greeks_batch_pyfunction!(bk_full_greeks_batch, bk_full_greeks, f);
+
+batch_pyfunction!(bach_call_price_batch, bach_call_price, f);
+batch_pyfunction!(bach_put_price_batch, bach_put_price, f);
+batch_pyfunction!(bach_call_delta_batch, bach_call_delta, f);
+batch_pyfunction!(bach_put_delta_batch, bach_put_delta, f);
+batch_pyfunction!(bach_gamma_batch, bach_gamma, f);
+batch_pyfunction!(bach_vega_batch, bach_vega, f);
+batch_pyfunction!(bach_call_theta_batch, bach_call_theta, f);
+batch_pyfunction!(bach_put_theta_batch, bach_put_theta, f);
+batch_pyfunction!(bach_call_rho_batch, bach_call_rho, f);
+batch_pyfunction!(bach_put_rho_batch, bach_put_rho, f);
+greeks_batch_pyfunction!(bach_greeks_batch, bach_greeks, f);
+full_greeks_batch_pyfunction!(bach_full_greeks_batch, bach_full_greeks, f);
+
+// Native implied-volatility solvers. Each solver runs Newton-Raphson on sigma
+// inside a bracket [lo, hi] that always contains the root, because every price
+// is increasing in sigma. A step that leaves the bracket, or a vega too small to
+// give a finite step, falls back to bisection, or to doubling sigma while no
+// upper bound is known yet. Solvers return (sigma, iterations, converged):
+// iterations counts price evaluations, and a quote outside the no-arbitrage
+// bounds returns (NaN, 0, false).
+
+fn solve_iv<P, V>(price: P, vega: V, market_price: f64, sigma: f64, tol: f64, max_iteration: usize) -> (f64, usize, bool)
+where
+    P: Fn(f64) -> f64,
+    V: Fn(f64) -> f64,
+{
+    let (mut lo, mut hi) = (0.0, f64::INFINITY);
+    let mut sigma = sigma;
+    for i in 0..max_iteration {
+        let diff = price(sigma) - market_price;
+        if diff.abs() < tol {
+            return (sigma, i + 1, true);
+        }
+        if diff > 0.0 { hi = sigma } else { lo = sigma }
+        let next = sigma - diff / vega(sigma);
+        sigma = if next > lo && next < hi {
+            next
+        } else if hi.is_finite() {
+            0.5 * (lo + hi)
+        } else {
+            2.0 * sigma
+        };
+    }
+    (sigma, max_iteration, false)
+}
+
+/// Starting sigma for the Black and Black-Scholes solvers. It uses the
+/// at-the-money approximation sigma ~ sqrt(2 pi / t) * time value / forward,
+/// floored at |d| <= 3 so Newton doesn't start where vega vanishes. Returns NaN
+/// when the undiscounted price is outside (intrinsic, upper bound).
+fn black_iv_guess(f: f64, k: f64, t: f64, undiscounted_price: f64, sign: f64) -> f64 {
+    let intrinsic = (sign * (f - k)).max(0.0);
+    let upper = if sign > 0.0 { f } else { k };
+    if !(undiscounted_price > intrinsic && undiscounted_price < upper) {
+        return f64::NAN;
+    }
+    let atm = (2.0 * PI / t).sqrt() * (undiscounted_price - intrinsic) / f;
+    atm.max((f / k).ln().abs() / (3.0 * t.sqrt())).max(1e-4)
+}
+
+/// Starting sigma for the Bachelier solvers: the at-the-money approximation
+/// sigma ~ sqrt(2 pi / t) * time value, floored at |d| <= 3. Returns NaN when
+/// the undiscounted price is not above intrinsic value.
+fn bach_iv_guess(f: f64, k: f64, t: f64, undiscounted_price: f64, sign: f64) -> f64 {
+    let intrinsic = (sign * (f - k)).max(0.0);
+    if !(undiscounted_price > intrinsic) {
+        return f64::NAN;
+    }
+    let atm = (2.0 * PI / t).sqrt() * (undiscounted_price - intrinsic);
+    atm.max((f - k).abs() / (3.0 * t.sqrt()))
+}
+
+fn bs_iv_guess(s: f64, k: f64, t: f64, r: f64, market_price: f64, sign: f64) -> f64 {
+    let growth = (r * t).exp();
+    black_iv_guess(s * growth, k, t, market_price * growth, sign)
+}
+
+fn bk_iv_guess(f: f64, k: f64, t: f64, r: f64, market_price: f64, sign: f64) -> f64 {
+    black_iv_guess(f, k, t, market_price * (r * t).exp(), sign)
+}
+
+fn bach_iv_guess_discounted(f: f64, k: f64, t: f64, r: f64, market_price: f64, sign: f64) -> f64 {
+    bach_iv_guess(f, k, t, market_price * (r * t).exp(), sign)
+}
+
+/// Solve one quote; `sigma` is the starting point, or the model's own guess when None.
+#[inline]
+fn solve_quote<G, P, V>(guess: G, price: P, vega: V, market_price: f64, sigma: Option<f64>, tol: f64, max_iteration: usize) -> (f64, usize, bool)
+where
+    G: Fn() -> f64,
+    P: Fn(f64) -> f64,
+    V: Fn(f64) -> f64,
+{
+    let start = guess();
+    if start.is_nan() {
+        return (f64::NAN, 0, false);
+    }
+    let sigma = sigma.filter(|v| v.is_finite() && *v > 0.0).unwrap_or(start);
+    solve_iv(price, vega, market_price, sigma, tol, max_iteration)
+}
+
+/// Solve quote `i` for every contract and write sigma and the iteration count
+/// (-1 when the solver did not converge) into `out` and `iterations`.
+fn run_iv_batch<F>(out: &mut [f64], iterations: &mut [i64], pool: Option<&ThreadPool>, solve: F)
+where
+    F: Fn(usize, f64) -> (f64, usize, bool) + Sync,
+{
+    let write = |i: usize, o: &mut f64, n: &mut i64| {
+        let (sigma, count, converged) = solve(i, *o);
+        *o = sigma;
+        *n = if converged { count as i64 } else { -1 };
+    };
+    match pool {
+        None => out.iter_mut().zip(iterations.iter_mut()).enumerate().for_each(|(i, (o, n))| write(i, o, n)),
+        Some(pool) => pool.install(|| {
+            out.par_chunks_mut(PARALLEL_CHUNK)
+                .zip(iterations.par_chunks_mut(PARALLEL_CHUNK))
+                .enumerate()
+                .for_each(|(c, (out_chunk, iterations_chunk))| {
+                    for (j, (o, n)) in out_chunk.iter_mut().zip(iterations_chunk.iter_mut()).enumerate() {
+                        write(c * PARALLEL_CHUNK + j, o, n);
+                    }
+                })
+        }),
+    }
+}
+
+macro_rules! iv_pyfunction {
+    ($iv:ident, $batch:ident, $price:ident, $vega:ident, $guess:ident, $sign:expr, $spot:ident) => {
+        #[pyfunction]
+        #[pyo3(signature = ($spot, k, t, r, market_price, sigma=None, tol=1e-8, max_iteration=100))]
+        fn $iv($spot: f64, k: f64, t: f64, r: f64, market_price: f64, sigma: Option<f64>, tol: f64, max_iteration: usize) -> (f64, usize, bool) {
+            let probe = probe!(stringify!($iv));
+            let result = solve_quote(
+                || $guess($spot, k, t, r, market_price, $sign),
+                |v| $price($spot, k, t, r, v),
+                |v| $vega($spot, k, t, r, v),
+                market_price, sigma, tol, max_iteration,
+            );
+            if let Some(probe) = probe {
+                probe.quote(result.1, result.2);
+                probe.finish(1);
+            }
+            result
+        }
+
+        /// Batch form; finite positive values already in `out` are used as starting points.
+        #[pyfunction]
+        #[pyo3(signature = ($spot, k, t, r, market_price, out, iterations, tol=1e-8, max_iteration=100, threads=1))]
+        fn $batch(
+            py: Python,
+            $spot: PyReadonlyArray1<f64>,
+            k: PyReadonlyArray1<f64>,
+            t: PyReadonlyArray1<f64>,
+            r: PyReadonlyArray1<f64>,
+            market_price: PyReadonlyArray1<f64>,
+            mut out: PyReadwriteArray1<f64>,
+            mut iterations: PyReadwriteArray1<i64>,
+            tol: f64,
+            max_iteration: usize,
+            threads: usize,
+        ) -> PyResult<()> {
+            let ($spot, k, t, r, market_price) = ($spot.as_slice()?, k.as_slice()?, t.as_slice()?, r.as_slice()?, market_price.as_slice()?);
+            let out = out.as_slice_mut()?;
+            let iterations = iterations.as_slice_mut()?;
+            if iterations.len() != out.len() {
+                return Err(PyValueError::new_err("iterations must have the same length as out"));
+            }
+            check_lengths(out.len(), &[$spot.len(), k.len(), t.len(), r.len(), market_price.len()])?;
+            let pool = thread_pool(threads, out.len())?;
+            let probe = probe!(stringify!($batch));
+            py.allow_threads(|| {
+                run_iv_batch(out, iterations, pool.as_deref(), |i, start| {
+                    let ($spot, k, t, r, market_price) = (at($spot, i), at(k, i), at(t, i), at(r, i), at(market_price, i));
+                    solve_quote(
+                        || $guess($spot, k, t, r, market_price, $sign),
+                        |v| $price($spot, k, t, r, v),
+                        |v| $vega($spot, k, t, r, v),
+                        market_price, Some(start), tol, max_iteration,
+                    )
+                })
+            });
+            if let Some(probe) = probe {
+                probe.quotes(iterations);
+                probe.finish(iterations.len());
+            }
+            Ok(())
+        }
+    };
+}
+
+iv_pyfunction!(bs_call_iv, bs_call_iv_batch, bs_call_price, bs_vega, bs_iv_guess, 1.0, s);
+iv_pyfunction!(bs_put_iv, bs_put_iv_batch, bs_put_price, bs_vega, bs_iv_guess, -1.0, s);
+iv_pyfunction!(bk_call_iv, bk_call_iv_batch, bk_call_price, bk_vega, bk_iv_guess, 1.0, f);
+iv_pyfunction!(bk_put_iv, bk_put_iv_batch, bk_put_price, bk_vega, bk_iv_guess, -1.0, f);
+iv_pyfunction!(bach_call_iv, bach_call_iv_batch, bach_call_price, bach_vega, bach_iv_guess_discounted, 1.0, f);
+iv_pyfunction!(bach_put_iv, bach_put_iv_batch, bach_put_price, bach_vega, bach_iv_guess_discounted, -1.0, f);
+
 // Register the new functions in the module
 #[pymodule]
 fn optrush(_py: Python, m: &PyModule) -> PyResult<()> {
+    INSTRUMENT.store(std::env::var("OPTRUSH_INSTRUMENT").map_or(false, |v| !v.is_empty() && v != "0"), Ordering::Relaxed);
+    m.add_function(wrap_pyfunction!(instrumentation, m)?)?;
+    m.add_function(wrap_pyfunction!(instrumentation_reset, m)?)?;
+    m.add_function(wrap_pyfunction!(instrumentation_snapshot, m)?)?;
     m.add_function(wrap_pyfunction!(norm_cdf, m)?)?;
     m.add_function(wrap_pyfunction!(norm_pdf, m)?)?;
     m.add_function(wrap_pyfunction!(bs_d1, m)?)?;
@@ -304,6 +1111,8 @@ fn optrush(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(bs_put_theta, m)?)?;
     m.add_function(wrap_pyfunction!(bs_call_rho, m)?)?;
     m.add_function(wrap_pyfunction!(bs_put_rho, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_greeks, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_full_greeks, m)?)?;
     m.add_function(wrap_pyfunction!(bk_d1, m)?)?;
     m.add_function(wrap_pyfunction!(bk_d2, m)?)?;
     m.add_function(wrap_pyfunction!(bk_call_price, m)?)?;
@@ -316,6 +1125,8 @@ fn optrush(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(bk_put_theta, m)?)?;
     m.add_function(wrap_pyfunction!(bk_call_rho, m)?)?;
     m.add_function(wrap_pyfunction!(bk_put_rho, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_greeks, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_full_greeks, m)?)?;
     m.add_function(wrap_pyfunction!(bach_d, m)?)?;
     m.add_function(wrap_pyfunction!(bach_call_price, m)?)?;
     m.add_function(wrap_pyfunction!(bach_put_price, m)?)?;
@@ -327,6 +1138,58 @@ fn optrush(_py: Python, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(bach_put_theta, m)?)?;
     m.add_function(wrap_pyfunction!(bach_call_rho, m)?)?;
     m.add_function(wrap_pyfunction!(bach_put_rho, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_greeks, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_full_greeks, m)?)?;
     m.add_function(wrap_pyfunction!(implied_volatility, m)?)?;
+    m.add_function(wrap_pyfunction!(norm_cdf_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(norm_pdf_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_call_price_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_put_price_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_call_delta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_put_delta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_gamma_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_vega_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_call_theta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_put_theta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_call_rho_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_put_rho_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_greeks_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_full_greeks_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_call_price_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_put_price_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_call_delta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_put_delta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_gamma_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_vega_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_call_theta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_put_theta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_call_rho_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_put_rho_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_greeks_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_full_greeks_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_call_price_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_put_price_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_call_delta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_put_delta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_gamma_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_vega_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_call_theta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_put_theta_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_call_rho_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_put_rho_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_greeks_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_full_greeks_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_call_iv, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_call_iv_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_put_iv, m)?)?;
+    m.add_function(wrap_pyfunction!(bs_put_iv_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_call_iv, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_call_iv_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_put_iv, m)?)?;
+    m.add_function(wrap_pyfunction!(bk_put_iv_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_call_iv, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_call_iv_batch, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_put_iv, m)?)?;
+    m.add_function(wrap_pyfunction!(bach_put_iv_batch, m)?)?;
     Ok(())
 }
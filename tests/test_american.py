@@ -0,0 +1,62 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import american
+from optrush import vectorized     # The NumPy array functions
+
+import numpy as np
+import pytest
+
+
+def make_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (100.0, rng.uniform(70, 130, n), rng.uniform(0.05, 1, n), rng.uniform(0, 0.1, n), rng.uniform(0.1, 0.5, n),
+            rng.random(n) < 0.5, rng.uniform(0, 0.06, n))
+
+def test_hull_put():
+    # Hull's American put example: S = K = 50, r = 10%, sigma = 40%, five months
+    for method, steps in [('crr', 2000), ('lr', 501)]:
+        assert american.lattice_price(50, 50, 5 / 12, 0.1, 0.4, is_call=False, steps=steps, method=method) \
+            == pytest.approx(4.2842, abs=1e-3)
+    assert american.baw_price(50, 50, 5 / 12, 0.1, 0.4, is_call=False) == pytest.approx(4.2842, abs=2e-3)
+
+def test_baw_reference_values():
+    # Barone-Adesi and Whaley on futures (q = r): K = 100, t = 0.1, r = 10%, sigma = 15%
+    s = np.array([90.0, 100.0, 110.0])
+    assert np.allclose(american.baw_price(s, 100, 0.1, 0.1, 0.15, q=0.1), [0.0206, 1.8769, 10.0061], atol=1e-4)
+    assert np.allclose(american.baw_price(s, 100, 0.1, 0.1, 0.15, is_call=False, q=0.1), [10.0, 1.8769, 0.0410], atol=1e-4)
+
+def test_european_limits_and_bounds():
+    s, k, t, r, sigma, is_call, q = make_inputs(200)
+    european = vectorized.bs_greeks(s, k, t, r, sigma, is_call=is_call).price
+    assert np.allclose(american.lattice_price(s, k, t, r, sigma, is_call, steps=301, method='lr', american=False),
+                       european, atol=1e-4)
+    calls = np.ones_like(k, dtype=bool)
+    assert np.array_equal(american.baw_price(s, k, t, r, sigma, calls), vectorized.bs_call_price(s, k, t, r, sigma))
+    assert np.allclose(american.lattice_price(s, k, t, r, sigma, calls, steps=301, method='lr'),
+                       vectorized.bs_call_price(s, k, t, r, sigma), atol=1e-4)
+    intrinsic = np.maximum(np.where(is_call, s - k, k - s), 0)
+    lattice = american.Lattice(101)
+    baw = american.baw_price(s, k, t, r, sigma, is_call, q=q)
+    tree = lattice.price(s, k, t, r, sigma, is_call, q=q)
+    assert (baw >= intrinsic - 1e-12).all() and (tree >= intrinsic - 1e-12).all()
+    assert (tree >= lattice.price(s, k, t, r, sigma, is_call, q=q, american=False)).all()
+    assert (baw >= american.lattice_price(s, k, t, r, sigma, is_call, q=q, steps=301, method='lr', american=False) - 1e-3).all()
+
+def test_engines_agree():
+    s, k, t, r, sigma, is_call, q = make_inputs(100)
+    reference = american.lattice_price(s, k, t, r, sigma, is_call, q=q, steps=801, method='lr')
+    assert np.abs(american.lattice_price(s, k, t, r, sigma, is_call, q=q, steps=400) - reference).max() < 0.02
+    assert np.abs(american.baw_price(s, k, t, r, sigma, is_call, q=q) - reference).max() < 0.15
+
+def test_lattice_reuse_and_shapes():
+    s, k, t, r, sigma, is_call, q = make_inputs(50)
+    lattice = american.Lattice(101, 'lr', chunk=16)
+    assert lattice.steps == 101 and american.Lattice(100, 'lr').steps == 101
+    whole = american.lattice_price(s, k, t, r, sigma, is_call, q=q, steps=101, method='lr')
+    assert np.allclose(lattice.price(s, k, t, r, sigma, is_call, q=q), whole, rtol=1e-13)
+    assert np.allclose(lattice.price(s, k[:3], t[:3], r[:3], sigma[:3], is_call[:3], q=q[:3]), whole[:3], rtol=1e-13)
+    grid = lattice.price(100.0, k[:6].reshape(2, 3), 0.5, 0.02, 0.3, is_call=False)
+    assert grid.shape == (2, 3) and american.baw_price(100.0, 100.0, 0.5, 0.02, 0.3).shape == ()
+    with pytest.raises(ValueError):
+        american.Lattice(100, 'trinomial')
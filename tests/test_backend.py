@@ -0,0 +1,125 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import backend, models
+from optrush import vectorized     # The NumPy array functions
+
+import json
+import subprocess
+import numpy as np
+import pytest
+
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def run(code, **env):
+    child = subprocess.run([sys.executable, '-c', f'import sys; sys.path.insert(0, {ROOT!r})\n{code}'],
+                           capture_output=True, text=True, env=dict(os.environ, **env))
+    assert child.returncode == 0, child.stderr
+    return child.stdout.split()
+
+def test_functions_exist_in_models():
+    assert all(callable(getattr(models, name)) for name in backend.FUNCTIONS)
+    assert backend.name() in ('python', 'rust')
+    assert backend.bs_greeks(100, 100, 1, 0.05, 0.1)[0] == pytest.approx(models.bs_call_price(100, 100, 1, 0.05, 0.1))
+    assert backend.bs_call_iv(100, 100, 1, 0.05, 6.8).converged
+    with pytest.raises(AttributeError):
+        backend.bs_call_vanna
+
+@pytest.fixture
+def thresholds():
+    saved = dict(backend.thresholds)
+    yield backend.thresholds
+    backend.thresholds.update(saved)
+
+def test_routes_agree(thresholds):
+    k = np.linspace(80, 120, 40).reshape(4, 10)
+    is_call = np.arange(40).reshape(4, 10) % 3 == 0
+    price = vectorized.bk_greeks(100.0, k, 1.0, 0.02, 0.25, is_call=is_call).price
+    expected = vectorized.bk_greeks(100.0, k, 1.0, 0.02, 0.25, is_call=is_call)
+    for config, path in [({'array': 100, 'parallel': None}, 'loop'), ({'array': 16, 'parallel': None}, 'array'),
+                         ({'array': 0, 'parallel': 10, 'threads': 3}, 'parallel')]:
+        backend.configure(**config)
+        assert backend.route(100.0, k, 1.0, 0.02, 0.25, is_call=is_call) == path
+        greeks = backend.bk_greeks(100.0, k, 1.0, 0.02, 0.25, is_call=is_call)
+        assert greeks.shape == k.shape and isinstance(greeks, np.recarray), path
+        for name in expected.dtype.names:
+            assert np.allclose(greeks[name], expected[name], rtol=1e-12), (path, name)
+        assert np.allclose(backend.bach_call_price(100.0, k, 1.0, 0.02, 20.0), vectorized.bach_call_price(100.0, k, 1.0, 0.02, 20.0))
+        full = backend.bs_full_greeks(100.0, k, 1.0, 0.02, 0.25, is_call=is_call)
+        assert full.shape == k.shape and full.dtype == vectorized.FULL_GREEKS_DTYPE, path
+        assert np.allclose(full.ultima, vectorized.bs_full_greeks(100.0, k, 1.0, 0.02, 0.25, is_call=is_call).ultima)
+        iv = backend.bk_put_iv(100.0, k, 1.0, 0.02, vectorized.bk_put_price(100.0, k, 1.0, 0.02, 0.25), sigma=0.3)
+        assert iv.shape == k.shape and iv.converged.all() and np.allclose(iv.sigma, 0.25, rtol=1e-9), path
+    assert backend.route(100.0, 100, 1.0, np.float64(0.02), 0.25) == 'scalar'
+    assert isinstance(backend.bs_greeks(100.0, 100, 1.0, 0.02, 0.25, is_call=False), models.Greeks)
+    assert isinstance(backend.bach_full_greeks(100.0, 100, 1.0, 0.02, 20.0), models.FullGreeks)
+    assert backend.implied_volatility(100, 100, 1, 0.05, 6.8, models.bs_call_price, models.bs_vega) == \
+        pytest.approx(models.bs_call_iv(100, 100, 1, 0.05, 6.8).sigma, rel=1e-4)
+
+def test_iv_default_tol(thresholds):
+    price = models.bs_call_price(100, 105, 1, 0.02, 0.3)
+    assert backend.bs_call_iv(100, 105, 1, 0.02, price, tol=None).sigma == pytest.approx(0.3, rel=1e-8)
+    for array in (16, 0):     # loop and array routes
+        backend.configure(array=array, parallel=None)
+        iv = backend.bs_call_iv(100, np.array([95.0, 105.0, 115.0]), 1, 0.02,
+                                vectorized.bs_call_price(100, np.array([95.0, 105.0, 115.0]), 1, 0.02, 0.3), tol=None)
+        assert iv.converged.all() and np.allclose(iv.sigma, 0.3, rtol=1e-8)
+
+def test_batch_inputs():
+    k = np.linspace(80, 120, 12).reshape(3, 4)
+    inputs, keywords, shape = backend._batch_inputs((100.0, k, np.ones((3, 1)), 0.02, 0.25), {'is_call': True, 'sigma': None})
+    assert shape == (3, 4) and [a.shape for a in inputs] == [(1,), (12,), (12,), (1,), (1,)]
+    assert np.shares_memory(inputs[1], k) and keywords['is_call'].shape == (1,) and 'sigma' not in keywords
+
+def test_positional_options(thresholds, monkeypatch):
+    # Stand-ins with the extension's batch signatures, so the Rust route is taken without the extension
+    def greeks_batch(s, k, t, r, sigma, is_call, out, threads):
+        greeks = vectorized.bs_greeks(s, k, t, r, sigma, is_call=is_call)
+        out[:] = np.broadcast_to(greeks, out.shape[:1]).view(np.float64).reshape(out.shape)
+    def iv_batch(f, k, t, r, market_price, out, iterations, tol, max_iterations, threads):
+        start = None if np.isnan(out).any() else out.copy()
+        iv = vectorized.bk_put_iv(f, k, t, r, market_price, sigma=start, tol=tol, max_iterations=max_iterations)
+        out[:], iterations[:] = iv.sigma, np.where(iv.converged, iv.iterations, -1)
+    monkeypatch.setattr(backend, '_batch_kernel', {'bs_greeks': greeks_batch, 'bk_put_iv': iv_batch}.get)
+    backend.configure(array=0, parallel=None)
+    k = np.linspace(80, 120, 12)
+    is_call = np.arange(12) % 2 == 0
+    assert backend.route(100.0, k, 1.0, 0.02, 0.25, is_call) == 'array'
+    greeks = backend.bs_greeks(100.0, k, 1.0, 0.02, 0.25, is_call)
+    assert np.array_equal(greeks, backend.bs_greeks(100.0, k, 1.0, 0.02, 0.25, is_call=is_call))
+    assert np.array_equal(greeks.delta, vectorized.bs_greeks(100.0, k, 1.0, 0.02, 0.25, is_call=is_call).delta)
+    price = vectorized.bk_put_price(100.0, k, 1.0, 0.02, 0.25)
+    iv = backend.bk_put_iv(100.0, k, 1.0, 0.02, price, 0.3)
+    assert iv.converged.all() and np.allclose(iv.sigma, 0.25, rtol=1e-9)
+    assert np.array_equal(iv.iterations, backend.bk_put_iv(100.0, k, 1.0, 0.02, price, sigma=0.3).iterations)
+    assert np.array_equal(iv.sigma, backend.bk_put_iv(f=100.0, k=k, t=1.0, r=0.02, market_price=price, sigma=0.3).sigma)
+    with pytest.raises(TypeError):
+        backend.bs_greeks(100.0, k, 1.0, 0.02)
+
+def test_configure(thresholds, tmp_path):
+    path = tmp_path / 'dispatch.json'
+    path.write_text(json.dumps({'meta': {}, 'thresholds': {'array': 4, 'parallel': None}}))
+    assert backend.configure(path, threads=2) == {'array': 4, 'parallel': None, 'threads': 2}
+    with pytest.raises(KeyError):
+        backend.configure(batch=10)
+
+def test_forced_backend():
+    assert run('from optrush import backend; print(backend.name())', OPTRUSH_BACKEND='python') == ['python']
+    if backend.name() == 'python':
+        child = subprocess.run([sys.executable, '-c', 'from optrush import backend; backend.bs_gamma(100.0, 100.0, 1.0, 0.0, 0.2)'], cwd=ROOT,
+                               capture_output=True, text=True, env=dict(os.environ, OPTRUSH_BACKEND='rust'))
+        assert child.returncode and "No module named 'optrush.optrush'" in child.stderr
+
+def test_imports_are_lazy():
+    assert run('import optrush.models, optrush.backend; print("statistics" in sys.modules, "scipy" in sys.modules)') \
+        == ['False', 'False']
+    assert run('import optrush.vectorized; print("scipy" in sys.modules)') == ['False']
+
+def test_without_scipy():
+    code = '''import numpy as np
+from optrush import vectorized
+iv = vectorized.bs_iv(100.0, np.array([80.0, 100.0, 130.0]), 1.0, 0.02, vectorized.bs_call_price(100.0, np.array([80.0, 100.0, 130.0]), 1.0, 0.02, 0.3))
+print(vectorized.special_functions()[0].__name__, "scipy" in sys.modules, np.allclose(iv.sigma, 0.3, rtol=1e-12))'''
+    assert run(code, OPTRUSH_SCIPY='0') == ['_numpy_ndtr', 'False', 'True']
@@ -0,0 +1,75 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import backend, models
+from optrush.cache import PricingCache
+
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pytest
+
+
+def test_hits_and_values():
+    cache = PricingCache()
+    for _ in range(3):
+        assert cache.bs_call_price(100.0, 105, 0.5, 0.02, 0.2) == models.bs_call_price(100.0, 105, 0.5, 0.02, 0.2)
+        greeks = cache.bk_greeks(100.0, 105.0, 0.5, 0.02, 0.2, is_call=False)
+        assert greeks == models.bk_greeks(100.0, 105.0, 0.5, 0.02, 0.2, is_call=False)
+    cache.bk_greeks(100.0, 105.0, 0.5, 0.02, 0.2, is_call=True)
+    cache.bs_call_price(np.float64(100.0 * (1 + 1e-15)), 105, 0.5, 0.02, 0.2)     # quantized onto the first key
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (5, 3, 3) and stats.hit_rate == 5 / 8
+    assert cache.quantize(0.1) == cache.quantize(0.1 + 1e-17) and cache.quantize(0.1) != cache.quantize(0.1 + 1e-9)
+    cache.bs_call_price(100.0, np.array([100.0, 105.0]), 0.5, 0.02, 0.2)
+    assert cache.stats().bypassed == 1
+    cache.clear()
+    assert cache.stats() == (0, 0, 0, 0, 0, 0, 0)
+    with pytest.raises(AttributeError):
+        cache.bs_call_vanna
+    with pytest.raises(ValueError):
+        PricingCache(maxsize=0)
+
+def test_lru_and_ttl():
+    now = [0.0]
+    cache = PricingCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    for k in (90.0, 100.0, 90.0, 110.0):
+        cache.bs_gamma(100.0, k, 1.0, 0.0, 0.2)
+    assert cache.stats().evictions == 1 and cache.stats().hits == 1
+    cache.bs_gamma(100.0, 90.0, 1.0, 0.0, 0.2)          # 100 was least recently used
+    assert cache.stats().hits == 2
+    now[0] = 10.5
+    cache.bs_gamma(100.0, 90.0, 1.0, 0.0, 0.2)
+    assert cache.stats().expirations == 1 and len(cache) == 2
+
+def test_iv_warm_start():
+    cache = PricingCache()
+    iv = cache.bk_put_iv(100.0, 110.0, 1.0, 0.01, models.bk_put_price(100.0, 110.0, 1.0, 0.01, 0.25))
+    assert iv.converged and cache.stats().warm_starts == 0
+    price = models.bk_put_price(100.5, 110.0, 1.0, 0.01, 0.25)
+    warm = cache.bk_put_iv(100.5, 110.0, 1.0, 0.01, price)
+    cold = backend.bk_put_iv(100.5, 110.0, 1.0, 0.01, price)
+    assert cache.stats().warm_starts == 1 and warm.iterations <= cold.iterations
+    assert warm.sigma == pytest.approx(0.25, rel=1e-10)
+    assert cache.bk_put_iv(100.5, 110.0, 1.0, 0.01, price, sigma=0.5) is warm     # sigma is not part of the key
+
+def test_iv_positional_sigma():
+    cache = PricingCache()
+    cache.bs_call_iv(100.0, 110.0, 1.0, 0.01, models.bs_call_price(100.0, 110.0, 1.0, 0.01, 0.3))
+    price = models.bs_call_price(100.5, 110.0, 1.0, 0.01, 0.3)
+    iv = cache.bs_call_iv(100.5, 110.0, 1.0, 0.01, price, 0.3)     # a given start is used, not warm-started
+    assert iv.sigma == pytest.approx(0.3, rel=1e-10) and cache.stats().warm_starts == 0
+    assert cache.bs_call_iv(100.5, 110.0, 1.0, 0.01, price, 0.5) is iv
+    assert cache.bs_call_iv(s=100.5, k=110.0, t=1.0, r=0.01, market_price=price) is iv
+    assert cache.key('bs_call_iv', (100.5, 110.0, 1.0, 0.01, price, 0.3), {}) == \
+        cache.key('bs_call_iv', (100.5, 110.0), {'t': 1.0, 'r': 0.01, 'market_price': price, 'tol': 1e-10})
+
+def test_threads():
+    strikes = [80.0 + i for i in range(100)]
+    for maxsize in (50, 200):
+        cache = PricingCache(maxsize=maxsize)
+        with ThreadPoolExecutor(4) as pool:
+            prices = list(pool.map(lambda k: cache.bach_call_price(100.0, k, 1.0, 0.0, 20.0), strikes * 5))
+        assert prices == [models.bach_call_price(100.0, k, 1.0, 0.0, 20.0) for k in strikes * 5]
+        stats = cache.stats()
+        assert stats.hits + stats.misses == 500 and stats.size == min(maxsize, 100)
+        assert stats.evictions <= max(stats.misses - maxsize, 0)
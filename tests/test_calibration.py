@@ -0,0 +1,129 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import calibration
+from optrush import vectorized     # The NumPy array functions
+
+import numpy as np
+import pytest
+
+
+def make_smiles(n, strikes=15, seed=0):
+    rng = np.random.default_rng(seed)
+    forward, t = rng.uniform(50, 150, n), rng.uniform(0.05, 2, n)
+    x = np.linspace(-0.5, 0.4, strikes) * np.sqrt(t)[:, None]
+    return forward, forward[:, None] * np.exp(x), t, x, rng
+
+def svi_smiles(n, seed=0):
+    forward, strike, t, x, rng = make_smiles(n, seed=seed)
+    params = np.stack([rng.uniform(0.01, 0.04, n) * t, rng.uniform(0.05, 0.2, n) * np.sqrt(t), rng.uniform(-0.7, 0, n),
+                       rng.uniform(-0.05, 0.05, n), rng.uniform(0.05, 0.3, n)], axis=1)
+    w = calibration.svi_total_variance(x, *params.T[..., None])
+    return forward, strike, t, np.sqrt(w / t[:, None]), params
+
+def sabr_smiles(n, beta=0.5, seed=0):
+    forward, strike, t, _, rng = make_smiles(n, seed=seed)
+    params = np.stack([rng.uniform(0.1, 0.4, n) * forward ** (1 - beta), rng.uniform(-0.6, 0.3, n), rng.uniform(0.2, 1, n)], axis=1)
+    vol = calibration.sabr_vol(forward[:, None], strike, t[:, None], params[:, :1], beta, params[:, 1:2], params[:, 2:])
+    return forward, strike, t, vol, params
+
+def test_svi_recovers_parameters():
+    forward, strike, t, vol, params = svi_smiles(500)
+    fit = calibration.fit_svi(forward, strike, t, vol)
+    assert fit.shape == (500,) and fit.converged.all()
+    assert np.all(fit.rmse < 1e-9)
+    fitted = calibration.svi_total_variance(np.log(strike / forward[:, None]), *(fit[name][:, None] for name in calibration.SVI_PARAMS))
+    assert np.allclose(fitted, vol ** 2 * t[:, None], rtol=0, atol=1e-9)
+    assert np.mean(np.all(np.isclose(np.stack([fit[name] for name in calibration.SVI_PARAMS], axis=1), params, atol=1e-4), axis=1)) > 0.95
+
+def test_sabr_recovers_parameters():
+    for beta in (0.0, 0.5, 1.0):
+        forward, strike, t, vol, params = sabr_smiles(500, beta)
+        fit = calibration.fit_sabr(forward, strike, t, vol, beta=beta)
+        assert fit.converged.all() and np.all(fit.rmse < 1e-10)
+        assert np.allclose(np.stack([fit.alpha, fit.rho, fit.nu], axis=1), params, atol=1e-7)
+
+def test_sabr_vol_atm_limit():
+    # Hagan's formula at the money, and continuity across it
+    f, t, alpha, beta, rho, nu = 100.0, 1.5, 2.0, 0.5, -0.4, 0.7
+    atm = alpha / f ** (1 - beta) * (1 + ((1 - beta) ** 2 / 24 * alpha ** 2 / f ** (2 - 2 * beta)
+                                          + rho * beta * nu * alpha / (4 * f ** (1 - beta)) + (2 - 3 * rho ** 2) / 24 * nu ** 2) * t)
+    assert calibration.sabr_vol(f, f, t, alpha, beta, rho, nu) == pytest.approx(atm, rel=1e-14)
+    near = calibration.sabr_vol(f, f * (1 + np.array([-1e-6, 1e-6])), t, alpha, beta, rho, nu)
+    assert np.allclose(near, atm, rtol=1e-6)
+
+def test_jacobians():
+    # The SABR Jacobian by complex steps, and the SVI one by Kaufman's projection, against central differences
+    forward, strike, t, vol, params = sabr_smiles(20)
+    model = calibration._sabr_model(forward[:, None], strike, t[:, None], 0.5)
+    rows = np.arange(20)
+    _, jacobian = model(params, rows)
+    for i, h in enumerate((1e-6, 1e-6, 1e-6)):
+        up, down = params.copy(), params.copy()
+        up[:, i] += h
+        down[:, i] -= h
+        assert np.allclose(jacobian[..., i], (model(up, rows)[0] - model(down, rows)[0]) / (2 * h), rtol=1e-6, atol=1e-8)
+    forward, strike, t, vol, params = svi_smiles(20)
+    x = np.log(strike / forward[:, None])
+    w = (vol * (1 + 0.01 * np.sin(7 * x))) ** 2 * t[:, None]
+    model = calibration._svi_model(x, w, np.ones_like(w))
+    _, jacobian = model(params[:, 3:], rows)
+    up, down = params[:, 3:].copy(), params[:, 3:].copy()
+    up[:, 1] += 1e-7
+    down[:, 1] -= 1e-7
+    central = (model(up, rows)[0] - model(down, rows)[0]) / 2e-7
+    # Kaufman's approximation drops a term proportional to the residual, which is small here
+    assert np.allclose(jacobian[..., 1], central, rtol=0, atol=0.05 * np.abs(central).max())
+
+def test_warm_start():
+    forward, strike, t, vol, _ = sabr_smiles(300)
+    noise = np.random.default_rng(1).normal(0, 1e-3, vol.shape)
+    for fit_function in (calibration.fit_svi, calibration.fit_sabr):
+        cold = fit_function(forward, strike, t, vol * (1 + noise))
+        moved = vol * (1 + noise) * 1.002
+        warm = fit_function(forward, strike, t, moved, initial=cold)
+        again = fit_function(forward, strike, t, moved)
+        assert warm.converged.all() and again.converged.all()
+        assert warm.iterations.sum() < again.iterations.sum()
+        assert np.allclose(warm.rmse, again.rmse, rtol=1e-3, atol=1e-9)
+        # A plain parameter array works too, and NaN rows fall back to the default guess
+        names = calibration.SVI_PARAMS if fit_function is calibration.fit_svi else calibration.SABR_PARAMS
+        initial = np.stack([cold[name] for name in names], axis=1)
+        initial[0] = np.nan
+        assert np.allclose(fit_function(forward, strike, t, moved, initial=initial).rmse, warm.rmse, rtol=1e-3, atol=1e-9)
+
+def test_ragged_weights_and_shapes():
+    forward, strike, t, vol, params = sabr_smiles(6)
+    strike[1, 10:] = np.nan
+    vol[2, :3] = np.nan
+    strike[3] = vol[4] = np.nan
+    weights = np.ones_like(vol)
+    weights[5, ::2] = 0
+    for fit_function in (calibration.fit_svi, calibration.fit_sabr):
+        fit = fit_function(forward, strike, t, vol, weights=weights)
+        assert np.all(np.isnan(fit.rmse[3:5])) and not fit.converged[3:5].any()
+        assert fit.converged[[0, 1, 2, 5]].all() and np.all(np.isfinite(fit.rmse[[0, 1, 2, 5]]))
+    fit = calibration.fit_sabr(forward, strike, t, vol, weights=weights)
+    assert np.allclose(fit.alpha[[0, 1, 2, 5]], params[[0, 1, 2, 5], 0])
+    # Leading dimensions are kept; a scalar forward and expiry broadcast over them
+    grid = calibration.fit_sabr(100.0, np.full((2, 3, 5), [80, 90, 100, 110, 120.0]), 1.0,
+                                calibration.sabr_vol(100.0, np.array([80, 90, 100, 110, 120.0]), 1.0, 2.0, 0.5, -0.3, 0.6))
+    assert grid.shape == (2, 3) and np.allclose(grid.alpha, 2.0) and np.allclose(grid.nu, 0.6)
+
+def test_threads_agree():
+    forward, strike, t, vol, _ = svi_smiles(101)
+    for fit_function in (calibration.fit_svi, calibration.fit_sabr):
+        single = fit_function(forward, strike, t, vol)
+        threaded = fit_function(forward, strike, t, vol, threads=4)
+        for name in single.dtype.names:
+            assert np.array_equal(single[name], threaded[name])
+
+def test_from_prices():
+    # Quotes inverted by the vectorized solver, then fitted
+    forward, strike, t, vol, params = sabr_smiles(50)
+    is_call = strike >= forward[:, None]
+    price = np.where(is_call, vectorized.bk_call_price(forward[:, None], strike, t[:, None], 0.03, vol),
+                     vectorized.bk_put_price(forward[:, None], strike, t[:, None], 0.03, vol))
+    implied = vectorized.bk_iv(forward[:, None], strike, t[:, None], 0.03, price, is_call=is_call).sigma
+    fit = calibration.fit_sabr(forward, strike, t, implied)
+    assert np.allclose(np.stack([fit.alpha, fit.rho, fit.nu], axis=1), params, atol=1e-5)
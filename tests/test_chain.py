@@ -0,0 +1,62 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import vectorized     # The NumPy array functions
+from optrush.chain import PreparedChain
+
+import itertools
+import numpy as np
+import pytest
+
+
+GRID = np.array(list(itertools.product([60, 90, 100, 110, 150], [0.05, 0.5, 2], [0, 0.05], [0.1, 0.3], [0, 1])), dtype=float)
+K, T, R, SIGMA, IS_CALL = GRID[:, 0], GRID[:, 1], GRID[:, 2], GRID[:, 3], GRID[:, 4].astype(bool)
+SCALE = {'bs': 1, 'bk': 1, 'bach': 100}
+
+
+def expected_greeks(model, spot, sigma):
+    return getattr(vectorized, f'{model}_greeks')(spot, K, T, R, sigma, is_call=IS_CALL)
+
+def test_matches_vectorized():
+    for model in ['bs', 'bk', 'bach']:
+        chain = PreparedChain(model, K, T, R, SIGMA * SCALE[model], IS_CALL)
+        for spot in [100, np.linspace(95, 105, len(K))]:
+            expected = expected_greeks(model, spot, SIGMA * SCALE[model])
+            assert np.allclose(chain.price(spot), expected.price, rtol=1e-12, atol=1e-12), model
+            greeks = chain.greeks(spot)
+            for field in expected.dtype.names:
+                assert np.allclose(greeks[field], expected[field], rtol=1e-12, atol=1e-12), (model, field)
+
+def test_dirty_tracking():
+    chain = PreparedChain('bs', K, T, R, SIGMA, IS_CALL)
+    spot = np.full(len(K), 100.0)
+    chain.price(spot)
+    assert chain.recomputed == len(K)
+    chain.price(spot)
+    assert chain.recomputed == 0
+    spot[[3, 7]] = 101.0
+    prices = chain.price(spot)
+    assert chain.recomputed == 2
+    assert np.allclose(prices, expected_greeks('bs', spot, SIGMA).price, rtol=1e-12)
+
+def test_set_sigma_marks_dirty():
+    chain = PreparedChain('bach', K, T, R, SIGMA * 100, IS_CALL)
+    chain.greeks(100)
+    chain.set_sigma(25.0, index=[0, 1])
+    chain.set_sigma(SIGMA[2:5] * 100, index=slice(2, 5))
+    greeks = chain.greeks(100)
+    assert chain.recomputed == 2
+    sigma = SIGMA * 100
+    sigma[:2] = 25.0
+    assert np.allclose(greeks.vega, expected_greeks('bach', 100, sigma).vega, rtol=1e-12)
+    chain.price(100)
+    assert chain.recomputed == 0
+
+def test_results_are_readonly():
+    chain = PreparedChain('bk', K, T, R, SIGMA, IS_CALL)
+    with pytest.raises(ValueError):
+        chain.price(100)[0] = 0.0
+
+def test_unknown_model():
+    with pytest.raises(ValueError):
+        PreparedChain('heston', K, T, R, SIGMA)
@@ -0,0 +1,61 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import backend, instrument, models
+from optrush import vectorized     # The NumPy array functions
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def instrumented():
+    instrument.reset()
+    instrument.enable()
+    yield instrument
+    instrument.disable()
+    instrument.reset()
+
+def test_disabled_records_nothing():
+    instrument.reset()
+    assert not instrument.enabled
+    backend.bs_call_price(100.0, 100.0, 1.0, 0.0, 0.2)
+    assert instrument.snapshot()['backend'] == {}
+
+def test_counts_and_histograms(instrumented):
+    k = np.linspace(80, 120, 50)
+    quotes = vectorized.bk_call_price(100.0, k, 1.0, 0.0, 0.3)
+    quotes[0] = -1.0
+    backend.bk_call_iv(100.0, k, 1.0, 0.0, quotes)
+    backend.bk_call_iv(100.0, 100.0, 1.0, 0.0, float(quotes[25]))
+    backend.bk_greeks(100.0, k, 1.0, 0.0, 0.3)
+    instrument.disable()
+    backend.bk_greeks(100.0, k, 1.0, 0.0, 0.3)
+    stats = instrument.snapshot()['backend']
+    iv = stats['bk_call_iv']
+    assert iv['model'] == 'bk' and iv['calls'] == 2 and iv['elements'] == 51
+    assert iv['nonconverged'] == 1 and sum(iv['iterations']) == 51 and sum(iv['latency']) == 2
+    assert iv['sizes'][1] == 1 and iv['sizes'][6] == 1        # 1 quote, and 50 in [32, 64)
+    assert stats['bk_greeks']['calls'] == 1 and stats['bk_greeks']['seconds'] > 0
+    assert len(iv['latency']) == instrument.LATENCY_BUCKETS and len(iv['iterations']) == instrument.ITERATION_BUCKETS
+    instrument.reset()
+    assert instrument.snapshot()['backend'] == {}
+
+def test_generic_solver(instrumented):
+    sigma = backend.implied_volatility(100, 100, 1, 0.05, 6.8, models.bs_call_price, models.bs_vega)
+    assert isinstance(sigma, float)
+    k = np.array([90.0, 100.0])
+    sigma = backend.implied_volatility(100.0, k, 1.0, 0.05, vectorized.bs_call_price(100.0, k, 1.0, 0.05, 0.2),
+                                       vectorized.bs_call_price, vectorized.bs_vega)
+    assert np.allclose(sigma, 0.2, rtol=1e-4)
+    stats = instrument.snapshot()['backend']['implied_volatility']
+    assert stats['model'] is None and stats['calls'] == 2 and stats['elements'] == 3 and stats['nonconverged'] == 0
+
+def test_record():
+    instrument.reset()
+    instrument.record('bs_call_iv', 1500, 4, np.array([3, 5, 500, 5]), np.array([True, True, False, True]))
+    stats = instrument.snapshot()['backend']['bs_call_iv']
+    assert stats['latency'][11] == 1 and stats['sizes'][3] == 1        # 1500 ns in [1024, 2048)
+    assert stats['iterations'][3] == 1 and stats['iterations'][5] == 2 and stats['iterations'][-1] == 1
+    assert stats['nonconverged'] == 1
+    instrument.reset()
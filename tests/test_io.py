@@ -0,0 +1,63 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import io
+from optrush import vectorized     # The NumPy array functions
+
+import json
+import tracemalloc
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def make_columns(n, seed=0):
+    rng = np.random.default_rng(seed)
+    sigma = rng.uniform(0.1, 0.5, n)
+    columns = {'spot': 100.0, 'strike': rng.uniform(80, 120, n), 'expiry': rng.uniform(0.1, 2, n), 'rate': 0.03,
+               'sigma': sigma, 'is_call': rng.random(n) < 0.5}
+    columns['price'] = vectorized.bs_greeks(100.0, columns['strike'], columns['expiry'], 0.03, sigma,
+                                            is_call=columns['is_call']).price
+    return columns
+
+def test_round_trip(tmp_path):
+    columns = make_columns(1000)
+    chain = io.write_chain(tmp_path / 'chain', pd.DataFrame(columns), chunk_size=300)
+    assert chain.rows == 1000 and set(chain) == set(columns) and not chain.constants
+    assert isinstance(chain['strike'], np.memmap) and chain['is_call'].dtype == bool
+    chain = io.write_chain(tmp_path / 'constants', columns, chunk_size=300)
+    assert chain.constants == {'spot': 100.0, 'rate': 0.03}
+    assert np.array_equal(chain['strike'], columns['strike']) and chain['rate'].shape == (1000,)
+    schema = json.loads((tmp_path / 'constants' / 'schema.json').read_text())
+    assert schema['rows'] == 1000 and schema['columns']['is_call'] == '|b1'
+
+def test_price_and_iv_chunks(tmp_path):
+    columns = make_columns(1000)
+    io.write_chain(tmp_path / 'chain', columns)
+    greeks = io.price_chain(tmp_path / 'chain', tmp_path / 'greeks', 'bs', chunk_size=128)
+    expected = vectorized.bs_greeks(100.0, columns['strike'], columns['expiry'], 0.03, columns['sigma'],
+                                    is_call=columns['is_call'])
+    for name in vectorized.GREEKS_DTYPE.names:
+        assert np.allclose(greeks[name], expected[name], rtol=1e-12, atol=0), name
+    iv = io.implied_vol_chain(tmp_path / 'chain', tmp_path / 'iv', 'bs', chunk_size=128)
+    assert iv.rows == 1000 and iv['converged'].all() and iv['iterations'].dtype == np.int64
+    assert np.allclose(iv['sigma'], columns['sigma'], rtol=1e-8)
+
+def test_peak_memory_is_bounded_by_chunk(tmp_path):
+    n, chunk_size = 400_000, 8192
+    io.write_chain(tmp_path / 'chain', make_columns(n), chunk_size=chunk_size)
+    tracemalloc.start()
+    io.price_chain(tmp_path / 'chain', tmp_path / 'greeks', 'bs', chunk_size=chunk_size)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < n * 8     # less than a single float column of the whole chain
+
+def test_errors(tmp_path):
+    io.write_chain(tmp_path / 'chain', {'strike': np.ones(3)})
+    with pytest.raises(KeyError):
+        io.price_chain(tmp_path / 'chain', tmp_path / 'out', 'bs')
+    with pytest.raises(ValueError):
+        io.price_chain(tmp_path / 'chain', tmp_path / 'out', 'heston')
+    (tmp_path / 'chain' / 'schema.json').write_text('{}')
+    with pytest.raises(ValueError):
+        io.open_chain(tmp_path / 'chain')
@@ -0,0 +1,59 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import ivtable
+from optrush import vectorized     # The NumPy array functions
+
+import numpy as np
+import pytest
+
+
+def make_chain(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    k = rng.uniform(50, 200, n)
+    t = rng.uniform(0.01, 3, n)
+    sigma = rng.uniform(0.05, 1.5, n)
+    is_call = rng.random(n) < 0.5
+    return k, t, sigma, is_call
+
+def test_documented_accuracy():
+    assert ivtable.default_table('black').accuracy['polished'] < 1e-9
+    assert ivtable.default_table('black').accuracy['interpolated'] < 2e-4
+    assert ivtable.default_table('bachelier').accuracy['polished'] < 5e-13
+    assert ivtable.default_table('bachelier').accuracy['interpolated'] < 1e-7
+
+@pytest.mark.parametrize('model', ['bs', 'bk', 'bach'])
+def test_matches_solver(model):
+    k, t, sigma, is_call = make_chain()
+    if model == 'bach':
+        sigma = sigma * 100
+    price = getattr(vectorized, f'{model}_greeks')(100.0, k, t, 0.03, sigma, is_call=is_call).price
+    table = getattr(ivtable, f'{model}_iv')(100.0, k, t, 0.03, price, is_call=is_call)
+    solver = getattr(vectorized, f'{model}_iv')(100.0, k, t, 0.03, price, is_call=is_call)
+    assert table.shape == price.shape and (table.iterations[table.converged] <= 1).mean() > 0.95
+    assert np.array_equal(table.converged, solver.converged)
+    assert np.allclose(table.sigma, solver.sigma, rtol=1e-9, equal_nan=True)
+
+def test_outside_table_falls_back():
+    price = vectorized.bk_call_price(100.0, [100.0, 1e5], 1.0, 0.0, [0.2, 1.0])
+    iv = ivtable.bk_iv(100.0, [100.0, 1e5], 1.0, 0.0, price)
+    assert iv.converged.all() and iv.iterations[0] == 1 and iv.iterations[1] > 1
+    assert np.allclose(iv.sigma, [0.2, 1.0], rtol=1e-9)
+    raw = ivtable.bk_iv(100.0, 110.0, 1.0, 0.0, vectorized.bk_call_price(100.0, 110.0, 1.0, 0.0, 0.2), polish=False)
+    assert raw.iterations == 0 and abs(raw.sigma / 0.2 - 1) < 2e-4
+    assert np.isnan(ivtable.bach_iv(100.0, 90.0, 1.0, 0.0, 5.0).sigma)
+
+def test_save_and_memory_map(tmp_path):
+    tables = {'black': ivtable.BlackIVTable.build(64, 64), 'bachelier': ivtable.BachelierIVTable.build(256)}
+    for kind, table in tables.items():
+        table.save(tmp_path / kind)
+        loaded = ivtable.load(tmp_path / kind)
+        assert isinstance(loaded, type(table)) and isinstance(loaded.keys, np.memmap)
+        assert loaded.accuracy == table.accuracy and loaded.params == table.params
+    x, beta = -np.array([0.0, 0.1, 2.0]), np.array([0.1, 0.2, 0.05])
+    assert np.array_equal(ivtable.load(tmp_path / 'black').lookup(x, beta)[0], tables['black'].lookup(x, beta)[0])
+    nu = np.array([1e-6, 0.5, 100.0])
+    assert np.array_equal(ivtable.load(tmp_path / 'bachelier', None).lookup(nu)[0], tables['bachelier'].lookup(nu)[0])
+    (tmp_path / 'black' / 'header.json').write_text('{"kind": "heston", "version": 1}')
+    with pytest.raises(ValueError):
+        ivtable.load(tmp_path / 'black')
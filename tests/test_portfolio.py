@@ -0,0 +1,69 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import models         # The scalar Python functions
+from optrush import portfolio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+SPOT = {'ES': 5000.0, 'CL': 80.0, 'ZN': 110.0}
+
+
+def make_positions(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    underlying = rng.choice(list(SPOT), n)
+    spot = np.array([SPOT[u] for u in underlying])
+    model = rng.choice(['bs', 'bk', 'bach'], n)
+    return pd.DataFrame({
+        'model': model,
+        'is_call': rng.choice(['C', 'P', 'call', 'put'], n),
+        'underlying': underlying,
+        'strike': spot * rng.uniform(0.8, 1.2, n),
+        'expiry': rng.uniform(0.01, 6, n),
+        'quantity': rng.integers(-50, 50, n),
+        'sigma': rng.uniform(0.1, 0.5, n) * np.where(model == 'bach', spot, 1.0),
+    })
+
+def test_position_greeks_match_scalar():
+    positions = make_positions()
+    greeks = portfolio.position_greeks(positions, SPOT, rate=0.03)
+    for i, row in enumerate(positions.itertuples()):
+        expected = getattr(models, f'{row.model}_greeks')(SPOT[row.underlying], row.strike, row.expiry, 0.03, row.sigma,
+                                                          is_call=row.is_call[0].upper() == 'C')
+        assert np.allclose(greeks.iloc[i].to_numpy(), np.array(expected) * row.quantity, rtol=1e-10, atol=1e-10), i
+
+def test_aggregate_greeks():
+    positions = make_positions()
+    positions['multiplier'] = 10
+    total = portfolio.aggregate_greeks(positions, SPOT, rate={'ES': 0.04, 'CL': 0.03, 'ZN': 0.02})
+    assert total.index.names == ['underlying', 'expiry_bucket']
+    greeks = portfolio.position_greeks(positions, SPOT, rate={'ES': 0.04, 'CL': 0.03, 'ZN': 0.02})
+    assert np.allclose(total.sum().to_numpy(), greeks.sum().to_numpy())
+    es_short = (positions.underlying == 'ES') & (positions.expiry <= 1 / 12)
+    assert np.allclose(total.loc[('ES', '1M')].to_numpy(), greeks[es_short].sum().to_numpy())
+    assert list(total.loc['ES'].index) == [label for _, label in portfolio.EXPIRY_BUCKETS if label in total.loc['ES'].index]
+
+def test_columns_and_dates():
+    positions = make_positions(20)
+    positions['spot'] = positions.underlying.map(SPOT)
+    as_of = pd.Timestamp('2024-01-02')
+    dated = positions.assign(expiry=as_of + pd.to_timedelta(positions.expiry * 365, unit='D'))
+    expected = portfolio.position_greeks(positions)
+    assert np.allclose(portfolio.position_greeks(dated, as_of=as_of).to_numpy(), expected.to_numpy(), rtol=1e-9)
+    with pytest.raises(ValueError):
+        portfolio.position_greeks(dated)
+
+def test_errors():
+    positions = make_positions(20)
+    with pytest.raises(KeyError):
+        portfolio.position_greeks(positions, {'ES': 5000.0})
+    with pytest.raises(ValueError):
+        portfolio.position_greeks(positions)
+    with pytest.raises(ValueError):
+        portfolio.position_greeks(positions.assign(model='heston'), SPOT)
+    for missing in (None, np.nan):
+        with pytest.raises(ValueError, match='unknown model'):
+            portfolio.position_greeks(positions.assign(model=positions.model.where(positions.index != 3, missing)), SPOT)
@@ -12,6 +12,31 @@ def test_erf_1e4():          assert math.erf(1e4) == 1.
 def test_cdf_0():            assert models.norm_cdf(0) == 0.5
 def test_cdf_1():            assert f'{models.norm_cdf(1):.2f}' == '0.84'
 def test_cdf_1e4():          assert models.norm_cdf(1e4) == 1.
+def test_cdf_array():
+    x = [-37, -1, 0, 1.5, 1e4]
+    for function in (models.norm_cdf, models.norm_pdf):
+        assert all(math.isclose(a, function(v), rel_tol=1e-12) for a, v in zip(function(x), x, strict=True))
+
+
+# Reference values from mpmath at 30 significant digits.
+NORMAL_TAIL = [(-37, 5.725571222524577e-300, 2.1200065515246056e-298),
+               (-20, 2.7536241186062337e-89, 5.520948362159764e-88),
+               (-10, 7.619853024160525e-24, 7.694598626706419e-23),
+               (-5, 2.866515718791939e-07, 1.4867195147342977e-06),
+               (-1, 0.15865525393145705, 0.24197072451914334),
+               (5, 0.9999997133484281, 1.4867195147342977e-06)]
+
+def test_norm_tail_accuracy():
+    for x, cdf, pdf in NORMAL_TAIL:
+        assert abs(models.norm_cdf(x) / cdf - 1) < 2e-13
+        assert abs(models.norm_pdf(x) / pdf - 1) < 2e-13
+
+def test_norm_ppf():
+    for x, cdf, _ in NORMAL_TAIL[:-1]:
+        assert abs(models.norm_ppf(cdf) / x - 1) < 1e-14
+    for p in (1e-300, 1e-10, 0.02, 0.3, 0.5 - 1e-12, 0.5, 0.7, 1 - 1e-10):
+        assert math.isclose(models.norm_cdf(models.norm_ppf(p)), p, rel_tol=1e-14, abs_tol=1e-16), p
+    assert models.norm_ppf(0) == -math.inf and models.norm_ppf(1) == math.inf and math.isnan(models.norm_ppf(2))
 
 
 def test_bs_call_price_01(): assert f'{models.bs_call_price(100, 100, 1, 0.05, 0.10):.2f}' == '6.80'
@@ -226,6 +251,52 @@ def test_implied_vol_from_bk_put_02():
     implied_vol = models.implied_volatility(f, k, t, r, bk_put, models.bk_put_price, models.bk_vega, 0.2, 1e-5, 100)
     assert f'{implied_vol:.2f}' == f'{sigma:.2f}'
 
+def test_implied_vol_deep_otm_short_dated():
+    s, k, t, r, sigma = 100, 160, 0.02, 0.0, 0.90
+    bs_call = models.bs_call_price(s, k, t, r, sigma)
+    result = models.implied_volatility(s, k, t, r, bs_call, models.bs_call_price, models.bs_vega, 0.2, 1e-12, 100, full_output=True)
+    assert result.converged and f'{result.sigma:.6f}' == f'{sigma:.6f}'
+
+def test_implied_vol_reports_failure():
+    result = models.implied_volatility(100, 100, 1, 0, 150.0, models.bs_call_price, models.bs_vega, full_output=True)
+    assert not result.converged and result.iterations == 100
+
+
+def test_model_iv_round_trip():
+    for model, scale in [('bs', 1), ('bk', 1), ('bach', 100)]:
+        for kind in ['call', 'put']:
+            for k in [40, 95, 100, 105, 250]:
+                for t in [1 / 365, 0.25, 5]:
+                    for sigma in [0.01, 0.2, 3]:
+                        price = getattr(models, f'{model}_{kind}_price')(100, k, t, 0.03, sigma * scale)
+                        result = getattr(models, f'{model}_{kind}_iv')(100, k, t, 0.03, price)
+                        if result.converged:
+                            assert result.iterations <= 6, (model, kind, k, t, sigma)
+                            repriced = getattr(models, f'{model}_{kind}_price')(100, k, t, 0.03, result.sigma)
+                            assert math.isclose(repriced, price, rel_tol=1e-12, abs_tol=1e-13), (model, kind, k, t, sigma)
+                            if getattr(models, f'{model}_vega')(100, k, t, 0.03, sigma * scale) * sigma * scale > 1e-6 * price:
+                                assert f'{result.sigma / (sigma * scale):.8f}' == '1.00000000', (model, kind, k, t, sigma)
+                        else:
+                            # only quotes whose time value is lost to rounding may be rejected
+                            assert result.iterations == 0 and math.isnan(result.sigma), (model, kind, k, t, sigma)
+
+def test_model_iv_tiny_prices():
+    for k, t, sigma in [(40, 1 / 365, 0.5), (70, 5, 0.01), (95, 0.02, 0.01)]:
+        price = models.bs_put_price(100, k, t, 0.01, sigma)
+        result = models.bs_put_iv(100, k, t, 0.01, price)
+        assert price < 1e-60 and result.converged and result.iterations <= 4
+        assert f'{result.sigma:.8f}' == f'{sigma:.8f}'
+
+def test_model_iv_warm_start():
+    price = models.bk_call_price(100, 110, 0.5, 0.02, 0.25)
+    assert f'{models.bk_call_iv(100, 110, 0.5, 0.02, price, sigma=0.2499).sigma:.10f}' == '0.2500000000'
+    assert models.bk_call_iv(100, 100, 0.5, 0.02, models.bk_call_price(100, 100, 0.5, 0.02, 0.25)).iterations == 0
+    assert f'{models.bach_put_iv(100, 100, 0.5, 0.02, models.bach_put_price(100, 100, 0.5, 0.02, 12.0)).sigma:.10f}' == '12.0000000000'
+
+def test_model_iv_rejects_arbitrage():
+    for result in [models.bs_call_iv(100, 90, 1, 0, 9.0), models.bk_put_iv(100, 120, 1, 0, 125.0), models.bach_call_iv(100, 100, 1, 0, 0.0)]:
+        assert math.isnan(result.sigma) and not result.converged and result.iterations == 0
+
 
 def test_bach_call_price_01(): assert f'{models.bach_call_price(13.78, 12, 0.063, 0, 39.507504):.2f}'      == '4.91'
 def test_bach_call_price_02(): assert f'{models.bach_call_price(25.78, 25.5, 0.00822, 0, 30.5340869):.2f}' == '1.25'
@@ -237,4 +308,59 @@ def test_bach_call_delta_01(): assert f'{models.bach_call_delta(13.78, 12, 0.063
 def test_bach_call_delta_02(): assert f'{models.bach_call_delta(25.78, 25.5, 0.00822, 0, 30.5340869):.2f}' == '0.54'
 
 def test_bach_put_delta_01(): assert f'{models.bach_put_delta(42.97, 42.5, 0.057534, 0, 11.6973553):.2f}'  == '-0.43'
-def test_bach_put_delta_02(): assert f'{models.bach_put_delta(20.69, 22, 0.15616, 0, 30.6166935):.2f}'     == '-0.54'
\ No newline at end of file
+def test_bach_put_delta_02(): assert f'{models.bach_put_delta(20.69, 22, 0.15616, 0, 30.6166935):.2f}'     == '-0.54'
+
+def test_bs_greeks():
+    for is_call, name in [(True, 'call'), (False, 'put')]:
+        for args in [(100, 100, 1, 0.05, 0.10), (100, 120, 2, 0.10, 0.20)]:
+            g = models.bs_greeks(*args, is_call=is_call)
+            assert f'{g.price:.8f}' == f'{getattr(models, f"bs_{name}_price")(*args):.8f}'
+            assert f'{g.delta:.8f}' == f'{getattr(models, f"bs_{name}_delta")(*args):.8f}'
+            assert f'{g.gamma:.8f}' == f'{models.bs_gamma(*args):.8f}'
+            assert f'{g.vega:.8f}'  == f'{models.bs_vega(*args):.8f}'
+            assert f'{g.theta:.8f}' == f'{getattr(models, f"bs_{name}_theta")(*args):.8f}'
+            assert f'{g.rho:.8f}'   == f'{getattr(models, f"bs_{name}_rho")(*args):.8f}'
+
+def test_bk_greeks():
+    for is_call, name in [(True, 'call'), (False, 'put')]:
+        for args in [(105.127, 100, 1, 0.05, 0.10), (122.140, 120, 2, 0.10, 0.20)]:
+            g = models.bk_greeks(*args, is_call=is_call)
+            assert f'{g.price:.8f}' == f'{getattr(models, f"bk_{name}_price")(*args):.8f}'
+            assert f'{g.delta:.8f}' == f'{getattr(models, f"bk_{name}_delta")(*args):.8f}'
+            assert f'{g.gamma:.8f}' == f'{models.bk_gamma(*args):.8f}'
+            assert f'{g.vega:.8f}'  == f'{models.bk_vega(*args):.8f}'
+            assert f'{g.theta:.8f}' == f'{getattr(models, f"bk_{name}_theta")(*args):.8f}'
+            assert f'{g.rho:.8f}'   == f'{getattr(models, f"bk_{name}_rho")(*args):.8f}'
+
+def test_bach_greeks():
+    for is_call, name in [(True, 'call'), (False, 'put')]:
+        for args in [(13.78, 12, 0.063, 0.01, 39.507504), (20.69, 22, 0.15616, 0.02, 30.6166935)]:
+            g = models.bach_greeks(*args, is_call=is_call)
+            assert f'{g.price:.8f}' == f'{getattr(models, f"bach_{name}_price")(*args):.8f}'
+            assert f'{g.delta:.8f}' == f'{getattr(models, f"bach_{name}_delta")(*args):.8f}'
+            assert f'{g.gamma:.8f}' == f'{models.bach_gamma(*args):.8f}'
+            assert f'{g.vega:.8f}'  == f'{models.bach_vega(*args):.8f}'
+            assert f'{g.theta:.8f}' == f'{getattr(models, f"bach_{name}_theta")(*args):.8f}'
+            assert f'{g.rho:.8f}'   == f'{getattr(models, f"bach_{name}_rho")(*args):.8f}'
+
+
+def test_full_greeks_match_finite_differences():
+    def bump(function, args, i, field, h):
+        up, down = list(args), list(args)
+        up[i] += h
+        down[i] -= h
+        return (getattr(function(*up), field) - getattr(function(*down), field)) / (2 * h)
+    for model, sigma in [('bs', 0.25), ('bk', 0.25), ('bach', 20.0)]:
+        function = getattr(models, f'{model}_full_greeks')
+        for k in [85.0, 100.0, 120.0]:
+            for is_call in [True, False]:
+                args = (100.0, k, 0.7, 0.03, sigma, is_call)
+                greeks = function(*args)
+                assert greeks[:6] == getattr(models, f'{model}_greeks')(*args)
+                h = 1e-3 * sigma
+                expected = {'vanna': bump(function, args, 4, 'delta', h), 'volga': bump(function, args, 4, 'vega', h),
+                            'speed': bump(function, args, 0, 'gamma', 1e-2), 'zomma': bump(function, args, 4, 'gamma', h),
+                            'ultima': bump(function, args, 4, 'volga', h), 'charm': -bump(function, args, 2, 'delta', 1e-5),
+                            'color': -bump(function, args, 2, 'gamma', 1e-5)}
+                for name, value in expected.items():
+                    assert abs(getattr(greeks, name) - value) < 1e-5 * max(1, abs(value)), (model, k, is_call, name)
@@ -5,6 +5,7 @@ from optrush import models         # The Python libraries
 from optrush import optrush        # The Rust libraries
 
 import math
+import numpy as np
 
 
 def test_cdf():
@@ -17,6 +18,21 @@ def test_pdf():
         x = 0.5 * i
         assert f'{models.norm_pdf(x):.8f}' == f'{optrush.norm_pdf(x):.8f}'
 
+
+# Reference values from mpmath at 30 significant digits.
+NORMAL_TAIL = [(-37, 5.725571222524577e-300, 2.1200065515246056e-298),
+               (-20, 2.7536241186062337e-89, 5.520948362159764e-88),
+               (-10, 7.619853024160525e-24, 7.694598626706419e-23),
+               (-5, 2.866515718791939e-07, 1.4867195147342977e-06),
+               (-1, 0.15865525393145705, 0.24197072451914334),
+               (5, 0.9999997133484281, 1.4867195147342977e-06)]
+
+def test_norm_tail_accuracy():
+    for x, cdf, pdf in NORMAL_TAIL:
+        assert abs(optrush.norm_cdf(x) / cdf - 1) < 2e-13
+        assert abs(optrush.norm_pdf(x) / pdf - 1) < 2e-13
+
+
 def test_d1_d2():
     for r in [0, 0.05, 0.1, 0.2]:
         for t in range(1, 5):
@@ -91,4 +107,151 @@ def test_theta():
                         assert f'{models.bk_call_theta(f, k, t, r, sigma):.4f}' == f'{optrush.bk_call_theta(f, k, t, r, sigma):.4f}'
                         assert f'{models.bk_put_theta(f, k, t, r, sigma):.4f}'  == f'{optrush.bk_put_theta(f, k, t, r, sigma):.4f}'
                         assert f'{models.bach_call_theta(f, k, t, r, sigma):.4f}' == f'{optrush.bach_call_theta(f, k, t, r, sigma):.4f}'
-                        assert f'{models.bach_put_theta(f, k, t, r, sigma):.4f}'  == f'{optrush.bach_put_theta(f, k, t, r, sigma):.4f}'
\ No newline at end of file
+                        assert f'{models.bach_put_theta(f, k, t, r, sigma):.4f}'  == f'{optrush.bach_put_theta(f, k, t, r, sigma):.4f}'
+
+def test_greeks():
+    for r in [0, 0.05, 0.1, 0.2]:
+        for t in range(1, 5):
+            for sigma in [0.05, 0.1, 0.2, 0.5]:
+                for s in range(10, 200, 15):
+                    f = s * math.exp(r * t)
+                    for k in [s - 8, s + 10]:
+                        for is_call in [True, False]:
+                            for name, spot in [('bs', s), ('bk', f), ('bach', f)]:
+                                py = getattr(models, f'{name}_greeks')(spot, k, t, r, sigma, is_call)
+                                rs = getattr(optrush, f'{name}_greeks')(spot, k, t, r, sigma, is_call)
+                                assert [f'{x:.4f}' for x in py] == [f'{x:.4f}' for x in rs]
+
+
+def test_batch():
+    rows = [(s, k, t, r, sigma) for r in [0, 0.05, 0.1, 0.2] for t in range(1, 5) for sigma in [0.05, 0.1, 0.2, 0.5]
+            for s in range(20, 200, 15) for k in [s - 8, s + 10]]
+    s, k, t, r, sigma = (np.ascontiguousarray(col, dtype=float) for col in zip(*rows))
+    out = np.empty(len(rows))
+    for model in ['bs', 'bk', 'bach']:
+        for name in ['call_price', 'put_price', 'call_delta', 'put_delta', 'gamma', 'vega', 'call_theta', 'put_theta', 'call_rho', 'put_rho']:
+            getattr(optrush, f'{model}_{name}_batch')(s, k, t, r, sigma, out)
+            expected = [getattr(optrush, f'{model}_{name}')(*row) for row in rows]
+            assert np.array_equal(out, expected), (model, name)
+
+def test_batch_broadcasts_length_one_inputs():
+    s = np.linspace(80, 120, 41)
+    out = np.empty_like(s)
+    optrush.bs_call_price_batch(s, np.array([100.0]), np.array([1.0]), np.array([0.05]), np.array([0.2]), out)
+    assert np.array_equal(out, [optrush.bs_call_price(x, 100, 1, 0.05, 0.2) for x in s])
+
+def test_batch_rejects_mismatched_lengths():
+    import pytest
+    with pytest.raises(ValueError):
+        optrush.bs_call_price_batch(np.ones(3), np.ones(2), np.ones(3), np.ones(3), np.ones(3), np.empty(3))
+
+def test_greeks_batch():
+    s = np.linspace(80, 120, 41)
+    is_call = np.arange(len(s)) % 2 == 0
+    out = np.empty((len(s), 6))
+    for model in ['bs', 'bk', 'bach']:
+        getattr(optrush, f'{model}_greeks_batch')(s, np.array([100.0]), np.array([1.0]), np.array([0.05]), np.array([0.2]), is_call, out)
+        expected = [getattr(optrush, f'{model}_greeks')(x, 100, 1, 0.05, 0.2, c) for x, c in zip(s, is_call)]
+        assert np.array_equal(out, expected), model
+
+def test_norm_batch():
+    x = np.linspace(-40, 40, 1601)
+    out = np.empty_like(x)
+    optrush.norm_cdf_batch(x, out)
+    assert np.array_equal(out, [optrush.norm_cdf(v) for v in x])
+    optrush.norm_pdf_batch(x, out)
+    assert np.array_equal(out, [optrush.norm_pdf(v) for v in x])
+
+def test_batch_threads():
+    rng = np.random.default_rng(0)
+    n = 100_003
+    s, k = rng.uniform(50, 150, n), rng.uniform(50, 150, n)
+    t, r, sigma = rng.uniform(0.1, 2, n), rng.uniform(0, 0.1, n), rng.uniform(0.05, 0.5, n)
+    is_call = rng.random(n) < 0.5
+    serial, parallel = np.empty((n, 6)), np.empty((n, 6))
+    serial_prices, parallel_prices = np.empty(n), np.empty(n)
+    for threads in [0, 2, 3]:
+        optrush.bs_greeks_batch(s, k, t, r, sigma, is_call, serial, 1)
+        optrush.bs_greeks_batch(s, k, t, r, sigma, is_call, parallel, threads)
+        assert np.array_equal(serial, parallel)
+        optrush.bk_put_price_batch(s, k, t, r, sigma, serial_prices, 1)
+        optrush.bk_put_price_batch(s, k, t, r, sigma, parallel_prices, threads)
+        assert np.array_equal(serial_prices, parallel_prices)
+
+def test_native_iv():
+    for r in [0, 0.05]:
+        for t in [0.02, 0.5, 2]:
+            for sigma in [0.05, 0.2, 0.8]:
+                for s in range(40, 200, 20):
+                    for k in [s * 0.8, s, s * 1.25]:
+                        for model, vol in [('bs', sigma), ('bk', sigma), ('bach', sigma * s)]:
+                            for kind in ['call', 'put']:
+                                price = getattr(optrush, f'{model}_{kind}_price')(s, k, t, r, vol)
+                                implied, iterations, converged = getattr(optrush, f'{model}_{kind}_iv')(s, k, t, r, price, tol=1e-10)
+                                if getattr(optrush, f'{model}_vega')(s, k, t, r, vol) > 1e-4:
+                                    assert converged and iterations <= 20
+                                    assert f'{implied / vol:.6f}' == '1.000000', (model, kind, s, k, t, r, vol)
+
+def test_native_iv_rejects_arbitrage():
+    for sigma, iterations, converged in [optrush.bs_call_iv(100, 90, 1, 0, 9.0), optrush.bk_put_iv(100, 120, 1, 0, 125.0),
+                                         optrush.bach_call_iv(100, 100, 1, 0, 0.0)]:
+        assert math.isnan(sigma) and iterations == 0 and not converged
+
+def test_native_iv_batch():
+    rng = np.random.default_rng(1)
+    n = 20_000
+    f, k = rng.uniform(50, 150, n), rng.uniform(50, 150, n)
+    t, r, sigma = rng.uniform(0.1, 2, n), rng.uniform(0, 0.1, n), rng.uniform(0.05, 0.8, n)
+    prices = np.empty(n)
+    optrush.bk_call_price_batch(f, k, t, r, sigma, prices)
+    prices[0] = -1.0
+    for threads in [1, 4]:
+        out, iterations = np.full(n, np.nan), np.empty(n, dtype=np.int64)
+        optrush.bk_call_iv_batch(f, k, t, r, prices, out, iterations, threads=threads)
+        expected = [optrush.bk_call_iv(*args) for args in zip(f, k, t, r, prices)]
+        assert np.array_equal(out, [e[0] for e in expected], equal_nan=True)
+        assert np.array_equal(iterations, [e[1] if e[2] else -1 for e in expected])
+        assert iterations[0] == -1
+
+def test_backend_iv_batch():
+    from optrush import backend
+    if backend.name() != 'rust':
+        return
+    k = np.linspace(80.0, 120.0, 40).reshape(4, 10)
+    prices = np.array([optrush.bk_call_price(100.0, x, 1.0, 0.02, 0.3) for x in k.ravel()]).reshape(k.shape)
+    iv = backend.bk_call_iv(100.0, k, 1.0, 0.02, prices, tol=None)
+    expected = [optrush.bk_call_iv(100.0, x, 1.0, 0.02, p) for x, p in zip(k.ravel(), prices.ravel())]
+    assert iv.shape == k.shape and np.array_equal(iv.sigma.ravel(), [e[0] for e in expected])
+    assert np.array_equal(iv.iterations.ravel(), [e[1] for e in expected]) and iv.converged.all()
+
+def test_instrumentation_counters():
+    previous = optrush.instrumentation(True)
+    optrush.instrumentation_reset()
+    try:
+        out, iterations = np.full(3, np.nan), np.empty(3, dtype=np.int64)
+        optrush.bs_call_iv_batch(np.full(3, 100.0), np.array([90.0, 100.0, 110.0]), np.ones(1), np.zeros(1),
+                                 np.array([14.0, 8.0, -1.0]), out, iterations)
+        optrush.bs_call_iv(100, 100, 1, 0.05, 6.8)
+        optrush.instrumentation(False)
+        optrush.bs_call_iv(100, 100, 1, 0.05, 6.8)
+        stats = optrush.instrumentation_snapshot()
+        assert stats['bs_call_iv_batch']['calls'] == 1 and stats['bs_call_iv_batch']['elements'] == 3
+        assert stats['bs_call_iv_batch']['nonconverged'] == 1 and sum(stats['bs_call_iv_batch']['iterations']) == 2
+        assert stats['bs_call_iv']['calls'] == 1 and sum(stats['bs_call_iv']['latency']) == 1
+        optrush.instrumentation_reset()
+        assert optrush.instrumentation_snapshot()['bs_call_iv']['calls'] == 0
+    finally:
+        optrush.instrumentation(previous)
+
+def test_full_greeks():
+    rng = np.random.default_rng(2)
+    n = 1000
+    k, t, r, sigma, is_call = rng.uniform(60, 140, n), rng.uniform(0.05, 3, n), rng.uniform(0, 0.1, n), rng.uniform(0.05, 0.8, n), rng.random(n) < 0.5
+    for model, vol in [('bs', sigma), ('bk', sigma), ('bach', sigma * 100)]:
+        expected = np.array([getattr(models, f'{model}_full_greeks')(100.0, *row) for row in zip(k, t, r, vol, is_call)])
+        scalar = np.array([getattr(optrush, f'{model}_full_greeks')(100.0, *row) for row in zip(k, t, r, vol, is_call)])
+        assert np.allclose(scalar, expected, rtol=1e-12, atol=1e-14)
+        for threads in [1, 4]:
+            out = np.empty((n, 13))
+            getattr(optrush, f'{model}_full_greeks_batch')(np.full(1, 100.0), k, t, r, vol, is_call, out, threads=threads)
+            assert np.array_equal(out, scalar)
@@ -0,0 +1,53 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import models         # The scalar Python functions
+from optrush import scenarios
+
+import numpy as np
+import pytest
+
+
+rng = np.random.default_rng(0)
+N = 40
+S = rng.uniform(80, 120, N)
+K = S * rng.uniform(0.8, 1.2, N)
+T = rng.uniform(0.05, 3, N)
+R = rng.uniform(0, 0.05, N)
+SIGMA = rng.uniform(0.1, 0.5, N)
+IS_CALL = rng.random(N) < 0.5
+QUANTITY = rng.integers(-10, 10, N).astype(float)
+SPOT_SHOCKS, VOL_SHOCKS, RATE_SHOCKS = [-0.2, -0.05, 0, 0.1], [-0.05, 0, 0.1], [-0.01, 0, 0.02]
+SCALE = {'bs': 1, 'bk': 1, 'bach': S}
+
+
+def scalar_pnl(model, ds, dv, dr):
+    sigma = SIGMA * SCALE[model]
+    pnl = 0.0
+    for i in range(N):
+        price = getattr(models, f'{model}_{"call" if IS_CALL[i] else "put"}_price')
+        pnl += QUANTITY[i] * (price(S[i] * (1 + ds), K[i], T[i], R[i] + dr, sigma[i] + dv) - price(S[i], K[i], T[i], R[i], sigma[i]))
+    return pnl
+
+def test_matches_scalar_revaluation():
+    for model in ['bs', 'bk', 'bach']:
+        vol_shocks = np.multiply(VOL_SHOCKS, 100 if model == 'bach' else 1)
+        pnl = scenarios.scenario_pnl(model, S, K, T, R, SIGMA * SCALE[model], IS_CALL, QUANTITY, SPOT_SHOCKS, vol_shocks, RATE_SHOCKS)
+        assert pnl.shape == (4, 3, 3)
+        assert pnl[2, 1, 1] == 0.0
+        for (i, ds), (j, dv), (l, dr) in [((0, -0.2), (2, vol_shocks[2]), (0, -0.01)), ((3, 0.1), (0, vol_shocks[0]), (2, 0.02)), ((1, -0.05), (1, 0), (1, 0))]:
+            assert np.isclose(pnl[i, j, l], scalar_pnl(model, ds, dv, dr), rtol=1e-9, atol=1e-9), (model, i, j, l)
+
+def test_by_position_blocks_and_threads(monkeypatch):
+    args = ('bs', S, K, T, R, SIGMA, IS_CALL, QUANTITY, SPOT_SHOCKS, VOL_SHOCKS, RATE_SHOCKS)
+    total = scenarios.scenario_pnl(*args)
+    positions = scenarios.scenario_pnl(*args, by_position=True)
+    assert positions.shape == (4, 3, 3, N)
+    assert np.allclose(positions.sum(axis=-1), total, rtol=1e-12, atol=1e-12)
+    monkeypatch.setattr(scenarios, 'BLOCK_SIZE', 25)
+    assert np.allclose(scenarios.scenario_pnl(*args, threads=4), total, rtol=1e-12, atol=1e-12)
+    assert np.allclose(scenarios.scenario_pnl(*args, by_position=True, threads=4), positions, rtol=1e-12, atol=1e-12)
+
+def test_unknown_model():
+    with pytest.raises(ValueError):
+        scenarios.scenario_pnl('heston', S, K, T, R, SIGMA)
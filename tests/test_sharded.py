@@ -0,0 +1,50 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import sharded
+from optrush import vectorized     # The NumPy array functions
+
+import numpy as np
+import pytest
+
+
+def make_inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100.0, rng.uniform(80, 120, n), rng.uniform(0.1, 2, n), 0.03, rng.uniform(0.1, 0.5, n), rng.random(n) < 0.5
+
+def backends():
+    return [b for b in sharded.BACKENDS if sharded.optrush is not None or not b.startswith('rust')]
+
+def test_backends_match_vectorized():
+    s, k, t, r, sigma, is_call = make_inputs(1000)
+    with sharded.ShardedPricer(1000, workers=2) as pricer:
+        for model in ('bs', 'bk', 'bach'):
+            vol = sigma * 100 if model == 'bach' else sigma
+            expected = getattr(vectorized, f'{model}_greeks')(s, k, t, r, vol, is_call=is_call)
+            for backend in backends():
+                greeks = pricer.greeks(model, s, k, t, r, vol, is_call, backend=backend)
+                for name in expected.dtype.names:
+                    assert np.allclose(greeks[name], expected[name], rtol=1e-9, atol=1e-12), (model, backend, name)
+
+def test_columns_in_place_and_partial_batches():
+    s, k, t, r, sigma, is_call = make_inputs(100)
+    with sharded.ShardedPricer(100, workers=2, shard_size=7) as pricer:
+        for name, value in zip(pricer.columns, (s, k, t, r, sigma, is_call)):
+            pricer.columns[name][:] = value
+        greeks = pricer.greeks('bs')
+        assert np.allclose(greeks.delta, vectorized.bs_greeks(s, k, t, r, sigma, is_call=is_call).delta)
+        assert len(pricer.greeks('bs', k=k[:10])) == 10
+        with pytest.raises(ValueError):
+            pricer.greeks('bs', k=np.ones(101))
+    copy = sharded.sharded_greeks('bk', s, k[:5], 1.0, 0.0, 0.2, workers=1)
+    assert np.allclose(copy.price, vectorized.bk_call_price(s, k[:5], 1.0, 0.0, 0.2))
+
+def test_errors():
+    with sharded.ShardedPricer(10, workers=1) as pricer:
+        with pytest.raises(ValueError):
+            pricer.greeks('heston', 100.0, 100.0, 1.0, 0.0, 0.2)
+        with pytest.raises(ValueError):
+            pricer.greeks('bs', 100.0, 100.0, 1.0, 0.0, 0.2, backend='gpu')
+        if sharded.optrush is None:
+            with pytest.raises(ImportError):
+                pricer.greeks('bs', 100.0, 100.0, 1.0, 0.0, 0.2, backend='rust-batch')
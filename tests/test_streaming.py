@@ -0,0 +1,101 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import vectorized     # The NumPy array functions
+from optrush.streaming import LatencyStats, StreamPricer, Update
+
+import asyncio
+import numpy as np
+import pytest
+
+
+IDS = [f'C{i}' for i in range(6)]
+K = np.array([90, 95, 100, 105, 110, 120.0])
+T = np.array([0.1, 0.25, 0.5, 1, 1, 2])
+IS_CALL = np.array([True, False, True, False, True, True])
+SIGMA = np.array([0.3, 0.25, 0.2, 0.22, 0.18, 0.35])
+
+
+def make_updates(n, seed=0):
+    rng = np.random.default_rng(seed)
+    updates = []
+    for _ in range(n):
+        i = rng.integers(len(IDS))
+        spot = rng.uniform(95, 105)
+        price = vectorized.bs_greeks(spot, K[i], T[i], 0.02, SIGMA[i], is_call=IS_CALL[i]).price
+        updates.append(Update(IDS[i], spot, float(price)))
+    return updates
+
+def test_stream_batches_and_values():
+    pricer = StreamPricer('bs', IDS, K, T, 0.02, IS_CALL, max_batch=4, max_delay=60)
+    updates = make_updates(10)
+    batches = list(pricer.stream(updates))
+    assert [b.updates for b in batches] == [4, 4, 2]
+    for batch in batches:
+        assert batch.converged.all() and len(batch.latency) == batch.updates
+        i = [IDS.index(c) for c in batch.contract_id]
+        assert np.allclose(batch.sigma, SIGMA[i], rtol=1e-9)
+        expected = vectorized.bs_greeks(batch.spot, K[i], T[i], 0.02, SIGMA[i], is_call=IS_CALL[i])
+        assert np.allclose(batch.greeks.delta, expected.delta, rtol=1e-8)
+    assert pricer.stats.count == 10 and pricer.stats.batches == 3
+
+def test_coalesces_and_reuses_sigma():
+    pricer = StreamPricer('bs', IDS, K, T, 0.02, IS_CALL, sigma=SIGMA)
+    batch = pricer.process([Update('C2', 100.0), Update('C3', 99.0), Update('C2', 101.0)])
+    assert batch.contract_id == ['C2', 'C3'] and batch.updates == 3
+    assert list(batch.spot) == [101.0, 99.0] and not batch.converged.any()
+    assert np.allclose(batch.sigma, SIGMA[[2, 3]])
+    with pytest.raises(KeyError):
+        pricer.process([Update('missing', 100.0)])
+
+def test_latency_stats():
+    stats = LatencyStats(capacity=100)
+    assert np.isnan(stats.percentiles()[99])
+    stats.record(np.arange(150) / 1000)
+    assert stats.count == 150
+    assert np.isclose(stats.percentiles((50,))[50], 0.0995)
+
+def test_async_backpressure():
+    async def main():
+        pricer = StreamPricer('bs', IDS, K, T, 0.02, IS_CALL, max_batch=8, max_delay=1e-3, max_pending=4)
+        batches = []
+        consumer = asyncio.ensure_future(pricer.run(batches.append))
+        for update in make_updates(40):
+            await pricer.submit(*update)
+            assert pricer.queue.qsize() <= 4
+        while sum(b.updates for b in batches) < 40:
+            await asyncio.sleep(1e-3)
+        consumer.cancel()
+        return pricer, batches
+    pricer, batches = asyncio.run(main())
+    assert all(b.updates <= 8 for b in batches)
+    assert np.allclose(pricer.sigma, SIGMA, rtol=1e-9)
+    assert set(pricer.stats.percentiles()) == {50, 90, 99, 99.9}
+
+def test_run_survives_failures():
+    async def main():
+        pricer = StreamPricer('bs', IDS, K, T, 0.02, IS_CALL, max_batch=4, max_delay=1e-3)
+        batches, errors = [], []
+        with pytest.raises(KeyError):
+            await pricer.submit('missing', 100.0)
+
+        def emit(batch):
+            if not batches:
+                batches.append(None)
+                raise RuntimeError('downstream failure')
+            batches.append(batch)
+        consumer = asyncio.ensure_future(pricer.run(emit, on_error=lambda exception, updates: errors.append(exception)))
+        for update in make_updates(20):
+            await pricer.submit(*update)
+        while sum(b.updates for b in batches[1:]) + 4 < 20 and not consumer.done():
+            await asyncio.sleep(1e-3)
+        await pricer.queue.put((Update('missing', 100.0), 0.0))     # bypassing submit, as a misbehaving producer could
+        await pricer.submit(*make_updates(1)[0])
+        while pricer.failures < 2 and not consumer.done():
+            await asyncio.sleep(1e-3)
+        await asyncio.sleep(0.01)
+        consumer.cancel()
+        return pricer, batches, errors
+    pricer, batches, errors = asyncio.run(main())
+    assert pricer.failures == 2 and isinstance(errors[0], RuntimeError) and isinstance(errors[1], KeyError)
+    assert pricer.queue.empty()
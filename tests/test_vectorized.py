@@ -0,0 +1,110 @@
+import os, sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from optrush import models         # The scalar Python functions
+from optrush import vectorized     # The NumPy array functions
+
+import itertools
+import numpy as np
+
+
+GRID = np.array(list(itertools.product(range(10, 200, 15), [-8, 10], range(1, 5), [0, 0.05, 0.1, 0.2], [0.05, 0.1, 0.2, 0.5])), dtype=float)
+S, K, T, R, SIGMA = GRID[:, 0], GRID[:, 0] + GRID[:, 1], GRID[:, 2], GRID[:, 3], GRID[:, 4]
+
+FIVE_ARG = ['bs_call_price', 'bs_put_price', 'bs_call_delta', 'bs_put_delta', 'bs_gamma', 'bs_vega',
+            'bs_call_theta', 'bs_put_theta', 'bs_call_rho', 'bs_put_rho', 'bs_d1', 'bs_d2',
+            'bk_call_price', 'bk_put_price', 'bk_call_delta', 'bk_put_delta', 'bk_gamma', 'bk_vega',
+            'bk_call_theta', 'bk_put_theta', 'bk_call_rho', 'bk_put_rho',
+            'bach_call_price', 'bach_put_price', 'bach_call_delta', 'bach_put_delta', 'bach_gamma', 'bach_vega',
+            'bach_call_theta', 'bach_put_theta', 'bach_call_rho', 'bach_put_rho']
+FOUR_ARG = ['bk_d1', 'bk_d2', 'bach_d']
+
+
+def test_cdf_pdf():
+    x = np.linspace(-40, 40, 1601)
+    assert np.allclose(vectorized.norm_cdf(x), [models.norm_cdf(v) for v in x], rtol=1e-12, atol=1e-300)
+    assert np.allclose(vectorized.norm_pdf(x), [models.norm_pdf(v) for v in x], rtol=1e-12, atol=1e-300)
+
+def test_numpy_special_functions():
+    x = np.linspace(-37, 38, 3001)
+    assert np.allclose(vectorized._numpy_ndtr(x), [models.norm_cdf(v) for v in x], rtol=1e-12, atol=0)
+    p = np.concatenate([np.geomspace(1e-300, 0.5, 1000), 1 - np.geomspace(1e-16, 0.5, 1000)])
+    assert np.allclose(vectorized._numpy_ndtri(p), [models.norm_ppf(v) for v in p], rtol=4e-15, atol=0)
+    assert np.isnan(vectorized._numpy_ndtr(np.nan)) and np.array_equal(vectorized._numpy_ndtr([-np.inf, np.inf]), [0, 1])
+    assert np.array_equal(vectorized._numpy_ndtri([0, 0.5, 1]), [-np.inf, 0, np.inf]) and np.isnan(vectorized._numpy_ndtri(-1))
+
+def test_five_arg_functions():
+    for name in FIVE_ARG:
+        expected = [getattr(models, name)(*row) for row in zip(S, K, T, R, SIGMA)]
+        assert np.allclose(getattr(vectorized, name)(S, K, T, R, SIGMA), expected, rtol=1e-10, atol=1e-12), name
+
+def test_four_arg_functions():
+    for name in FOUR_ARG:
+        expected = [getattr(models, name)(*row) for row in zip(S, K, T, SIGMA)]
+        assert np.allclose(getattr(vectorized, name)(S, K, T, SIGMA), expected, rtol=1e-10, atol=1e-12), name
+
+def test_broadcasting():
+    prices = vectorized.bs_call_price(100, [[90], [100], [110]], [0.5, 1, 2], 0.05, 0.2)
+    assert prices.shape == (3, 3)
+    assert f'{prices[1, 1]:.2f}' == f'{models.bs_call_price(100, 100, 1, 0.05, 0.2):.2f}'
+
+def test_scalar_inputs():
+    assert f'{vectorized.bs_call_price(100, 100, 1, 0.05, 0.10):.2f}' == '6.80'
+    assert f'{vectorized.bach_put_price(20.69, 22, 0.15616, 0, 30.6166935):.2f}' == '5.51'
+
+def test_greeks():
+    is_call = np.arange(len(S)) % 2 == 0
+    for model in ['bs', 'bk', 'bach']:
+        g = getattr(vectorized, f'{model}_greeks')(S, K, T, R, SIGMA, is_call=is_call)
+        assert g.dtype.names == ('price', 'delta', 'gamma', 'vega', 'theta', 'rho')
+        for field in g.dtype.names:
+            call, put = (f'{model}_{field}',) * 2 if field in ('gamma', 'vega') else (f'{model}_call_{field}', f'{model}_put_{field}')
+            expected = np.where(is_call, getattr(vectorized, call)(S, K, T, R, SIGMA), getattr(vectorized, put)(S, K, T, R, SIGMA))
+            assert np.allclose(g[field], expected, rtol=1e-10, atol=1e-12), (model, field)
+
+def test_model_iv_matches_scalar():
+    is_call = np.arange(len(S)) % 3 == 0
+    for model, scale in [('bs', 1), ('bk', 1), ('bach', S)]:
+        prices = np.where(is_call, getattr(vectorized, f'{model}_call_price')(S, K, T, R, SIGMA * scale),
+                          getattr(vectorized, f'{model}_put_price')(S, K, T, R, SIGMA * scale))
+        result = getattr(vectorized, f'{model}_iv')(S, K, T, R, prices, is_call=is_call)
+        assert result.dtype.names == ('sigma', 'iterations', 'converged')
+        expected = np.array([tuple(getattr(models, f'{model}_{"call" if c else "put"}_iv')(*row))
+                             for *row, c in zip(S, K, T, R, prices, is_call)], dtype=vectorized.IV_DTYPE)
+        # quotes whose time value is lost to rounding may be rejected by one solver and not the other
+        sensitive = getattr(vectorized, f'{model}_vega')(S, K, T, R, SIGMA * scale) * SIGMA * scale > 1e-6 * prices
+        assert sensitive.mean() > 0.8
+        for field in ['converged', 'iterations']:
+            assert np.array_equal(result[field][sensitive], expected[field][sensitive]), (model, field)
+        assert np.allclose(result.sigma[sensitive], expected['sigma'][sensitive], rtol=1e-9), model
+        assert result.converged[sensitive].all() and np.allclose(result.sigma[sensitive], (SIGMA * scale)[sensitive], rtol=1e-8), model
+
+def test_model_iv_shapes_and_rejections():
+    prices = vectorized.bs_call_price(100, [[90], [100], [110]], [0.5, 1, 2], 0.05, 0.2)
+    result = vectorized.bs_call_iv(100, [[90], [100], [110]], [0.5, 1, 2], 0.05, prices)
+    assert result.shape == (3, 3) and result.converged.all()
+    assert np.allclose(result.sigma, 0.2, rtol=1e-10)
+    rejected = vectorized.bk_put_iv(100, [120, 120, 80], 1, 0, [125.0, 19.0, 0.0])
+    assert np.isnan(rejected.sigma).all() and not rejected.converged.any() and (rejected.iterations == 0).all()
+
+def test_model_iv_warm_start():
+    prices = vectorized.bach_call_price(100, [90, 100, 130], 0.5, 0.02, 12.0)
+    result = vectorized.bach_call_iv(100, [90, 100, 130], 0.5, 0.02, prices, sigma=[11.9, np.nan, 12.1])
+    assert result.converged.all() and np.allclose(result.sigma, 12.0, rtol=1e-10)
+
+def test_implied_volatility_lockstep():
+    prices = vectorized.bs_put_price(S, K, T, R, SIGMA)
+    result = vectorized.implied_volatility(S, K, T, R, prices, vectorized.bs_put_price, vectorized.bs_vega, full_output=True)
+    expected = [models.implied_volatility(*row, models.bs_put_price, models.bs_vega, full_output=True) for row in zip(S, K, T, R, prices)]
+    assert np.array_equal(result.iterations, [e.iterations for e in expected])
+    assert np.allclose(result.sigma, [e.sigma for e in expected], rtol=1e-9)
+    assert vectorized.implied_volatility(S, K, T, R, prices, vectorized.bs_put_price, vectorized.bs_vega).shape == S.shape
+
+def test_full_greeks_match_scalar():
+    is_call = np.arange(len(S)) % 2 == 0
+    for model, vol in [('bs', SIGMA), ('bk', SIGMA), ('bach', SIGMA * S)]:
+        result = getattr(vectorized, f'{model}_full_greeks')(S, K, T, R, vol, is_call=is_call)
+        assert result.dtype == vectorized.FULL_GREEKS_DTYPE and result.shape == S.shape
+        expected = np.array([getattr(models, f'{model}_full_greeks')(*row) for row in zip(S, K, T, R, vol, is_call)])
+        for i, name in enumerate(models.FullGreeks._fields):
+            assert np.allclose(result[name], expected[:, i], rtol=1e-11, atol=1e-13, equal_nan=True), (model, name)